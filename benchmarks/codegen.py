@@ -0,0 +1,82 @@
+"""
+Benchmark do parser descendente recursivo gerado (src.codegen) contra o Parser
+dirigido por tabela, com e sem a construção da AST, sobre programas gerados.
+Os dois analisam o mesmo TokenBuffer, sem trace, e os resultados são conferidos.
+
+Uso:
+    python -m benchmarks.codegen --statements 500 5000 50000
+"""
+import argparse
+import contextlib
+import io
+import json
+from typing import Dict
+from src.cache import load_grammar_tables
+from src.codegen import GeneratedParser
+from src.models_utils import build_lukera_lexeme, build_lukera_grammar
+from src.parser import Parser
+from src.regex_lexer import RegexTokenizer
+from src.trace import TRACE_OFF
+from benchmarks.generator import generate_program
+from benchmarks.suite import best_time
+
+
+def run(statements: int, repeat: int = 5) -> Dict[str, float]:
+    lexeme, grammar = build_lukera_lexeme(), build_lukera_grammar()
+    tables = load_grammar_tables(grammar)
+    text = generate_program(statements=statements, functions=max(1, statements // 50))
+    with contextlib.redirect_stdout(io.StringIO()):
+        tokens = RegexTokenizer(None, lexeme, text=text).tokenize_compact()
+
+    def table_driven(build_ast: bool) -> Parser:
+        with contextlib.redirect_stdout(io.StringIO()):
+            parser = Parser(tokens, grammar, trace_level=TRACE_OFF, tables=tables,
+                            build_ast=build_ast)
+            parser.parse()
+        return parser
+
+    def generated(build_ast: bool) -> GeneratedParser:
+        parser = GeneratedParser(tokens, grammar, tables=tables, build_ast=build_ast)
+        parser.parse()
+        return parser
+
+    # Mesmo resultado (e o módulo gerado fica compilado antes da medição)
+    expected, actual = table_driven(True), generated(True)
+    assert (expected.ast, expected.errors) == (actual.ast, actual.errors)
+    generated(False)
+
+    return {
+        "statements": statements,
+        "tokens": len(tokens),
+        "table": best_time(lambda: table_driven(False), repeat)[0],
+        "generated": best_time(lambda: generated(False), repeat)[0],
+        "table_ast": best_time(lambda: table_driven(True), repeat)[0],
+        "generated_ast": best_time(lambda: generated(True), repeat)[0],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generated recursive-descent parser vs the table-driven one.")
+    parser.add_argument("--statements", type=int, nargs="+", default=[500, 5000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for statements in args.statements:
+        result = run(statements, args.repeat)
+        results.append(result)
+        print(f" {result['tokens']:>8} tokens | "
+              f"table {result['table'] * 1000:8.1f} ms | "
+              f"generated {result['generated'] * 1000:8.1f} ms "
+              f"(x{result['table'] / result['generated']:.2f}) | "
+              f"with AST: table {result['table_ast'] * 1000:8.1f} ms, "
+              f"generated {result['generated_ast'] * 1000:8.1f} ms "
+              f"(x{result['table_ast'] / result['generated_ast']:.2f})")
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
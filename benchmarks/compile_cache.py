@@ -0,0 +1,72 @@
+"""
+Benchmark do cache de compilação (src.compile_cache): um lote de arquivos gerados compilado
+sem cache, com o cache vazio (faltas: compila e grava) e com o cache cheio (acertos: hash +
+leitura), como em execuções repetidas de CI sobre os mesmos fontes.
+
+Uso:
+    python -m benchmarks.compile_cache --files 200 --statements 50 500
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List
+from src.batch import run_batch
+from benchmarks.generator import generate_program
+
+
+def timed_batch(files: List[str], **options) -> float:
+    started = time.perf_counter()
+    results = list(run_batch(files, workers=1, **options))
+    elapsed = time.perf_counter() - started
+    assert len(results) == len(files)
+    return elapsed
+
+
+def run(n_files: int, statements: int) -> Dict[str, object]:
+    with tempfile.TemporaryDirectory() as directory:
+        files = []
+        for index in range(n_files):
+            path = os.path.join(directory, f"programa_{index}.lk")
+            with open(path, "w") as source_file:
+                source_file.write(generate_program(statements=statements,
+                                                   functions=max(1, statements // 50), seed=index))
+            files.append(path)
+
+        cache_directory = os.path.join(directory, "cache")
+        uncached = timed_batch(files)
+        cold = timed_batch(files, cache=True, cache_directory=cache_directory)
+        warm = timed_batch(files, cache=True, cache_directory=cache_directory)
+
+        return {
+            "files": n_files,
+            "statements": statements,
+            "uncached": uncached,
+            "cold": cold,
+            "warm": warm,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batch compile time with and without the compile cache.")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--statements", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for statements in args.statements:
+        result = run(args.files, statements)
+        results.append(result)
+        print(f" {args.files} files x {statements:>5} statements | "
+              f"uncached {result['uncached'] * 1000:8.1f} ms | "
+              f"cold cache {result['cold'] * 1000:8.1f} ms | "
+              f"warm cache {result['warm'] * 1000:8.1f} ms (x{result['uncached'] / result['warm']:.1f})")
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
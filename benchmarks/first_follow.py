@@ -0,0 +1,139 @@
+"""
+Benchmark de estresse do cálculo de FIRST/FOLLOW em gramáticas sintéticas.
+
+Compara o algoritmo de worklist com bitsets (src.models_utils) com o ponto fixo
+ingênuo anterior, que repassa todas as produções até nada mudar.
+
+Uso:
+    python -m benchmarks.first_follow --sizes 250 500 1000 2000
+"""
+import argparse
+import json
+import random
+import time
+from typing import Dict, List, Set
+from src.models import Grammar, EPSILON
+from src.models_utils import first_of_sequence, compute_first, compute_follow
+
+
+def synthetic_grammar(n_nonterminals: int, n_terminals: int = 0, seed: int = 0) -> Grammar:
+    """
+    Gera uma gramática com `n_nonterminals` não-terminais encadeados (por padrão, um terminal
+    próprio para cada não-terminal).
+    N_i depende de N_{i+1}, então a informação flui no sentido contrário ao da ordem do
+    dicionário (pior caso do ponto fixo ingênuo); referências para trás e produções
+    anuláveis criam ciclos entre os FOLLOW.
+    """
+    rng = random.Random(seed)
+    n_terminals = n_terminals or n_nonterminals
+    names = [f"N{i}" for i in range(n_nonterminals)]
+    terminals = [f"t{i}" for i in range(n_terminals)]
+    prods: Dict[str, List[List[str]]] = {}
+
+    for i, A in enumerate(names):
+        nxt = names[i + 1] if i + 1 < n_nonterminals else None
+        own = terminals[i % n_terminals]
+        rules = [[own]]
+        if nxt:
+            # FIRST(N_i) depende de FIRST(N_{i+1})
+            rules.append([nxt, own])
+        if i > 0:
+            # Referência para trás: cria ciclos entre os FOLLOW
+            back = names[rng.randrange(i)]
+            rules.append([rng.choice(terminals), back, nxt or own])
+        if i % 3 == 0:
+            rules.append([EPSILON])
+        prods[A] = rules
+
+    return Grammar(start_symbol=names[0], productions=prods)
+
+
+def legacy_compute_first(grammar: Grammar) -> Dict[str, Set[str]]:
+    """Ponto fixo ingênuo: repassa todas as produções até nada mudar."""
+    first: Dict[str, Set[str]] = {nt: set() for nt in grammar.productions}
+    changed = True
+    while changed:
+        changed = False
+        for A, prods in grammar.productions.items():
+            for prod in prods:
+                rhs_first = first_of_sequence(prod, first, grammar)
+                if not rhs_first.issubset(first[A]):
+                    first[A].update(rhs_first)
+                    changed = True
+    return first
+
+
+def legacy_compute_follow(grammar: Grammar, first: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
+    """Ponto fixo ingênuo: recalcula FIRST(beta) de cada sufixo a cada passada."""
+    follow: Dict[str, Set[str]] = {nt: set() for nt in grammar.productions}
+    follow[grammar.start_symbol].add("EOF")
+    changed = True
+    while changed:
+        changed = False
+        for A, prods in grammar.productions.items():
+            for prod in prods:
+                for i, B in enumerate(prod):
+                    if B not in grammar.productions:
+                        continue
+                    beta = prod[i + 1:]
+                    before_len = len(follow[B])
+                    if beta:
+                        first_beta = first_of_sequence(beta, first, grammar)
+                        follow[B].update(first_beta - {EPSILON})
+                        if EPSILON in first_beta:
+                            follow[B].update(follow[A])
+                    else:
+                        follow[B].update(follow[A])
+                    if len(follow[B]) != before_len:
+                        changed = True
+    return follow
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run(sizes: List[int], seed: int) -> List[dict]:
+    results = []
+    for size in sizes:
+        grammar = synthetic_grammar(size, seed=seed)
+
+        first_new, t_first_new = timed(compute_first, grammar)
+        follow_new, t_follow_new = timed(compute_follow, grammar, first_new)
+        first_old, t_first_old = timed(legacy_compute_first, grammar)
+        follow_old, t_follow_old = timed(legacy_compute_follow, grammar, first_old)
+
+        if first_new != first_old or follow_new != follow_old:
+            raise AssertionError(f"FIRST/FOLLOW mismatch for size {size}")
+
+        row = {
+            "nonterminals": size,
+            "first_worklist_s": round(t_first_new, 4),
+            "first_fixpoint_s": round(t_first_old, 4),
+            "follow_worklist_s": round(t_follow_new, 4),
+            "follow_fixpoint_s": round(t_follow_old, 4),
+            "speedup": round((t_first_old + t_follow_old) / (t_first_new + t_follow_new), 1),
+        }
+        results.append(row)
+        print(f"{size:>6} NTs | FIRST {t_first_old:8.3f}s -> {t_first_new:7.3f}s | "
+              f"FOLLOW {t_follow_old:8.3f}s -> {t_follow_new:7.3f}s | x{row['speedup']}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 500, 1000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Arquivo para salvar os resultados")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.seed)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Gerador de programas Lukera sintéticos para benchmarks.
+
+Os programas são válidos para o parser (e para o compilador: toda variável usada foi
+declarada) e podem receber erros sintáticos propositais. O tamanho e a forma são
+controlados por parâmetros, e a mesma semente gera sempre o mesmo texto.
+
+Uso:
+    python -m benchmarks.generator --statements 2000 --functions 20 > grande.lk
+    python -m benchmarks.generator --statements 500 --broken 10 --seed 3
+"""
+import argparse
+import random
+from typing import List
+
+
+ARITHMETIC = ["+", "-", "*", "/", "%"]
+RELATIONAL = ["<", ">", "<=", ">=", "==", "!="]
+WORDS = ["alfa", "beta", "gama", "delta", "valor", "total", "linha", "coluna"]
+
+# Trocas que quebram um comando mantendo os tokens válidos (erros sintáticos, não léxicos)
+BREAKAGES = [(";", ""), (")", ""), ("(", ""), ("=", "= ="), ("{", ""), (";", "+ ;")]
+
+
+class ProgramGenerator:
+    """
+    Gera o texto de um programa. Parâmetros:
+      statements       comandos no total (principal + funções), aproximadamente
+      depth            profundidade máxima de blocos aninhados (se/enquanto/para)
+      expr_length      operadores binários por expressão
+      functions        quantidade de `funcao`
+      comment_density  probabilidade de um comentário antes de cada comando
+      string_density   probabilidade de um comando simples ser um escreve com textos
+      broken           quantidade de comandos com erro sintático proposital
+    """
+
+    def __init__(self, statements: int = 1000, depth: int = 3, expr_length: int = 4,
+                 functions: int = 10, comment_density: float = 0.1,
+                 string_density: float = 0.1, broken: int = 0, seed: int = 0):
+        self.statements = statements
+        self.depth = depth
+        self.expr_length = expr_length
+        self.functions = functions
+        self.comment_density = comment_density
+        self.string_density = string_density
+        self.broken = broken
+        self.rng = random.Random(seed)
+        self.lines: List[str] = []
+        self.scopes: List[List[str]] = []
+        self.counter = 0
+
+    # --- Programa ---
+
+    def generate(self) -> str:
+        rng = self.rng
+        per_unit = max(1, self.statements // (self.functions + 1))
+
+        self.lines = ["principal {"]
+        self.scopes = [[]]
+        self.block(per_unit, 1)
+        self.lines.append("}")
+
+        for index in range(self.functions):
+            params = [f"p{k}" for k in range(rng.randint(1, 3))]
+            signature = ", ".join(f"inteiro {name}" for name in params)
+            self.lines.append("")
+            self.lines.append(f"funcao inteiro f{index}({signature}) {{")
+            self.scopes = [list(params)]
+            self.block(per_unit - 1, 1)
+            self.lines.append(f"    retorna {self.expression()};")
+            self.lines.append("}")
+
+        self.inject_errors()
+        return "\n".join(self.lines) + "\n"
+
+    def inject_errors(self) -> None:
+        """Quebra `broken` linhas de comando escolhidas ao acaso (uma troca por linha)."""
+        candidates = [i for i, line in enumerate(self.lines)
+                      if line.strip() and not line.lstrip().startswith(("//", "/*", "funcao", "}"))]
+        for index in self.rng.sample(candidates, min(self.broken, len(candidates))):
+            line = self.lines[index]
+            options = [(old, new) for old, new in BREAKAGES if old in line]
+            if options:
+                old, new = self.rng.choice(options)
+                self.lines[index] = line.replace(old, new, 1)
+
+    # --- Comandos ---
+
+    def block(self, count: int, level: int) -> int:
+        """Emite até `count` comandos no nível `level`; retorna quantos foram emitidos."""
+        emitted = 0
+        # Novo escopo: as variáveis declaradas no bloco só são usadas dentro dele
+        self.scopes.append([])
+        while emitted < count:
+            emitted += self.statement(count - emitted, level)
+        self.scopes.pop()
+        return emitted
+
+    def statement(self, budget: int, level: int) -> int:
+        rng = self.rng
+        indent = "    " * level
+        if rng.random() < self.comment_density:
+            self.comment(indent)
+
+        variables = self.visible()
+        nested = level <= self.depth and budget > 3
+        roll = rng.random()
+
+        if not variables or roll < 0.2:
+            name = self.fresh()
+            self.lines.append(f"{indent}inteiro {name} = {self.expression()};")
+            self.scopes[-1].append(name)
+            return 1
+
+        if roll < 0.45 or not nested:
+            if rng.random() < self.string_density:
+                self.lines.append(f"{indent}escreve({self.arguments()});")
+            else:
+                self.lines.append(f"{indent}{rng.choice(variables)} = {self.expression()};")
+            return 1
+
+        inner = rng.randint(1, min(budget - 1, 8))
+        kind = rng.random()
+        if kind < 0.5:
+            self.lines.append(f"{indent}se ({self.condition()}) {{")
+            used = self.block(inner, level + 1)
+            if rng.random() < 0.3:
+                self.lines.append(f"{indent}}} senaose ({self.condition()}) {{")
+                used += self.block(1, level + 1)
+            if rng.random() < 0.5:
+                self.lines.append(f"{indent}}} senao {{")
+                used += self.block(1, level + 1)
+        elif kind < 0.75:
+            self.lines.append(f"{indent}enquanto ({self.condition()}) {{")
+            used = self.block(inner, level + 1)
+        else:
+            counter = rng.choice(variables)
+            self.lines.append(f"{indent}para ({counter} = 0; {counter} < {rng.randint(2, 50)}; "
+                              f"{counter} = {counter} + 1) {{")
+            used = self.block(inner, level + 1)
+        self.lines.append(f"{indent}}}")
+        return used + 1
+
+    def comment(self, indent: str) -> None:
+        words = " ".join(self.rng.choice(WORDS) for _ in range(self.rng.randint(2, 8)))
+        if self.rng.random() < 0.7:
+            self.lines.append(f"{indent}// {words}")
+        else:
+            self.lines.append(f"{indent}/* {words}")
+            self.lines.append(f"{indent}   {words} */")
+
+    # --- Expressões ---
+
+    def visible(self) -> List[str]:
+        return [name for scope in self.scopes for name in scope]
+
+    def fresh(self) -> str:
+        self.counter += 1
+        return f"v{self.counter}"
+
+    def operand(self, allow_nested: bool = True) -> str:
+        rng = self.rng
+        variables = self.visible()
+        roll = rng.random()
+        if variables and roll < 0.5:
+            return rng.choice(variables)
+        if roll < 0.75:
+            return str(rng.randint(0, 1000))
+        if roll < 0.85:
+            return f"{rng.randint(0, 99)}.{rng.randint(0, 99)}"
+        if allow_nested and roll < 0.93:
+            return f"({self.expression(max(1, self.expr_length // 2), False)})"
+        if allow_nested and variables:
+            return f"absoluto({rng.choice(variables)})"
+        return str(rng.randint(0, 9))
+
+    def expression(self, length: int = -1, allow_nested: bool = True) -> str:
+        length = self.expr_length if length < 0 else length
+        parts = [self.operand(allow_nested)]
+        for _ in range(self.rng.randint(max(0, length - 1), length)):
+            parts.append(self.rng.choice(ARITHMETIC))
+            parts.append(self.operand(allow_nested))
+        return " ".join(parts)
+
+    def condition(self) -> str:
+        rng = self.rng
+        condition = f"{self.expression(max(1, self.expr_length // 2))} {rng.choice(RELATIONAL)} {self.operand()}"
+        if rng.random() < 0.3:
+            condition += f" {rng.choice(['e', 'ou'])} nao {rng.choice(['verdadeiro', 'falso'])}"
+        return condition
+
+    def arguments(self) -> str:
+        args = []
+        for _ in range(self.rng.randint(1, 4)):
+            if self.rng.random() < 0.5:
+                words = " ".join(self.rng.choice(WORDS) for _ in range(self.rng.randint(1, 5)))
+                args.append(f'"{words}\\n"')
+            else:
+                args.append(self.expression(2))
+        return ", ".join(args)
+
+
+def generate_program(**shape) -> str:
+    """Atalho: texto de um programa com a forma dada (ver ProgramGenerator)."""
+    return ProgramGenerator(**shape).generate()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic Lukera program.")
+    parser.add_argument("--statements", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--expr-length", type=int, default=4)
+    parser.add_argument("--functions", type=int, default=10)
+    parser.add_argument("--comment-density", type=float, default=0.1)
+    parser.add_argument("--string-density", type=float, default=0.1)
+    parser.add_argument("--broken", type=int, default=0, help="number of injected syntax errors")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(generate_program(statements=args.statements, depth=args.depth,
+                           expr_length=args.expr_length, functions=args.functions,
+                           comment_density=args.comment_density,
+                           string_density=args.string_density,
+                           broken=args.broken, seed=args.seed), end="")
+
+
+if __name__ == "__main__":
+    main()
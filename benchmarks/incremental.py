@@ -0,0 +1,101 @@
+"""
+Benchmark da análise incremental: latência de uma edição pequena contra a re-análise
+completa (Tokenizer + Parser) do arquivo inteiro, em programas com muitas funções.
+
+Uso:
+    python -m benchmarks.incremental --functions 250 1000 4000
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import time
+from typing import Dict, List
+from src.incremental import IncrementalDocument
+from src.models_utils import build_lukera_lexeme, build_lukera_grammar
+from src.parser import Parser
+from src.regex_lexer import RegexTokenizer
+from src.trace import TRACE_OFF
+
+
+FUNCTION = """
+funcao inteiro f{i}(inteiro n) {{
+    inteiro s = 0;
+    enquanto (s < n) {{
+        s = s + {i} % 7;
+        se (s > 100) {{ retorna s; }}
+    }}
+    retorna f{j}(s - 1);
+}}
+"""
+
+
+def synthetic_source(n_functions: int) -> str:
+    """Programa com `n_functions` funções que se chamam em cadeia."""
+    functions = "".join(FUNCTION.format(i=i, j=(i + 1) % n_functions) for i in range(n_functions))
+    return "principal {\n    escreve(f0(10));\n}\n" + functions
+
+
+def full_parse(text: str) -> Parser:
+    lexemes, grammar = build_lukera_lexeme(), build_lukera_grammar()
+    with contextlib.redirect_stdout(io.StringIO()):
+        tokens = RegexTokenizer(None, lexemes, text=text).tokenize_compact()
+        parser = Parser(tokens, grammar, trace_level=TRACE_OFF, build_ast=True)
+        parser.parse()
+    return parser
+
+
+def run(n_functions: int, n_edits: int = 50, seed: int = 0) -> Dict[str, object]:
+    rng = random.Random(seed)
+    text = synthetic_source(n_functions)
+
+    started = time.perf_counter()
+    full_parse(text)
+    full_time = time.perf_counter() - started
+
+    document = IncrementalDocument(text)
+    edit_times: List[float] = []
+    for _ in range(n_edits):
+        # Troca o dígito de um '% 7' em uma função qualquer
+        pos = text.index("% ", rng.randrange(len(text) - 200)) + 2
+        digit = str(rng.randrange(2, 10))
+        document.edit(pos, pos + 1, digit)
+        text = text[:pos] + digit + text[pos + 1:]
+        edit_times.append(document.last_edit.elapsed)
+
+    assert document.ast == full_parse(text).ast, "incremental and full parse differ"
+    edit_times.sort()
+    median = edit_times[len(edit_times) // 2]
+    return {
+        "functions": n_functions,
+        "tokens": document.tokens,
+        "full_parse": full_time,
+        "edit_median": median,
+        "edit_max": edit_times[-1],
+        "speedup": full_time / median,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Incremental re-parse latency vs full parse.")
+    parser.add_argument("--functions", type=int, nargs="+", default=[250, 1000, 4000])
+    parser.add_argument("--edits", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for n_functions in args.functions:
+        result = run(n_functions, args.edits)
+        results.append(result)
+        print(f" {n_functions:>5} functions ({result['tokens']:>7} tokens) | "
+              f"full {result['full_parse'] * 1000:8.1f} ms | "
+              f"edit {result['edit_median'] * 1000:6.2f} ms (max {result['edit_max'] * 1000:.2f}) | "
+              f"x{result['speedup']:.0f}")
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
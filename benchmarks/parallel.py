@@ -0,0 +1,83 @@
+"""
+Benchmark da análise paralela de um arquivo (src.parallel): tempo de Parser.parse sobre o
+arquivo inteiro contra parse_parallel com diferentes quantidades de processos, em programas
+gerados com muitas funções. O ganho depende dos núcleos disponíveis (os.cpu_count()).
+
+Uso:
+    python -m benchmarks.parallel --functions 1000 4000 --workers 1 2 4 8
+    python -m benchmarks.parallel --no-ast      # só diagnósticos: sem serializar as ASTs
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+from typing import Dict, List
+from src.cache import load_grammar_tables
+from src.incremental import assemble_program
+from src.models_utils import build_lukera_lexeme, build_lukera_grammar
+from src.parallel import parse_parallel
+from src.parser import Parser
+from src.regex_lexer import RegexTokenizer
+from src.trace import TRACE_OFF
+from benchmarks.generator import generate_program
+
+
+def run(n_functions: int, workers: List[int], build_ast: bool = True,
+        statements_per_function: int = 12, repeat: int = 3, seed: int = 0) -> Dict[str, object]:
+    lexemes, grammar = build_lukera_lexeme(), build_lukera_grammar()
+    tables = load_grammar_tables(grammar)
+    source = generate_program(statements=n_functions * statements_per_function,
+                              functions=n_functions, seed=seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        tokens = RegexTokenizer(None, lexemes, text=source).tokenize_compact()
+
+    serial = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            parser = Parser(tokens, grammar, trace_level=TRACE_OFF, tables=tables,
+                            build_ast=build_ast)
+            parser.parse()
+            serial = min(serial, time.perf_counter() - started)
+
+    timings = {}
+    for count in workers:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            units = parse_parallel(tokens, count, build_ast)
+            best = min(best, time.perf_counter() - started)
+        if build_ast:
+            assert assemble_program(units) == parser.ast, "parallel and serial parse differ"
+        timings[count] = best
+
+    return {"functions": n_functions, "tokens": len(tokens), "serial": serial, "parallel": timings}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serial vs per-function parallel parse of one file.")
+    parser.add_argument("--functions", type=int, nargs="+", default=[1000, 4000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-ast", action="store_true", help="parse for diagnostics only")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    print(f" {os.cpu_count()} cores available")
+    results = []
+    for n_functions in args.functions:
+        result = run(n_functions, args.workers, not args.no_ast, repeat=args.repeat)
+        results.append(result)
+        cells = " | ".join(f"{count} workers {seconds * 1000:7.1f} ms (x{result['serial'] / seconds:.2f})"
+                           for count, seconds in result["parallel"].items())
+        print(f" {n_functions:>5} functions ({result['tokens']:>7} tokens) | "
+              f"serial {result['serial'] * 1000:7.1f} ms | {cells}")
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark do pré-passe vetorizado do Tokenizer manual (src.char_classes): tokenização de
+programas gerados com muitos comentários, com e sem o pré-passe (o tempo com o pré-passe
+inclui a classificação do texto com NumPy). Os tokens são conferidos.
+
+Uso:
+    python -m benchmarks.prepass --statements 2000 20000 --comment-density 0.9
+"""
+import argparse
+import contextlib
+import io
+import json
+from typing import Dict
+from src.char_classes import CharClasses
+from src.lexer import Tokenizer
+from src.models_utils import build_lukera_lexeme
+from benchmarks.generator import generate_program
+from benchmarks.suite import best_time
+
+
+def run(statements: int, comment_density: float, repeat: int = 3) -> Dict[str, float]:
+    lexeme = build_lukera_lexeme()
+    text = generate_program(statements=statements, functions=max(1, statements // 100),
+                            comment_density=comment_density)
+
+    def tokenize(prepass: bool):
+        return Tokenizer(None, lexeme, text=text, prepass=prepass).tokenize_compact()
+
+    CharClasses("") # Importa o NumPy fora da medição
+    with contextlib.redirect_stdout(io.StringIO()):
+        plain, fast = tokenize(False), tokenize(True)
+    assert (plain.types, plain.starts, plain.ends) == (fast.types, fast.starts, fast.ends)
+
+    return {
+        "statements": statements,
+        "characters": len(text),
+        "tokens": len(plain),
+        "plain": best_time(lambda: tokenize(False), repeat)[0],
+        "prepass": best_time(lambda: tokenize(True), repeat)[0],
+        "classify": best_time(lambda: CharClasses(text), repeat)[0],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hand-written lexer with and without the NumPy pre-pass.")
+    parser.add_argument("--statements", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--comment-density", type=float, default=0.9)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for statements in args.statements:
+        result = run(statements, args.comment_density, args.repeat)
+        results.append(result)
+        print(f" {result['characters']:>9} chars {result['tokens']:>8} tokens | "
+              f"plain {result['plain'] * 1000:8.1f} ms | "
+              f"pre-pass {result['prepass'] * 1000:8.1f} ms "
+              f"(x{result['plain'] / result['prepass']:.2f}, "
+              f"classification {result['classify'] * 1000:.1f} ms)")
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark do servidor de compilação (src.server): latência de ida e volta de um pedido
+"parse" pelo socket Unix contra uma execução nova do CLI (python -m src) para o mesmo
+arquivo, e vazão com vários clientes concorrentes.
+
+Uso:
+    python -m benchmarks.server --statements 50 500 --clients 16 --workers 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+from src.server import send_request
+from benchmarks.generator import generate_program
+
+
+def cli_time(path: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "src", path], stdout=subprocess.DEVNULL, check=False)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+async def throughput(socket_path: str, text: str, clients: int, per_client: int) -> float:
+    async def client() -> None:
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        for index in range(per_client):
+            writer.write(json.dumps({"id": index, "text": text}).encode("utf-8") + b"\n")
+        await writer.drain()
+        for _ in range(per_client):
+            assert json.loads(await reader.readline())["ok"]
+        writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return clients * per_client / (time.perf_counter() - started)
+
+
+def run(statements: int, clients: int, workers: int, repeat: int = 5) -> Dict[str, float]:
+    text = generate_program(statements=statements, functions=max(1, statements // 50))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "programa.lk")
+        with open(path, "w") as source_file:
+            source_file.write(text)
+        socket_path = os.path.join(directory, "server.sock")
+
+        server = subprocess.Popen([sys.executable, "-m", "src.server", "--socket", socket_path,
+                                   "--workers", str(workers)],
+                                  stdout=subprocess.PIPE, text=True)
+        try:
+            server.stdout.readline() # " Listening on ..."
+            round_trip = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                assert send_request(socket_path, {"id": 0, "path": path})["ok"]
+                round_trip = min(round_trip, time.perf_counter() - started)
+            rate = asyncio.run(throughput(socket_path, text, clients, per_client=10))
+        finally:
+            server.terminate()
+            server.wait()
+
+        return {
+            "statements": statements,
+            "cli": cli_time(path, repeat),
+            "server": round_trip,
+            "requests_per_second": rate,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile server round-trip vs a fresh CLI run.")
+    parser.add_argument("--statements", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for statements in args.statements:
+        result = run(statements, args.clients, args.workers)
+        results.append(result)
+        print(f" {statements:>5} statements | CLI {result['cli'] * 1000:7.1f} ms | "
+              f"server {result['server'] * 1000:6.2f} ms | "
+              f"{args.clients} clients {result['requests_per_second']:7.0f} requests/s")
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Suíte de benchmarks do front-end (lexer, parser e tabelas) em programas sintéticos.
+
+Para cada tamanho, gera um programa válido e um com erros (benchmarks.generator) e mede:
+  - tokens/s de Tokenizer.tokenize (manual), RegexTokenizer.tokenize e tokenize_compact
+  - passos/s e tokens/s de Parser.parse (trace desligado), com e sem erros sintáticos
+  - pico de memória (tracemalloc) de tokenize + parse
+E, uma vez, o tempo de construção das tabelas da gramática (sem cache e do disco).
+
+Os resultados são gravados em JSON; --compare aponta regressões contra uma execução anterior.
+
+Uso:
+    python -m benchmarks.suite --output resultados.json
+    python -m benchmarks.suite --sizes 500 2000 --compare resultados.json --threshold 0.15
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+from src import cache
+from src.cache import build_grammar_tables, load_grammar_tables
+from src.lexer import Tokenizer
+from src.models_utils import build_lukera_lexeme, build_lukera_grammar
+from src.parser import Parser
+from src.regex_lexer import RegexTokenizer
+from src.trace import TRACE_OFF, TRACE_SUMMARY
+from benchmarks.generator import generate_program
+
+
+# Métricas comparadas por --compare: nome -> True se maior é melhor
+METRICS = {
+    "lex_hand_tokens_per_s": True,
+    "lex_regex_tokens_per_s": True,
+    "lex_compact_tokens_per_s": True,
+    "parse_steps_per_s": True,
+    "parse_tokens_per_s": True,
+    "parse_broken_tokens_per_s": True,
+    "peak_memory_bytes": False,
+    "table_build_s": False,
+    "table_load_s": False,
+}
+
+
+def best_time(function: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    """Menor tempo de `repeat` execuções (com a saída padrão descartada) e o último resultado."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            result = function()
+            best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def parse(tokens, grammar, tables, trace_level: str = TRACE_OFF) -> Parser:
+    parser = Parser(tokens, grammar, trace_level=trace_level, tables=tables)
+    parser.parse()
+    return parser
+
+
+def measure_tables(repeat: int) -> Dict[str, float]:
+    """Construção completa das tabelas (FIRST, FOLLOW, tabela, compilação) e leitura do disco."""
+    grammar = build_lukera_grammar()
+    build, _ = best_time(lambda: build_grammar_tables(grammar), repeat)
+
+    with tempfile.TemporaryDirectory() as directory:
+        previous = os.environ.get("LUKERA_CACHE_DIR")
+        os.environ["LUKERA_CACHE_DIR"] = directory
+        try:
+            load_grammar_tables(grammar)
+
+            def load():
+                cache._loaded.clear() # Força a leitura do arquivo
+                return load_grammar_tables(grammar)
+
+            load_time, _ = best_time(load, repeat)
+        finally:
+            if previous is None:
+                del os.environ["LUKERA_CACHE_DIR"]
+            else:
+                os.environ["LUKERA_CACHE_DIR"] = previous
+    return {"table_build_s": build, "table_load_s": load_time}
+
+
+def measure_size(statements: int, repeat: int, seed: int, shape: Dict[str, object]) -> Dict[str, object]:
+    lexemes, grammar = build_lukera_lexeme(), build_lukera_grammar()
+    tables = load_grammar_tables(grammar)
+    source = generate_program(statements=statements, seed=seed, **shape)
+    broken = generate_program(statements=statements, seed=seed,
+                              broken=max(1, statements // 100), **shape)
+
+    hand_time, tokens = best_time(lambda: Tokenizer(None, lexemes, text=source).tokenize(), repeat)
+    regex_time, _ = best_time(lambda: RegexTokenizer(None, lexemes, text=source).tokenize(), repeat)
+    compact_time, _ = best_time(
+        lambda: RegexTokenizer(None, lexemes, text=source).tokenize_compact(), repeat)
+    n_tokens = len(tokens)
+
+    # Passos do parser (contados pelo trace resumido), cronometrado com o trace desligado
+    _, summary_parser = best_time(lambda: parse(tokens, grammar, tables, TRACE_SUMMARY), 1)
+    steps = summary_parser.trace.summary()["steps"]
+    parse_time, parser = best_time(lambda: parse(tokens, grammar, tables), repeat)
+    assert not parser.errors, "the generated program should be valid"
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        broken_tokens = RegexTokenizer(None, lexemes, text=broken).tokenize()
+    broken_time, broken_parser = best_time(lambda: parse(broken_tokens, grammar, tables), repeat)
+
+    # Pico de memória em uma execução à parte (tracemalloc deixa tudo mais lento)
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parse(RegexTokenizer(None, lexemes, text=source).tokenize(), grammar, tables)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "statements": statements,
+        "characters": len(source),
+        "tokens": n_tokens,
+        "parse_steps": steps,
+        "broken_errors": len(broken_parser.errors),
+        "lex_hand_s": hand_time,
+        "lex_regex_s": regex_time,
+        "lex_compact_s": compact_time,
+        "parse_s": parse_time,
+        "parse_broken_s": broken_time,
+        "lex_hand_tokens_per_s": n_tokens / hand_time,
+        "lex_regex_tokens_per_s": n_tokens / regex_time,
+        "lex_compact_tokens_per_s": n_tokens / compact_time,
+        "parse_steps_per_s": steps / parse_time,
+        "parse_tokens_per_s": n_tokens / parse_time,
+        "parse_broken_tokens_per_s": len(broken_tokens) / broken_time,
+        "peak_memory_bytes": peak,
+    }
+
+
+def environment() -> Dict[str, str]:
+    """Identificação da execução: versão do Python, máquina e commit (se houver git)."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], threshold: float) -> List[str]:
+    """Métricas que pioraram mais que `threshold` (fração) em relação à execução de base."""
+    regressions = []
+    pairs = [("tables", current["tables"], baseline.get("tables", {}))]
+    old_sizes = {r["statements"]: r for r in baseline.get("sizes", [])}
+    pairs += [(f"{r['statements']} statements", r, old_sizes.get(r["statements"], {}))
+              for r in current["sizes"]]
+
+    for label, new, old in pairs:
+        for metric, higher_is_better in METRICS.items():
+            if metric not in new or not old.get(metric):
+                continue
+            change = (new[metric] - old[metric]) / old[metric]
+            worse = -change if higher_is_better else change
+            if worse > threshold:
+                regressions.append(f"{label}: {metric} {old[metric]:.4g} -> {new[metric]:.4g} "
+                                   f"({worse * 100:.0f}% worse)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Lexer/parser benchmark suite on generated programs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 8000],
+                        help="number of statements of each generated program")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--expr-length", type=int, default=4)
+    parser.add_argument("--functions", type=int, default=20)
+    parser.add_argument("--comment-density", type=float, default=0.1)
+    parser.add_argument("--string-density", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", metavar="PATH", help="save the results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="JSON of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    shape = {"depth": args.depth, "expr_length": args.expr_length, "functions": args.functions,
+             "comment_density": args.comment_density, "string_density": args.string_density}
+
+    tables = measure_tables(args.repeat)
+    print(f" tables: build {tables['table_build_s'] * 1000:.1f} ms, "
+          f"load {tables['table_load_s'] * 1000:.2f} ms")
+
+    sizes = []
+    for statements in args.sizes:
+        result = measure_size(statements, args.repeat, args.seed, shape)
+        sizes.append(result)
+        print(f" {statements:>6} statements ({result['tokens']:>7} tokens) | "
+              f"lex hand {result['lex_hand_tokens_per_s'] / 1e3:7.0f}k tok/s, "
+              f"regex {result['lex_regex_tokens_per_s'] / 1e3:7.0f}k, "
+              f"compact {result['lex_compact_tokens_per_s'] / 1e3:7.0f}k | "
+              f"parse {result['parse_steps_per_s'] / 1e6:5.2f}M steps/s, "
+              f"broken {result['parse_broken_tokens_per_s'] / 1e3:5.0f}k tok/s | "
+              f"peak {result['peak_memory_bytes'] / 2**20:6.1f} MiB")
+
+    results = {"environment": environment(), "shape": shape, "tables": tables, "sizes": sizes}
+
+    if args.output:
+        with open(args.output, "w") as json_file:
+            json.dump(results, json_file, indent=4)
+
+    if args.compare:
+        with open(args.compare) as json_file:
+            baseline = json.load(json_file)
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"[REGRESSION] {line}")
+        if regressions:
+            return 1
+        print(f" No regressions above {args.threshold * 100:.0f}% "
+              f"(baseline {baseline.get('environment', {}).get('commit') or args.compare}).")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
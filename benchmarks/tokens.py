@@ -0,0 +1,92 @@
+"""
+Benchmark do formato binário de tokens (src.token_file): tamanho em disco e tempo de
+gravação/carga contra o JSON de Tokenizer.save_as_json e contra re-tokenizar o fonte.
+
+Uso:
+    python -m benchmarks.tokens --statements 2000 20000
+"""
+import argparse
+import json
+import os
+import tempfile
+from typing import Dict, List
+from src.models_utils import build_lukera_lexeme
+from src.regex_lexer import RegexTokenizer
+from src.token_file import load_tokens, save_tokens
+from benchmarks.generator import generate_program
+from benchmarks.suite import best_time
+
+
+def run(statements: int, repeat: int = 3) -> Dict[str, float]:
+    lexemes = build_lukera_lexeme()
+    source = generate_program(statements=statements, functions=max(1, statements // 100))
+
+    with tempfile.TemporaryDirectory() as directory:
+        source_path = os.path.join(directory, "programa.lk")
+        json_path = os.path.join(directory, "tokens.json")
+        binary_path = os.path.join(directory, "tokens.lkt")
+        with open(source_path, "w") as source_file:
+            source_file.write(source)
+
+        lex_time, lexer = best_time(lambda: _lexed(source_path, lexemes), repeat)
+        tokens = lexer.tokens
+        json_save, _ = best_time(lambda: lexer.save_as_json(json_path), repeat)
+        json_load, _ = best_time(lambda: _read_json(json_path), repeat)
+        binary_save, _ = best_time(lambda: save_tokens(tokens, binary_path), repeat)
+        mmap_load, loaded = best_time(lambda: load_tokens(binary_path), repeat)
+        read_load, _ = best_time(lambda: load_tokens(binary_path, use_mmap=False), repeat)
+        # Carga + leitura de todos os tipos (o que o parser faz), para não medir só o mmap
+        scan, _ = best_time(lambda: sum(load_tokens(binary_path).types), repeat)
+        assert [(t.type, t.value) for t in loaded] == [(t.type, t.value) for t in tokens]
+
+        return {
+            "statements": statements,
+            "tokens": len(tokens),
+            "source_bytes": len(source.encode("utf-8")),
+            "json_bytes": os.path.getsize(json_path),
+            "binary_bytes": os.path.getsize(binary_path),
+            "lex": lex_time,
+            "json_save": json_save,
+            "json_load": json_load,
+            "binary_save": binary_save,
+            "binary_load_mmap": mmap_load,
+            "binary_load_read": read_load,
+            "binary_load_scan": scan,
+        }
+
+
+def _lexed(path: str, lexemes) -> RegexTokenizer:
+    lexer = RegexTokenizer(path, lexemes)
+    lexer.tokenize_compact()
+    return lexer
+
+
+def _read_json(path: str) -> List[list]:
+    with open(path) as json_file:
+        return json.load(json_file)["tokens"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Binary token file vs JSON vs re-lexing.")
+    parser.add_argument("--statements", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for statements in args.statements:
+        r = run(statements, args.repeat)
+        results.append(r)
+        print(f" {r['tokens']:>8} tokens | size: source {r['source_bytes'] / 1024:7.0f} KiB, "
+              f"json {r['json_bytes'] / 1024:7.0f} KiB, binary {r['binary_bytes'] / 1024:7.0f} KiB | "
+              f"lex {r['lex'] * 1000:7.1f} ms | json save {r['json_save'] * 1000:7.1f} / "
+              f"load {r['json_load'] * 1000:7.1f} ms | binary save {r['binary_save'] * 1000:6.1f} / "
+              f"load {r['binary_load_mmap'] * 1000:5.2f} ms (read {r['binary_load_read'] * 1000:5.2f}, "
+              f"scan {r['binary_load_scan'] * 1000:5.1f})")
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Benchmark da VM de bytecode contra um interpretador ingênuo que percorre a AST.
+
+O interpretador de referência avalia os nós recursivamente e guarda as variáveis em
+dicionários por nome (um por escopo), como um primeiro interpretador faria.
+
+Uso:
+    python -m benchmarks.vm
+    python -m benchmarks.vm --scale 2 --json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List
+from src.compiler import compile_program
+from src.lexer import Tokenizer
+from src.models_utils import build_lukera_lexeme, build_lukera_grammar
+from src.parser import Parser
+from src.syntax_tree import (Program, Declaration, Assign, If, While, For, Return, Call,
+                             Builtin, BinOp, UnaryOp, Var, Literal)
+from src.vm import VirtualMachine, format_value
+
+
+PROGRAMS = {
+    "loop_sum": """
+principal {
+    inteiro soma = 0;
+    inteiro i = 0;
+    enquanto (i < {n}) {
+        soma = soma + i % 7;
+        i = i + 1;
+    }
+    retorna soma;
+}
+""",
+    "nested_for": """
+principal {
+    inteiro total = 0;
+    inteiro i = 0;
+    inteiro j = 0;
+    para (i = 0; i < {m}; i = i + 1) {
+        para (j = 0; j < {m}; j = j + 1) {
+            se (i == j ou (i + j) % 3 == 0) { total = total + 1; }
+        }
+    }
+    retorna total;
+}
+""",
+    "fib_recursive": """
+principal {
+    retorna fib({f});
+}
+
+funcao inteiro fib(inteiro n) {
+    se (n < 2) { retorna n; }
+    retorna fib(n - 1) + fib(n - 2);
+}
+""",
+    "primes": """
+principal {
+    inteiro n = 2;
+    inteiro count = 0;
+    enquanto (n < {p}) {
+        inteiro d = 2;
+        logico primo = verdadeiro;
+        enquanto (d * d <= n e primo) {
+            se (n % d == 0) { primo = falso; }
+            d = d + 1;
+        }
+        se (primo) { count = count + 1; }
+        n = n + 1;
+    }
+    retorna count;
+}
+""",
+}
+
+
+class _Return(Exception):
+    def __init__(self, value):
+        self.value = value
+
+
+class TreeInterpreter:
+    """Interpretador de referência: percorre a AST, variáveis em dicionários por nome."""
+
+    def __init__(self, program: Program):
+        self.program = program
+        self.functions = {f.name: f for f in program.functions}
+        self.output: List[str] = []
+
+    def run(self):
+        try:
+            self.block(self.program.body, [{}])
+        except _Return as r:
+            return r.value
+        return None
+
+    def block(self, statements, scopes):
+        scopes = scopes + [{}]
+        for statement in statements:
+            self.statement(statement, scopes)
+
+    def lookup(self, name, scopes):
+        for scope in reversed(scopes):
+            if name in scope:
+                return scope
+        raise NameError(name)
+
+    def statement(self, node, scopes):
+        if isinstance(node, Declaration):
+            scopes[-1][node.name] = self.eval(node.value, scopes) if node.value is not None else 0
+        elif isinstance(node, Assign):
+            self.lookup(node.name, scopes)[node.name] = self.eval(node.value, scopes)
+        elif isinstance(node, If):
+            if self.eval(node.cond, scopes):
+                self.block(node.body, scopes)
+            else:
+                self.block(node.orelse, scopes)
+        elif isinstance(node, While):
+            while self.eval(node.cond, scopes):
+                self.block(node.body, scopes)
+        elif isinstance(node, For):
+            self.statement(node.init, scopes)
+            while self.eval(node.cond, scopes):
+                self.block(node.body, scopes)
+                self.statement(node.step, scopes)
+        elif isinstance(node, Return):
+            raise _Return(self.eval(node.value, scopes))
+        else:
+            self.eval(node, scopes)
+
+    def eval(self, node, scopes):
+        if isinstance(node, Literal):
+            return node.value
+        if isinstance(node, Var):
+            return self.lookup(node.name, scopes)[node.name]
+        if isinstance(node, BinOp):
+            if node.op == 'e':
+                return self.eval(node.left, scopes) and self.eval(node.right, scopes)
+            if node.op == 'ou':
+                return self.eval(node.left, scopes) or self.eval(node.right, scopes)
+            a, b = self.eval(node.left, scopes), self.eval(node.right, scopes)
+            op = node.op
+            if op == '+': return a + b
+            if op == '-': return a - b
+            if op == '*': return a * b
+            if op == '/': return a // b if type(a) is int and type(b) is int else a / b
+            if op == '%': return a % b
+            if op == '^': return a ** b
+            if op == '<': return a < b
+            if op == '>': return a > b
+            if op == '<=': return a <= b
+            if op == '>=': return a >= b
+            if op == '==': return a == b
+            return a != b
+        if isinstance(node, UnaryOp):
+            value = self.eval(node.operand, scopes)
+            return -value if node.op == '-' else not value
+        if isinstance(node, Call):
+            function = self.functions[node.name]
+            args = [self.eval(arg, scopes) for arg in node.args]
+            try:
+                self.block(function.body, [{p.name: v for p, v in zip(function.params, args)}])
+            except _Return as r:
+                return r.value
+            return None
+        if isinstance(node, Builtin):
+            self.output.append("".join(format_value(self.eval(a, scopes)) for a in node.args))
+            return None
+        raise ValueError(node)
+
+
+def parse_source(source: str) -> Program:
+    """Tokeniza e analisa um programa escrito em memória (via arquivo temporário)."""
+    with tempfile.NamedTemporaryFile('w', suffix='.lk', delete=False, encoding='utf-8') as file:
+        file.write(source)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            tokens = Tokenizer(file.name, build_lukera_lexeme()).tokenize()
+            parser = Parser(tokens, build_lukera_grammar(), build_ast=True)
+            parser.parse()
+    finally:
+        os.unlink(file.name)
+    if parser.errors:
+        raise ValueError(parser.errors)
+    return parser.ast
+
+
+def run(scale: float = 1.0) -> List[Dict[str, object]]:
+    sizes = {"n": int(200000 * scale), "m": int(300 * scale ** 0.5),
+             "f": 20 + int(scale).bit_length(), "p": int(20000 * scale)}
+    results = []
+
+    for name, template in PROGRAMS.items():
+        source = template
+        for key, value in sizes.items():
+            source = source.replace("{" + key + "}", str(value))
+        ast = parse_source(source)
+
+        started = time.perf_counter()
+        program = compile_program(ast)
+        compile_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        vm_result = VirtualMachine(program).run()
+        vm_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        tree_result = TreeInterpreter(ast).run()
+        tree_time = time.perf_counter() - started
+
+        assert vm_result == tree_result, (name, vm_result, tree_result)
+        results.append({
+            "program": name,
+            "result": vm_result,
+            "compile": compile_time,
+            "vm": vm_time,
+            "tree_walker": tree_time,
+            "speedup": tree_time / vm_time,
+        })
+        print(f" {name:<14} | tree {tree_time:7.3f}s -> vm {vm_time:7.3f}s "
+              f"(compile {compile_time * 1000:.2f} ms) | x{tree_time / vm_time:.1f}")
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bytecode VM vs tree-walking interpreter.")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiplies the size of every program")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.scale)
+    if args.json:
+        print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
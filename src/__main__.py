@@ -0,0 +1,296 @@
+"""
+Linha de comando do compilador: tokeniza e analisa um arquivo .lk.
+
+    python -m src exemplos/00_basico.lk
+    python -m src programa.lk --engine regex --compact --trace summary
+    python -m src programa.lk --save-tokens programa.lkt && python -m src programa.lkt
+    python -m src programa.lk --compile-cache --run   # sem mudanças no arquivo, pula lexer e parser
+
+Não importa o Pandas: as tabelas visuais continuam disponíveis no notebook
+(Parser.build_execution_table e parsing_table_pandas).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List, Optional
+from .bytecode import disassemble
+from .compile_cache import CompileCache
+from .compiler import compile_program
+from .instrumentation import Instrumentation
+from .line_index import LineIndex
+from .lexer import Tokenizer
+from .regex_lexer import RegexTokenizer
+from .models_utils import build_lukera_lexeme, build_lukera_grammar
+from .incremental import assemble_program, unit_errors
+from .optimizer import optimize
+from .parallel import parse_parallel
+from .parser import Parser
+from .trace import TRACE_LEVELS, TRACE_OFF, TRACE_STREAM, TRACE_SUMMARY
+from .token_file import TOKEN_FILE_EXTENSION, load_tokens, save_tokens
+from .trace_export import TraceWriter
+from .vm import VirtualMachine, format_value
+
+
+ENGINES = {"hand": Tokenizer, "regex": RegexTokenizer}
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src",
+        description="Tokenize and parse a Lukera (.lk) source file.")
+    parser.add_argument("file", help="source file (.lk) or token file saved with --save-tokens (.lkt)")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="regex",
+                        help="lexer engine (default: regex)")
+    parser.add_argument("--prepass", action="store_true",
+                        help="with --engine hand, classify the whole source with NumPy first "
+                             "and jump over whitespace, comments, words and digits "
+                             "(requires numpy, see requirements.txt)")
+    parser.add_argument("--compact", action="store_true",
+                        help="tokenize into a TokenBuffer instead of Token objects")
+    parser.add_argument("--stream", action="store_true",
+                        help="read the file in chunks and feed tokens to the parser lazily")
+    parser.add_argument("--trace", choices=[level for level in TRACE_LEVELS if level != TRACE_STREAM],
+                        default=TRACE_OFF, help="parser trace level (default: off)")
+    parser.add_argument("--trace-out", metavar="PATH",
+                        help="stream every parser step to a CSV (or .jsonl) file while parsing")
+    parser.add_argument("--trace-size", type=int, default=1000,
+                        help="number of steps kept by the 'ring' trace")
+    parser.add_argument("--parallel", type=int, nargs="?", const=0, metavar="WORKERS",
+                        help="parse principal and each function in worker processes "
+                             "(default: one per core); implies --compact")
+    parser.add_argument("--max-errors", type=int, default=100,
+                        help="stop parsing after this many syntax errors (0: no limit)")
+    parser.add_argument("--tokens", action="store_true",
+                        help="print the tokens before parsing")
+    parser.add_argument("--json", metavar="PATH",
+                        help="save the tokens as JSON")
+    parser.add_argument("--save-tokens", metavar="PATH",
+                        help="save the tokens in the binary format (.lkt), reloadable without lexing")
+    parser.add_argument("--ast", action="store_true",
+                        help="print the syntax tree as JSON")
+    parser.add_argument("-O", "--optimize", action="store_true",
+                        help="fold constants and remove dead code before --ast/--run/--dis")
+    parser.add_argument("--run", action="store_true",
+                        help="compile the program to bytecode and run it")
+    parser.add_argument("--dis", action="store_true",
+                        help="print the compiled bytecode")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="random seed for aleatorio/faixa")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="rebuild the grammar tables instead of loading them from the table cache")
+    parser.add_argument("--compile-cache", action="store_true",
+                        help="reuse the tokens, errors, tree and bytecode of an unchanged file "
+                             "from the compile cache")
+    parser.add_argument("--time", action="store_true",
+                        help="print the elapsed time of each phase")
+    parser.add_argument("--instrument", metavar="PATH",
+                        help="save per-phase timings and counters as JSON ('-' prints them)")
+    parser.add_argument("--memory", action="store_true",
+                        help="with --instrument, also record the peak memory of each phase")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Executa o CLI. Retorna 0 sem erros, 1 com erros léxicos, sintáticos, semânticos ou de
+    execução e 2 se o arquivo não existe.
+    """
+    args = build_arg_parser().parse_args(argv)
+
+    if args.stream and (args.compact or args.tokens or args.json):
+        print("Error: --stream cannot be combined with --compact, --tokens or --json.")
+        return 2
+    if args.parallel is not None and (args.stream or args.trace != TRACE_OFF or args.trace_out):
+        print("Error: --parallel cannot be combined with --stream or --trace.")
+        return 2
+    if args.prepass and (args.engine != "hand" or args.stream):
+        print("Error: --prepass needs --engine hand and cannot be combined with --stream.")
+        return 2
+    if args.trace_out and args.trace != TRACE_OFF:
+        print("Error: --trace-out cannot be combined with --trace.")
+        return 2
+    from_token_file = args.file.endswith(TOKEN_FILE_EXTENSION)
+    if from_token_file and (args.stream or args.parallel is not None):
+        print("Error: --stream and --parallel need a source file, not a token file.")
+        return 2
+    if args.compile_cache and args.no_cache:
+        print("Error: --compile-cache cannot be combined with --no-cache.")
+        return 2
+    if args.compile_cache and (from_token_file or args.stream or args.parallel is not None
+                               or args.json or args.trace != TRACE_OFF or args.trace_out
+                               or args.instrument):
+        print("Error: --compile-cache cannot be combined with token files, --stream, --parallel, "
+              "--json, --trace or --instrument.")
+        return 2
+    if not os.path.isfile(args.file):
+        print(f"Error: File not found at '{args.file}'")
+        return 2
+
+    timings = []
+    started = time.perf_counter()
+    instrumentation = Instrumentation(memory=args.memory) if args.instrument else None
+
+    # 1. Análise Léxica
+    lexical_error = False
+    lines: Optional[LineIndex] = None # Inícios de linha do fonte, para os erros (linha:coluna)
+    cached = None                     # Resultado do cache de compilação (--compile-cache)
+
+    if args.compile_cache:
+        # Arquivo sem mudanças: tokens, erros, AST e bytecode vêm do disco
+        cached, hit = CompileCache().compile(args.file)
+        tokens = cached.tokens
+        timings.append(("cache" if hit else "lexer", time.perf_counter() - started))
+        print(" Loaded from the compile cache." if hit else " Stored in the compile cache.")
+        if cached.lexical_error:
+            print(cached.lexical_error)
+        lexical_error = cached.lexical_error is not None
+
+        if args.tokens:
+            for token in tokens:
+                print(f"<{token.get_type()}, {token.get_value()}>")
+        if args.save_tokens:
+            save_tokens(tokens, args.save_tokens)
+
+    elif from_token_file:
+        # Tokens já gerados (--save-tokens): o arquivo é mapeado em memória, sem o lexer
+        try:
+            tokens = load_tokens(args.file)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 2
+        lexical_error = len(tokens) == 0 or tokens.get_type(len(tokens) - 1) != "EOF"
+        timings.append(("load", time.perf_counter() - started))
+
+    elif args.stream:
+        # Tokens gerados sob demanda, consumidos diretamente pelo parser
+        lexer = ENGINES[args.engine](args.file, build_lukera_lexeme(), streaming=True,
+                                     instrumentation=instrumentation)
+        lines = lexer.lines
+        last_type = [None]
+
+        def tokens_seen():
+            for token in lexer.stream():
+                last_type[0] = token.type
+                yield token
+
+        tokens = tokens_seen()
+    else:
+        options = {"prepass": True} if args.prepass else {}
+        lexer = ENGINES[args.engine](args.file, build_lukera_lexeme(),
+                                     instrumentation=instrumentation, **options)
+        lines = lexer.lines
+        compact = args.compact or args.parallel is not None
+        tokens = lexer.tokenize_compact() if compact else lexer.tokenize()
+        # Sem o EOF no final, o lexer parou em um erro (já exibido)
+        lexical_error = len(tokens) == 0 or tokens[len(tokens) - 1].type != "EOF"
+        timings.append(("lexer", time.perf_counter() - started))
+
+        if args.tokens:
+            for token in tokens:
+                print(f"<{token.get_type()}, {token.get_value()}>")
+        if args.json:
+            lexer.save_as_json(args.json)
+        if args.save_tokens:
+            lexer.save_as_binary(args.save_tokens)
+
+    # 2. Análise Sintática (a AST só é construída quando alguma etapa seguinte a usa)
+    build_ast = args.run or args.dis or args.ast or args.optimize
+    if cached is not None:
+        errors, ast, suppressed = cached.errors, cached.ast, cached.suppressed_errors
+    elif args.parallel is not None:
+        # O principal e cada função em um processo; resultados na ordem do texto
+        phase = time.perf_counter()
+        units = parse_parallel(tokens, args.parallel or None, build_ast)
+        timings.append(("parser", time.perf_counter() - phase))
+        errors = unit_errors(units, lexer.lines)
+        ast = assemble_program(units)
+        suppressed = 0
+    else:
+        phase = time.perf_counter()
+        writer = TraceWriter(args.trace_out) if args.trace_out else None
+        parser = Parser(tokens, build_lukera_grammar(),
+                        trace_level=TRACE_STREAM if writer else args.trace,
+                        trace_size=args.trace_size, use_cache=not args.no_cache, build_ast=build_ast,
+                        instrumentation=instrumentation, max_errors=args.max_errors or None,
+                        trace_writer=writer, lines=lines)
+        timings.append(("tables", time.perf_counter() - phase))
+
+        phase = time.perf_counter()
+        parser.parse()
+        timings.append(("parser", time.perf_counter() - phase))
+        if writer is not None:
+            writer.close()
+        errors, ast, suppressed = parser.errors, parser.ast, parser.suppressed_errors
+
+    if args.stream:
+        # O gerador termina sem EOF quando há erro léxico
+        lexical_error = last_type[0] != "EOF"
+
+    # 3. Relatório
+    for error in errors:
+        print(error)
+    if suppressed:
+        print(f" ({suppressed} cascading errors suppressed)")
+
+    if args.trace == TRACE_SUMMARY:
+        for name, value in parser.trace.summary().items():
+            print(f"{name}: {value}")
+    elif args.trace != TRACE_OFF:
+        for row in parser.trace_data:
+            print(" | ".join(row.values()))
+
+    failed = lexical_error or bool(errors)
+    if args.optimize and not failed:
+        phase = time.perf_counter()
+        ast, report = optimize(ast)
+        timings.append(("optimize", time.perf_counter() - phase))
+        print(f" Optimized: {report.nodes_removed} of {report.nodes_before} nodes removed "
+              f"({report.folded} folded, {report.branches_pruned} branches pruned, "
+              f"{report.unreachable} unreachable statements, "
+              f"{report.functions_removed} unused functions)")
+
+    if args.ast and ast is not None:
+        print(json.dumps(ast.to_dict(), indent=2, ensure_ascii=False))
+
+    # 4. Compilação e execução (apenas sem erros)
+    if (args.run or args.dis) and not failed:
+        try:
+            phase = time.perf_counter()
+            if cached is not None and not args.optimize and cached.semantic_error:
+                raise Exception(cached.semantic_error)
+            if cached is not None and not args.optimize and cached.bytecode is not None:
+                program = cached.bytecode
+            else:
+                program = compile_program(ast)
+            timings.append(("compile", time.perf_counter() - phase))
+
+            if args.dis:
+                print(disassemble(program))
+            if args.run:
+                phase = time.perf_counter()
+                result = VirtualMachine(program, seed=args.seed).run()
+                timings.append(("run", time.perf_counter() - phase))
+                print()
+                print(f" Program returned {format_value(result)}")
+        except Exception as e:
+            print(e)
+            failed = True
+
+    if args.time:
+        timings.append(("total", time.perf_counter() - started))
+        for name, seconds in timings:
+            print(f"{name:>7}: {seconds * 1000:.2f} ms")
+
+    if instrumentation is not None:
+        if args.instrument == "-":
+            print(instrumentation.to_json())
+        else:
+            instrumentation.to_json(args.instrument)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
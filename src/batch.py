@@ -0,0 +1,263 @@
+"""
+Compilação em lote: analisa (léxico + sintático) muitos arquivos .lk em paralelo.
+
+    python -m src.batch exemplos/
+    python -m src.batch "alunos/**/*.lk" --workers 8 --json relatorio.json
+    python -m src.batch alunos/ --cache        # arquivos que não mudaram vêm do disco
+
+Cada processo do pool carrega as tabelas da gramática uma única vez (no inicializador)
+e os resultados são entregues à medida que os arquivos terminam.
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+from dataclasses import asdict
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, List, Optional
+from .cache import GrammarTables, load_grammar_tables
+from .compile_cache import DEFAULT_MAX_BYTES, CompileCache
+from .lexer import Tokenizer
+from .models import Grammar, Lexeme, CompileResult
+from .models_utils import build_lukera_lexeme, build_lukera_grammar
+from .parser import Parser
+from .regex_lexer import RegexTokenizer
+from .trace import TRACE_OFF
+
+
+ENGINES = {"hand": Tokenizer, "regex": RegexTokenizer}
+
+# Estado de cada processo do pool (preenchido por init_worker)
+_lexeme: Optional[Lexeme] = None
+_grammar: Optional[Grammar] = None
+_tables: Optional[GrammarTables] = None
+_engine = RegexTokenizer
+_cache: Optional[CompileCache] = None
+
+
+def find_sources(paths: Iterable[str], extension: str = ".lk") -> List[str]:
+    """
+    Expande os caminhos de entrada em uma lista ordenada de arquivos:
+    diretórios são percorridos recursivamente e padrões glob são expandidos.
+    """
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                found.update(os.path.join(root, name) for name in files if name.endswith(extension))
+        elif os.path.isfile(path):
+            found.add(path)
+        else:
+            found.update(p for p in glob.glob(path, recursive=True) if os.path.isfile(p))
+    return sorted(found)
+
+
+def init_worker(engine: str = "regex", cache: bool = False,
+                cache_directory: Optional[str] = None,
+                cache_bytes: int = DEFAULT_MAX_BYTES) -> None:
+    """
+    Prepara o processo: Lexeme, gramática e tabelas compiladas (do cache em disco) e,
+    com `cache`, o cache de resultados compartilhado entre os processos.
+    """
+    global _lexeme, _grammar, _tables, _engine, _cache
+    _lexeme = build_lukera_lexeme()
+    _grammar = build_lukera_grammar()
+    _tables = load_grammar_tables(_grammar)
+    _engine = ENGINES[engine]
+    _cache = None
+    if cache:
+        _cache = CompileCache(cache_directory, cache_bytes, _lexeme, _grammar, _tables, _engine)
+
+
+def compile_file(path: str) -> CompileResult:
+    """Tokeniza (para um TokenBuffer) e analisa um arquivo, sem exibir nada."""
+    if _tables is None:
+        init_worker()
+    if _cache is not None:
+        try:
+            return compile_cached(path)
+        except UnicodeDecodeError as e:
+            return unreadable(path, e)
+        except OSError:
+            pass # Arquivo ilegível: o caminho normal reporta o erro
+
+    output = io.StringIO()
+    started = time.perf_counter()
+
+    # As mensagens do lexer (erro léxico, arquivo inexistente) são capturadas para o relatório
+    try:
+        with contextlib.redirect_stdout(output):
+            lexer = _engine(path, _lexeme)
+            tokens = lexer.tokenize_compact()
+    except (UnicodeDecodeError, OSError) as e:
+        return unreadable(path, e)
+    lex_time = time.perf_counter() - started
+
+    lexical_error = None
+    if len(tokens) == 0 or tokens.get_type(len(tokens) - 1) != "EOF":
+        lexical_error = output.getvalue().strip() or "Lexical Error"
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser = Parser(tokens, _grammar, trace_level=TRACE_OFF, tables=_tables, build_ast=False)
+        parser.parse()
+    parse_time = time.perf_counter() - started
+
+    return CompileResult(
+        path=path,
+        tokens=len(tokens),
+        success=lexical_error is None and not parser.errors,
+        lexical_error=lexical_error,
+        errors=parser.errors,
+        lex_time=lex_time,
+        parse_time=parse_time,
+    )
+
+
+def unreadable(path: str, error: Exception) -> CompileResult:
+    """Resultado de um arquivo que não pôde ser lido (ex: não é UTF-8): falha só deste arquivo."""
+    return CompileResult(
+        path=path,
+        tokens=0,
+        success=False,
+        lexical_error=f"Error: Cannot read '{path}': {error}",
+        errors=[],
+        lex_time=0.0,
+        parse_time=0.0,
+    )
+
+
+def compile_cached(path: str) -> CompileResult:
+    """
+    compile_file pelo cache de resultados: sem mudanças no arquivo, o custo é o hash e a
+    leitura da entrada (o tempo gasto aparece em lex_time).
+    """
+    started = time.perf_counter()
+    entry, hit = _cache.compile(path)
+    elapsed = time.perf_counter() - started
+    return CompileResult(
+        path=path,
+        tokens=len(entry.tokens),
+        success=entry.lexical_error is None and not entry.errors,
+        lexical_error=entry.lexical_error,
+        errors=entry.errors,
+        lex_time=elapsed if hit else entry.lex_time,
+        parse_time=0.0 if hit else entry.parse_time,
+        cached=hit,
+    )
+
+
+def run_batch(paths: Iterable[str], workers: Optional[int] = None,
+              engine: str = "regex", chunksize: int = 8, cache: bool = False,
+              cache_directory: Optional[str] = None,
+              cache_bytes: int = DEFAULT_MAX_BYTES) -> Iterator[CompileResult]:
+    """
+    Analisa os arquivos em um pool de processos (um por núcleo por padrão) e gera os
+    resultados na ordem em que terminam. Com workers=1, roda no próprio processo.
+    Com `cache`, os resultados são lidos/gravados no cache de compilação (compile_cache).
+    """
+    files = list(paths)
+    workers = workers or os.cpu_count() or 1
+
+    # Carrega (ou compila e grava) as tabelas antes de criar o pool: os processos
+    # encontram o arquivo de cache pronto em vez de recalcular cada um a sua cópia
+    initargs = (engine, cache, cache_directory, cache_bytes)
+    init_worker(*initargs)
+
+    if workers == 1 or len(files) <= 1:
+        for path in files:
+            yield compile_file(path)
+        return
+
+    with Pool(workers, initializer=init_worker, initargs=initargs) as pool:
+        yield from pool.imap_unordered(compile_file, files, chunksize=chunksize)
+
+
+def summarize(results: List[CompileResult], elapsed: float) -> Dict[str, object]:
+    """Relatório agregado do lote."""
+    tokens = sum(r.tokens for r in results)
+    failed = [r.path for r in results if not r.success]
+    return {
+        "files": len(results),
+        "cached": sum(1 for r in results if r.cached),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "failed_files": sorted(failed),
+        "tokens": tokens,
+        "lex_time": sum(r.lex_time for r in results),
+        "parse_time": sum(r.parse_time for r in results),
+        "elapsed": elapsed,
+        "files_per_second": len(results) / elapsed if elapsed else 0.0,
+        "tokens_per_second": tokens / elapsed if elapsed else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.batch",
+        description="Lex and parse many Lukera (.lk) files in parallel.")
+    parser.add_argument("paths", nargs="+", help="files, directories or glob patterns")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of processes (default: one per core)")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="regex",
+                        help="lexer engine (default: regex)")
+    parser.add_argument("--chunksize", type=int, default=8,
+                        help="files sent to a worker at a time")
+    parser.add_argument("--json", metavar="PATH",
+                        help="save the per-file results and the report as JSON")
+    parser.add_argument("--quiet", action="store_true",
+                        help="only print failures and the final report")
+    parser.add_argument("--cache", action="store_true",
+                        help="reuse the results of unchanged files from the compile cache")
+    parser.add_argument("--cache-dir", metavar="DIR", default=None,
+                        help="compile cache directory (default: <cache dir>/results)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES >> 20, metavar="MB",
+                        help="maximum size of the compile cache before evicting old entries")
+    args = parser.parse_args(argv)
+
+    files = find_sources(args.paths)
+    if not files:
+        print("Error: No .lk files found.")
+        return 2
+
+    print(f" Compiling {len(files)} files...")
+    started = time.perf_counter()
+    results = []
+
+    for result in run_batch(files, args.workers, args.engine, args.chunksize,
+                            args.cache, args.cache_dir, args.cache_size << 20):
+        results.append(result)
+        if result.success:
+            if not args.quiet:
+                print(f"[OK]   {result.path} ({result.tokens} tokens, "
+                      f"{(result.lex_time + result.parse_time) * 1000:.1f} ms"
+                      f"{', cached' if result.cached else ''})")
+        else:
+            n_errors = len(result.errors) + (result.lexical_error is not None)
+            print(f"[FAIL] {result.path} ({n_errors} errors)")
+            if result.lexical_error:
+                print(f"       {result.lexical_error}")
+            for error in result.errors[:5]:
+                print(f"       {error}")
+
+    report = summarize(results, time.perf_counter() - started)
+    print(f" {report['succeeded']}/{report['files']} files succeeded, {report['tokens']} tokens "
+          f"in {report['elapsed']:.2f}s ({report['files_per_second']:.0f} files/s)")
+    if args.cache:
+        print(f" {report['cached']} results from the compile cache")
+
+    if args.json:
+        results.sort(key=lambda r: r.path)
+        with open(args.json, 'w') as json_file:
+            json.dump({"report": report, "results": [asdict(r) for r in results]},
+                      json_file, indent=4)
+
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+from typing import List
+from .models import BytecodeProgram, FunctionCode
+
+
+# Opcodes da VM. Cada instrução ocupa dois inteiros: (opcode, argumento).
+LOAD_LOCAL = 0      # arg = slot
+LOAD_CONST = 1      # arg = índice no pool de constantes
+STORE_LOCAL = 2     # arg = slot
+ADD = 3
+SUB = 4
+MUL = 5
+DIV = 6
+MOD = 7
+POW = 8
+LT = 9
+GT = 10
+LE = 11
+GE = 12
+EQ = 13
+NE = 14
+JUMP = 15               # arg = destino
+JUMP_IF_FALSE = 16      # Desempilha a condição
+JUMP_IF_TRUE = 17       # Desempilha a condição
+JUMP_IF_FALSE_KEEP = 18 # 'e' com curto-circuito: mantém o valor se salta, senão desempilha
+JUMP_IF_TRUE_KEEP = 19  # 'ou' com curto-circuito
+NEG = 20
+NOT = 21
+CALL = 22           # arg = índice da função (os argumentos já estão na pilha)
+RETURN = 23
+POP = 24
+BUILTIN = 25        # arg = id do builtin * 16 + número de argumentos
+
+# Superinstruções: combinam sequências frequentes em um único despacho.
+# Os dois operandos de arg são empacotados como (a | b << 16).
+LOAD_LOCAL_LOCAL = 26   # arg = slot | slot << 16
+LOAD_LOCAL_CONST = 27   # arg = slot | const << 16
+INC_LOCAL = 28          # x = x + c; arg = slot | const << 16
+# Comparação seguida de salto: desempilha os dois operandos e salta se a comparação
+# for verdadeira (JUMP_IF_*) ou falsa (JUMP_IF_NOT_*). arg = destino
+JUMP_IF_LT = 29
+JUMP_IF_GT = 30
+JUMP_IF_LE = 31
+JUMP_IF_GE = 32
+JUMP_IF_EQ = 33
+JUMP_IF_NE = 34
+JUMP_IF_NOT_LT = 35
+JUMP_IF_NOT_GT = 36
+JUMP_IF_NOT_LE = 37
+JUMP_IF_NOT_GE = 38
+JUMP_IF_NOT_EQ = 39
+JUMP_IF_NOT_NE = 40
+
+# Limite de cada metade de um argumento empacotado
+PACKED_LIMIT = 1 << 15
+
+OPCODE_NAMES = [
+    "LOAD_LOCAL", "LOAD_CONST", "STORE_LOCAL", "ADD", "SUB", "MUL", "DIV", "MOD", "POW",
+    "LT", "GT", "LE", "GE", "EQ", "NE", "JUMP", "JUMP_IF_FALSE", "JUMP_IF_TRUE",
+    "JUMP_IF_FALSE_KEEP", "JUMP_IF_TRUE_KEEP", "NEG", "NOT", "CALL", "RETURN", "POP", "BUILTIN",
+    "LOAD_LOCAL_LOCAL", "LOAD_LOCAL_CONST", "INC_LOCAL",
+    "JUMP_IF_LT", "JUMP_IF_GT", "JUMP_IF_LE", "JUMP_IF_GE", "JUMP_IF_EQ", "JUMP_IF_NE",
+    "JUMP_IF_NOT_LT", "JUMP_IF_NOT_GT", "JUMP_IF_NOT_LE", "JUMP_IF_NOT_GE",
+    "JUMP_IF_NOT_EQ", "JUMP_IF_NOT_NE",
+]
+
+# Opcodes cujo argumento é um destino de salto
+JUMP_OPCODES = frozenset([JUMP, JUMP_IF_FALSE, JUMP_IF_TRUE, JUMP_IF_FALSE_KEEP, JUMP_IF_TRUE_KEEP,
+                          *range(JUMP_IF_LT, JUMP_IF_NOT_NE + 1)])
+
+# Operadores binários da linguagem -> opcode
+BINARY_OPCODES = {
+    '+': ADD, '-': SUB, '*': MUL, '/': DIV, '%': MOD, '^': POW,
+    '<': LT, '>': GT, '<=': LE, '>=': GE, '==': EQ, '!=': NE,
+}
+
+# Funções nativas: nome -> (id, quantidades de argumentos aceitas; None = qualquer)
+BUILTINS = {
+    'escreve':   (0, None),
+    'entrada':   (1, (0,)),
+    'aleatorio': (2, (0, 2)),
+    'faixa':     (3, (1, 2)),
+    'absoluto':  (4, (1,)),
+    'raiz':      (5, (1,)),
+}
+BUILTIN_NAMES = {builtin_id: name for name, (builtin_id, _) in BUILTINS.items()}
+
+# Comparação -> (salta se verdadeira, salta se falsa)
+COMPARE_JUMPS = {
+    '<': (JUMP_IF_LT, JUMP_IF_NOT_LT), '>': (JUMP_IF_GT, JUMP_IF_NOT_GT),
+    '<=': (JUMP_IF_LE, JUMP_IF_NOT_LE), '>=': (JUMP_IF_GE, JUMP_IF_NOT_GE),
+    '==': (JUMP_IF_EQ, JUMP_IF_NOT_EQ), '!=': (JUMP_IF_NE, JUMP_IF_NOT_NE),
+}
+
+
+def disassemble_function(function: FunctionCode, consts: List[object]) -> List[str]:
+    """Lista legível das instruções de uma função."""
+    lines = [f"funcao {function.name} (params={function.n_params}, locals={function.n_locals})"]
+    code = function.code
+    for pc in range(0, len(code), 2):
+        op, arg = code[pc], code[pc + 1]
+        name = OPCODE_NAMES[op]
+        if op in (LOAD_LOCAL, STORE_LOCAL):
+            detail = f"{arg} ({function.local_names[arg]})"
+        elif op == LOAD_CONST:
+            detail = f"{arg} ({consts[arg]!r})"
+        elif op == LOAD_LOCAL_LOCAL:
+            a, b = arg & 0xFFFF, arg >> 16
+            detail = f"{a} {b} ({function.local_names[a]}, {function.local_names[b]})"
+        elif op == LOAD_LOCAL_CONST or op == INC_LOCAL:
+            a, b = arg & 0xFFFF, arg >> 16
+            detail = f"{a} {b} ({function.local_names[a]}, {consts[b]!r})"
+        elif op in JUMP_OPCODES or op == CALL:
+            detail = str(arg)
+        elif op == BUILTIN:
+            detail = f"{BUILTIN_NAMES[arg >> 4]} argc={arg & 15}"
+        else:
+            detail = ""
+        lines.append(f"  {pc:5d}  {name:<20} {detail}".rstrip())
+    return lines
+
+
+def disassemble(program: BytecodeProgram) -> str:
+    """Texto com o bytecode de todas as funções do programa."""
+    lines: List[str] = []
+    for function in program.functions:
+        lines.extend(disassemble_function(function, program.consts))
+        lines.append("")
+    return "\n".join(lines)
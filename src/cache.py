@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from dataclasses import fields
+from typing import Dict, List, Optional, Set, Tuple
+from .instrumentation import Instrumentation
+from .models import Lexeme, Grammar, CompiledGrammar
+from .models_utils import compute_first, compute_follow, build_parsing_table, compile_grammar
+
+
+# Versão do formato do cache: incrementar quando os artefatos compilados mudarem de estrutura.
+CACHE_VERSION = 3
+
+# Diretório padrão do cache (pode ser trocado pela variável de ambiente LUKERA_CACHE_DIR).
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "lukera")
+
+GrammarTables = Tuple[Dict[str, Set[str]],                 # FIRST
+                      Dict[str, Set[str]],                 # FOLLOW
+                      Dict[str, Dict[str, List[str]]],     # Tabela de parsing
+                      CompiledGrammar]                     # Gramática compilada
+
+# Cache em memória (por processo), indexado pela impressão digital da gramática
+_loaded: Dict[str, GrammarTables] = {}
+
+
+def cache_dir() -> str:
+    """Diretório onde os artefatos compilados são guardados."""
+    return os.environ.get("LUKERA_CACHE_DIR") or DEFAULT_CACHE_DIR
+
+
+def grammar_fingerprint(grammar: Grammar, lexeme: Optional[Lexeme] = None) -> str:
+    """
+    Hash estável da gramática (e opcionalmente do Lexeme).
+    A ordem das produções faz parte da chave, pois define a numeração dos símbolos e produções.
+    """
+    payload = {
+        "version": CACHE_VERSION,
+        "format": [f.name for f in fields(CompiledGrammar)],
+        "start": grammar.start_symbol,
+        "productions": list(grammar.productions.items()),
+        "sync": grammar.sync_terminals,
+    }
+    if lexeme is not None:
+        payload["lexeme"] = [lexeme.keywords, lexeme.operators, lexeme.delimiters]
+
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def build_grammar_tables(grammar: Grammar,
+                         instrumentation: Optional[Instrumentation] = None) -> GrammarTables:
+    """Calcula FIRST, FOLLOW, a tabela de parsing e a gramática compilada (sem cache)."""
+    if instrumentation is None:
+        first = compute_first(grammar)
+        follow = compute_follow(grammar, first)
+        parsing_table = build_parsing_table(grammar, first, follow)
+        compiled = compile_grammar(grammar, parsing_table, follow)
+        return first, follow, parsing_table, compiled
+
+    with instrumentation.phase("first"):
+        first = compute_first(grammar)
+    with instrumentation.phase("follow"):
+        follow = compute_follow(grammar, first)
+    with instrumentation.phase("parsing_table"):
+        parsing_table = build_parsing_table(grammar, first, follow)
+    with instrumentation.phase("compile_grammar"):
+        compiled = compile_grammar(grammar, parsing_table, follow)
+
+    instrumentation.update("grammar", {
+        "nonterminals": len(grammar.productions),
+        "productions": len(compiled.productions),
+        "terminals": compiled.n_terminals,
+        "table_entries": sum(1 for index in compiled.table if index >= 0),
+        "sync_entries": sum(compiled.sync),
+    })
+    return first, follow, parsing_table, compiled
+
+
+def load_grammar_tables(grammar: Grammar,
+                        lexeme: Optional[Lexeme] = None,
+                        use_disk: bool = True,
+                        instrumentation: Optional[Instrumentation] = None) -> GrammarTables:
+    """
+    Retorna os artefatos compilados da gramática, reaproveitando-os quando possível:
+      1. Cache em memória do processo
+      2. Arquivo em disco (cache_dir()/grammar-<hash>.pickle)
+      3. Cálculo completo, gravado no disco para as próximas execuções
+    Como a chave é o hash do conteúdo da gramática, qualquer alteração em
+    build_lukera_grammar invalida o cache automaticamente.
+    """
+    key = grammar_fingerprint(grammar, lexeme)
+    if key in _loaded:
+        if instrumentation is not None:
+            instrumentation.count("tables.memory_hits")
+        return _loaded[key]
+
+    if instrumentation is not None:
+        instrumentation.begin("tables")
+
+    path = os.path.join(cache_dir(), f"grammar-{key[:32]}.pickle")
+    tables = None
+
+    if use_disk:
+        try:
+            with open(path, "rb") as file:
+                tables = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            tables = None
+
+    if tables is None:
+        tables = build_grammar_tables(grammar, instrumentation)
+        if use_disk:
+            _write_atomic(path, pickle.dumps(tables, protocol=pickle.HIGHEST_PROTOCOL))
+        if instrumentation is not None:
+            instrumentation.count("tables.builds")
+    elif instrumentation is not None:
+        instrumentation.count("tables.disk_hits")
+
+    if instrumentation is not None:
+        instrumentation.end()
+    _loaded[key] = tables
+    return tables
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Grava o arquivo via arquivo temporário + rename, seguro entre processos concorrentes."""
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        # Cache indisponível (ex: diretório somente leitura): segue sem gravar
+        pass
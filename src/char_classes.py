@@ -0,0 +1,80 @@
+"""
+Pré-passe vetorizado do Tokenizer manual: classifica de uma vez (NumPy) todos os caracteres
+do texto e calcula, para cada posição, onde termina a sequência de espaços, de caracteres de
+palavra ([letra/dígito/_]) ou de dígitos que a contém, além das posições das quebras de
+linha e dos fechamentos '*/'. O Tokenizer então salta direto de uma fronteira à outra, em
+vez de avançar um caractere por vez em espaços, comentários, identificadores e números.
+
+As classes seguem exatamente str.isspace, str.isalnum e str.isdigit (os caracteres não ASCII
+distintos do texto são classificados pelo próprio Python), então os tokens são os mesmos.
+O NumPy é importado apenas aqui: sem ele, o Tokenizer com prepass=True falha ao iniciar.
+"""
+from array import array
+from bisect import bisect_left
+
+SPACE = 1
+WORD = 2
+DIGIT = 4
+
+
+def _classify(char: str) -> int:
+    return ((SPACE if char.isspace() else 0)
+            | (WORD if char.isalnum() or char == '_' else 0)
+            | (DIGIT if char.isdigit() else 0))
+
+
+def _positions(values) -> array:
+    """Array de inteiros (busca binária rápida com bisect) a partir de um vetor NumPy."""
+    return array('q', values.astype('int64').tobytes())
+
+
+class CharClasses:
+    """Fins das sequências de cada classe de caractere de um texto completo."""
+
+    def __init__(self, text: str):
+        import numpy as np
+
+        self.length = len(text)
+        codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
+        ascii_table = np.array([_classify(chr(c)) for c in range(128)], dtype=np.uint8)
+        if self.length == 0 or int(codes.max()) < 128:
+            classes = ascii_table[codes]
+        else:
+            # Só os caracteres não ASCII distintos passam pelos métodos de str
+            wide = codes >= 128
+            distinct = np.unique(codes[wide])
+            wide_table = np.array([_classify(chr(c)) for c in distinct.tolist()], dtype=np.uint8)
+            classes = np.empty(self.length, dtype=np.uint8)
+            classes[~wide] = ascii_table[codes[~wide]]
+            classes[wide] = wide_table[np.searchsorted(distinct, codes[wide])]
+
+        # ends[i]: fim da sequência de espaços ou de caracteres de palavra que contém i;
+        # digit_ends[i]: fim da sequência de dígitos que contém i (índice direto, sem busca)
+        self.ends = self._run_ends(np, classes & (SPACE | WORD))
+        self.digit_ends = self._run_ends(np, classes & DIGIT)
+        self.newlines = _positions(np.flatnonzero(codes == 10))
+        self.closers = _positions(np.flatnonzero((codes[:-1] == 42) & (codes[1:] == 47)))
+
+    @staticmethod
+    def _run_ends(np, kinds) -> array:
+        """Para cada posição, o fim (exclusivo) da sequência máxima de mesma classe que a contém."""
+        n = len(kinds)
+        if n == 0:
+            return array('i')
+        last = np.empty(n, dtype=bool) # last[i]: a sequência termina em i
+        last[:-1] = kinds[1:] != kinds[:-1]
+        last[-1] = True
+        ends = np.where(last, np.arange(1, n + 1), n)
+        ends = np.minimum.accumulate(ends[::-1])[::-1]
+        return array('i', ends.astype(np.int32).tobytes())
+
+    def line_end(self, position: int) -> int:
+        """Posição da primeira quebra de linha a partir de `position` (ou o fim do texto)."""
+        index = bisect_left(self.newlines, position)
+        return self.newlines[index] if index < len(self.newlines) else max(position, self.length)
+
+    def closer(self, position: int) -> int:
+        """Posição do primeiro '*/' a partir de `position` (-1 se não houver)."""
+        index = bisect_left(self.closers, position)
+        return self.closers[index] if index < len(self.closers) else -1
@@ -0,0 +1,539 @@
+"""
+Gerador de parser descendente recursivo: a partir da Grammar e das suas tabelas (FIRST,
+FOLLOW e a tabela LL(1) compilada), escreve um módulo Python independente com uma função
+por não-terminal. Cada função escolhe a produção testando o token atual contra conjuntos
+de tipos pré-calculados (a linha de M[A, ·]: FIRST do lado direito e, se ele for anulável,
+FOLLOW(A)) e as caudas recursivas à direita (`*Linha`, `Comandos`, ...) viram laços.
+Não há pilha de símbolos: a pilha de chamadas faz o papel da pilha LL(1).
+
+    python -m src.codegen -o lukera_parser.py             # com a AST (ações de syntax_tree)
+    python -m src.codegen -o lukera_parser.py --no-ast    # só reconhece e reporta os erros
+
+    parser = GeneratedParser(tokens, grammar, build_ast=True)
+    parser.parse()
+    parser.errors, parser.ast
+
+O módulo gerado aceita a mesma linguagem do Parser e reporta os mesmos erros (as mesmas
+mensagens, na mesma ordem, com a mesma supressão de cascata e o mesmo limite): o modo
+pânico usa as tabelas sync/resume da CompiledGrammar. Diferenças: a entrada é
+materializada (listas/streams de Token viram lista), nada é impresso e não há trace.
+"""
+import argparse
+import sys
+import types
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .cache import GrammarTables, grammar_fingerprint, load_grammar_tables
+from .line_index import LineIndex
+from .models import CompiledGrammar, Grammar, Token
+from .models_utils import build_lukera_grammar
+from .syntax_tree import LUKERA_REDUCERS, Node, TreeBuilder
+
+
+# Limite de recursão durante o parse gerado (a aninhagem do programa vira pilha de chamadas)
+RECURSION_LIMIT = 50000
+
+# Parte fixa do módulo gerado: leitura da entrada e o modo pânico
+_RUNTIME = '''
+class _Stop(Exception):
+    """Limite de erros atingido: interrompe a análise."""
+
+
+def token_arrays(tokens):
+    """
+    Tipos da entrada (IDs de terminais, com um EOF sentinela no fim) e funções com o valor
+    textual, o valor original e a posição no texto de cada token.
+    Aceita um TokenBuffer (lido direto dos arrays) ou qualquer iterável de Token.
+    """
+    if hasattr(tokens, "type_names"):
+        translate = [TERMINALS.get(name, UNKNOWN) for name in tokens.type_names]
+        kinds = list(map(translate.__getitem__, tokens.types))
+        count = len(kinds)
+        raw_at = tokens.get_value
+        starts = tokens.starts
+
+        def value_at(index):
+            return str(raw_at(index)) if index < count else "$"
+
+        def position_at(index):
+            return starts[index] if index < len(starts) else None
+    else:
+        tokens = list(tokens)
+        kinds = [TERMINALS.get(token.type, UNKNOWN) for token in tokens]
+        count = len(kinds)
+        raws = [token.value for token in tokens]
+        raw_at = raws.__getitem__
+
+        def value_at(index):
+            return str(raws[index]) if index < count else "$"
+
+        def position_at(index):
+            return tokens[index].start if index < count else None
+
+    kinds.append(EOF)
+    return kinds, value_at, raw_at, position_at
+'''
+
+
+class _Writer:
+    """Linhas do módulo gerado com indentação."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.depth = 0
+
+    def __call__(self, line: str = "") -> None:
+        self.lines.append("    " * self.depth + line if line else "")
+
+    def indent(self, steps: int = 1) -> None:
+        self.depth += steps
+
+    def dedent(self, steps: int = 1) -> None:
+        self.depth -= steps
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+class _Generator:
+    def __init__(self, compiled: CompiledGrammar, builder: Optional[TreeBuilder], start: str):
+        self.g = compiled
+        self.builder = builder
+        self.start = start
+        self.sets: Dict[Tuple[int, ...], str] = {}
+        self.used_actions: List[int] = []
+
+        n = compiled.n_terminals
+        eof = compiled.eof
+        self.rules: Dict[int, List[int]] = {}
+        for p, lhs in enumerate(compiled.prod_lhs):
+            self.rules.setdefault(lhs, []).append(p)
+
+        # O modo pânico nunca descarta o EOF: todo não-terminal expande ou sincroniza nele
+        for A in range(n, len(compiled.symbols)):
+            cell = (A - n) * n + eof
+            if compiled.table[cell] < 0 and not compiled.sync[cell]:
+                raise ValueError(f"{compiled.symbols[A]} neither expands nor synchronizes on EOF.")
+
+    # --- Auxiliares ---
+
+    def name(self, symbol: int) -> str:
+        return "p_" + self.g.symbols[symbol]
+
+    def rhs(self, p: int) -> List[int]:
+        return list(reversed(self.g.prod_push[p]))
+
+    def void(self, symbol: int) -> bool:
+        return self.builder is not None and not self.builder.yields[symbol]
+
+    def condition(self, terminals: List[int]) -> str:
+        """Teste do token atual contra um conjunto de terminais."""
+        if len(terminals) == 1:
+            return f"tok == {terminals[0]}"
+        return f"tok in {self.set_name(terminals)}"
+
+    def set_name(self, terminals: List[int]) -> str:
+        key = tuple(terminals)
+        if key not in self.sets:
+            self.sets[key] = f"_SET_{len(self.sets)}"
+        return self.sets[key]
+
+    def action(self, p: int) -> str:
+        if p not in self.used_actions:
+            self.used_actions.append(p)
+        return f"a{p}"
+
+    def describe(self, p: int) -> str:
+        A, alpha = self.g.productions[p]
+        return f"{A} -> {' '.join(alpha)}"
+
+    # --- Funções dos não-terminais ---
+
+    def nonterminal(self, out: _Writer, A: int) -> None:
+        g = self.g
+        n = g.n_terminals
+        row = (A - n) * n
+        build = self.builder is not None
+        void = self.void(A)
+
+        selection: Dict[int, List[int]] = {}
+        for t in range(n):
+            if g.table[row + t] >= 0:
+                selection.setdefault(g.table[row + t], []).append(t)
+        sync = [t for t in range(n) if g.table[row + t] < 0 and g.sync[row + t]]
+        resume = [t for t in range(n) if g.resume[row + t]]
+
+        # Produções com cauda recursiva (A -> ... A) viram voltas do laço
+        tails = {p for p in self.rules[A] if self.rhs(p) and self.rhs(p)[-1] == A}
+        pending = build and not void and any(self.builder.marked[p] for p in tails)
+
+        def leave(value: str) -> str:
+            if not build:
+                return "return"
+            return f"value = {value}\n{' ' * 4}break" if pending else f"return {value}"
+
+        out(f"def {self.name(A)}({'acc' if void else ''}):")
+        out.indent()
+        out("nonlocal pos, tok")
+        if pending:
+            out("pending = []")
+        out("while True:")
+        out.indent()
+        keyword = "if"
+        for p in self.rules[A]:
+            if p not in selection:
+                continue
+            out(f"{keyword} {self.condition(selection[p])}:")
+            keyword = "elif"
+            out.indent()
+            out(f"# {self.describe(p)}")
+            self.production(out, A, p, p in tails, leave)
+            out.dedent()
+        if sync:
+            out(f"{keyword} {self.condition(sync)}:")
+            keyword = "elif"
+            out.indent()
+            out(f'report("ERROR (Panic): Pop {g.symbols[A]} (Synchronize via Follow)", '
+                f'position_at(pos))')
+            self.emit_leave(out, "acc" if void else "None", leave)
+            out.dedent()
+        if keyword == "if":
+            out(f"discard({self.set_name(resume)})")
+        else:
+            out("else:")
+            out.indent()
+            out(f"discard({self.set_name(resume)})")
+            out.dedent()
+        out.dedent()
+
+        if pending:
+            out("for action, args in reversed(pending):")
+            out("    value = action(*args, value)")
+            out("return value")
+        out.dedent()
+        out()
+
+    def emit_leave(self, out: _Writer, value: str, leave: Callable[[str], str]) -> None:
+        for line in leave(value).split("\n"):
+            out(line.strip())
+
+    def production(self, out: _Writer, A: int, p: int, tail: bool,
+                   leave: Callable[[str], str]) -> None:
+        g = self.g
+        builder = self.builder
+        build = builder is not None
+        rhs = self.rhs(p)
+        body = rhs[:-1] if tail else rhs
+        values: List[str] = []     # Variáveis com os valores dos símbolos (com a AST)
+        # Produção de uma cauda sem valor com ação: Fold (op, operando) sobre o acumulado
+        fold = build and self.void(A) and builder.marked[p]
+
+        for i, X in enumerate(body):
+            var = f"v{i}"
+            if X == g.eof:
+                # EOF antes do fim da entrada: o resto é descartado (como no fundo da pilha)
+                out(f"if tok != {g.eof}:")
+                out("    discard(None)")
+                if build:
+                    out(f"{var} = None")
+                    values.append(var)
+            elif X < g.n_terminals:
+                if i == 0:
+                    # Primeiro símbolo terminal: a produção só é escolhida com ele
+                    if build:
+                        out(f"{var} = raw_at(pos)")
+                    out("pos += 1")
+                    out("tok = kinds[pos]")
+                else:
+                    out(f"if tok == {X}:")
+                    out.indent()
+                    if build:
+                        out(f"{var} = raw_at(pos)")
+                    out("pos += 1")
+                    out("tok = kinds[pos]")
+                    out.dedent()
+                    out("else:")
+                    out.indent()
+                    out(f"expected({g.symbols[X]!r})")
+                    if build:
+                        out(f"{var} = None")
+                    out.dedent()
+                if build:
+                    values.append(var)
+            elif self.void(X):
+                # Cauda com Fold: recebe o operando da esquerda e devolve o nó combinado
+                target = "acc" if fold and i >= 2 else (values[-1] if values else None)
+                if target is None:
+                    raise ValueError(f"{g.symbols[X]} needs a valued symbol before it: "
+                                     f"{self.describe(p)}")
+                out(f"{target} = {self.name(X)}({target})")
+            else:
+                if build:
+                    out(f"{var} = {self.name(X)}()")
+                    values.append(var)
+                else:
+                    out(f"{self.name(X)}()")
+
+            if fold and i == 1:
+                out(f"acc = {self.action(p)}(acc, {', '.join(values)})")
+
+        if not build:
+            out("continue" if tail else "return")
+            return
+
+        if self.void(A):
+            if not rhs:
+                out("return acc")
+                return
+            if not fold:
+                raise ValueError(f"Production of a void nonterminal needs a Fold: {self.describe(p)}")
+            if any(not self.void(X) for X in rhs[2:] if X != A):
+                raise ValueError(f"Only void symbols may follow a Fold: {self.describe(p)}")
+            out("continue" if tail else "return acc")
+            return
+
+        if tail:
+            # Redução de dentro para fora, depois que a última volta terminar
+            if builder.marked[p]:
+                args = "".join(f"{v}, " for v in values) if len(values) == 1 else ", ".join(values)
+                out(f"pending.append(({self.action(p)}, ({args})))")
+            out("continue")
+        elif builder.eps_value[p]:
+            self.emit_leave(out, f"{self.action(p)}()", leave)
+        elif builder.marked[p]:
+            self.emit_leave(out, f"{self.action(p)}({', '.join(values)})", leave)
+        else:
+            self.emit_leave(out, values[0], leave)
+
+    # --- Módulo ---
+
+    def module(self) -> str:
+        g = self.g
+        start = g.symbol_ids[self.start]
+        build = self.builder is not None
+
+        functions = _Writer()
+        functions.indent()
+        for A in range(g.n_terminals, len(g.symbols)):
+            self.nonterminal(functions, A)
+
+        out = _Writer()
+        out('"""')
+        out(f"Parser descendente recursivo gerado por src/codegen.py (símbolo inicial {self.start}).")
+        out("Não edite: gere de novo com `python -m src.codegen`.")
+        out()
+        out("    ast, errors, error_offsets, suppressed_errors = parse(tokens, actions)")
+        out()
+        if build:
+            out("`actions` são as ações de redução por produção (codegen.production_actions).")
+        else:
+            out("Gerado sem a AST: `actions` é ignorado e a árvore é sempre None.")
+        out('"""')
+        out("import sys")
+        out()
+        out()
+        terminals = ", ".join(f"{name!r}: {t}" for t, name in enumerate(g.symbols[:g.n_terminals]))
+        out(f"TERMINALS = {{{terminals}}}")
+        out(f"EOF = {g.eof}")
+        out(f"UNKNOWN = {g.unknown}")
+        out(f"PRODUCTIONS = {len(g.productions)}")
+        out(f"HAS_AST = {build}")
+        out(f"RECURSION_LIMIT = {RECURSION_LIMIT}")
+        out()
+        for terminals_set, name in self.sets.items():
+            names = " ".join(g.symbols[t] for t in terminals_set)
+            out(f"{name} = frozenset({{{', '.join(map(str, terminals_set))}}})  # {names}")
+        out()
+        out(_RUNTIME.strip("\n"))
+        out()
+        out()
+        out("def parse(tokens, actions=None, lines=None, max_errors=100, recovery=3,")
+        out("          locate_errors=True):")
+        out.indent()
+        out('"""')
+        out("Analisa a entrada; retorna (ast, errors, error_offsets, suppressed_errors).")
+        out("Sem `lines`, um TokenBuffer usa o próprio texto fonte para a linha:coluna dos erros.")
+        out('"""')
+        if build:
+            out("if actions is None:")
+            out('    raise ValueError("This parser builds the AST: pass the reduce actions.")')
+            for p in sorted(self.used_actions):
+                out(f"a{p} = actions[{p}]")
+        out("kinds, value_at, raw_at, position_at = token_arrays(tokens)")
+        out('if lines is None and hasattr(tokens, "line_index"):')
+        out("    lines = tokens.line_index()")
+        out("if not locate_errors:")
+        out("    lines = None")
+        out("errors = []")
+        out("error_offsets = []")
+        out("pos = 0")
+        out("tok = kinds[0]")
+        out("skipped = 0          # Tokens descartados (pos - skipped = tokens casados)")
+        out("quiet_until = 0      # Erros antes deste número de tokens casados são cascata")
+        out("suppressed = 0")
+        out()
+        out("def report(message, offset):")
+        out("    nonlocal quiet_until, suppressed")
+        out("    matched = pos - skipped")
+        out("    if matched < quiet_until:")
+        out("        suppressed += 1")
+        out("    else:")
+        out("        errors.append(lines.annotate(message, offset) if lines is not None else message)")
+        out("        error_offsets.append(offset)")
+        out("    quiet_until = matched + recovery")
+        out("    if max_errors is not None and len(errors) >= max_errors:")
+        out('        errors.append(f"FATAL ERROR: Too many errors ({len(errors)}), analysis stopped.")')
+        out("        error_offsets.append(None)")
+        out("        raise _Stop")
+        out()
+        out("def expected(name):")
+        out("""    report(f"ERROR: Expected '{name}', but received '{value_at(pos)}'", position_at(pos))""")
+        out()
+        out("def discard(resume):")
+        out("    # Pula o token atual e os seguintes até um que expanda ou sincronize (ou o EOF)")
+        out("    nonlocal pos, tok, skipped")
+        out("    first = pos")
+        out("    while True:")
+        out("        pos += 1")
+        out("        tok = kinds[pos]")
+        out("        if tok == EOF or (resume is not None and tok in resume):")
+        out("            break")
+        out("    count = pos - first")
+        out("    skipped += count")
+        out('    more = f" and {count - 1} more tokens" if count > 1 else ""')
+        out("""    report(f"ERROR (Panic): Discard '{value_at(first)}'{more}", position_at(first))""")
+        out()
+        out.lines.extend(functions.lines)
+        out("limit = sys.getrecursionlimit()")
+        out("sys.setrecursionlimit(max(limit, RECURSION_LIMIT))")
+        out("try:")
+        out(f"    value = {self.name(start)}()")
+        out("    # Fundo da pilha: o que sobrar antes do EOF é descartado")
+        out("    if tok != EOF:")
+        out("        discard(None)")
+        out("except _Stop:")
+        out("    value = None")
+        out("finally:")
+        out("    sys.setrecursionlimit(limit)")
+        out("return value, errors, error_offsets, suppressed" if build else
+            "return None, errors, error_offsets, suppressed")
+        return out.text()
+
+
+def generate_parser(grammar: Grammar, tables: Optional[GrammarTables] = None,
+                    reducers: Optional[Dict[str, List[Optional[Callable]]]] = None,
+                    start_symbol: Optional[str] = None) -> str:
+    """
+    Código fonte do parser descendente recursivo da gramática. Com `reducers` (as mesmas
+    ações do TreeBuilder), as funções devolvem os valores e o parse monta a AST.
+    """
+    if tables is None:
+        tables = load_grammar_tables(grammar)
+    compiled = tables[3]
+    start = start_symbol or grammar.start_symbol
+    if start not in compiled.symbol_ids:
+        raise ValueError(f"Unknown start symbol '{start}'.")
+
+    builder = TreeBuilder(compiled, reducers) if reducers is not None else None
+    return _Generator(compiled, builder, start).module()
+
+
+def production_actions(tables: GrammarTables,
+                       reducers: Dict[str, List[Optional[Callable]]]) -> List[Optional[Callable]]:
+    """Ações por número de produção, no formato esperado pelo parse do módulo gerado."""
+    return TreeBuilder.for_grammar(tables[3], reducers).actions
+
+
+def load_parser(source: str, name: str = "lukera_generated") -> types.ModuleType:
+    """Compila o código gerado em um módulo (sem gravá-lo em disco)."""
+    module = types.ModuleType(name)
+    module.__file__ = f"<{name}>"
+    exec(compile(source, module.__file__, "exec"), module.__dict__)
+    return module
+
+
+# Módulos gerados por processo, por (impressão digital da gramática, símbolo inicial, com AST).
+# A entrada guarda as ações usadas: outras ações com a mesma chave geram o módulo de novo.
+_modules: Dict[Tuple[str, str, bool], Tuple[Optional[Dict], types.ModuleType]] = {}
+
+
+class GeneratedParser:
+    """
+    Mesma interface do Parser (errors, error_offsets, suppressed_errors, ast) usando o
+    parser gerado para a gramática, compilado uma vez por processo.
+    """
+
+    def __init__(self, tokens: Iterable[Token], grammar_set: Grammar,
+                 tables: Optional[GrammarTables] = None, build_ast: bool = False,
+                 reducers: Optional[Dict[str, List[Optional[Callable]]]] = None,
+                 start_symbol: Optional[str] = None,
+                 max_errors: Optional[int] = 100, recovery: int = 3,
+                 lines: Optional[LineIndex] = None, locate_errors: bool = True):
+        self.tokens = tokens
+        self.grammar = grammar_set
+        self.start_symbol = start_symbol or grammar_set.start_symbol
+        self.tables = tables if tables is not None else load_grammar_tables(grammar_set)
+        self.max_errors = max_errors
+        self.recovery = recovery
+        self.lines = lines
+        self.locate_errors = locate_errors
+
+        # Como no Parser: sem `reducers`, usa as da Lukera quando cobrem a gramática
+        self.reducers = None
+        if build_ast:
+            self.reducers = reducers if reducers is not None else LUKERA_REDUCERS
+            if TreeBuilder.for_grammar(self.tables[3], self.reducers) is None:
+                if reducers is not None:
+                    raise ValueError("The reduce actions do not cover every nonterminal of the grammar.")
+                self.reducers = None
+
+        self.errors: List[str] = []
+        self.error_offsets: List[Optional[int]] = []
+        self.suppressed_errors = 0
+        self.ast: Optional[Node] = None
+
+    def module(self) -> types.ModuleType:
+        key = (grammar_fingerprint(self.grammar), self.start_symbol, self.reducers is not None)
+        entry = _modules.get(key)
+        if entry is not None and entry[0] is self.reducers:
+            return entry[1]
+
+        source = generate_parser(self.grammar, self.tables, self.reducers, self.start_symbol)
+        if len(_modules) >= 8:
+            _modules.clear()
+        module = load_parser(source)
+        module.ACTIONS = (production_actions(self.tables, self.reducers)
+                          if self.reducers is not None else None)
+        _modules[key] = (self.reducers, module)
+        return module
+
+    def parse(self) -> None:
+        module = self.module()
+        self.ast, self.errors, self.error_offsets, self.suppressed_errors = module.parse(
+            self.tokens, module.ACTIONS, self.lines, self.max_errors, self.recovery,
+            self.locate_errors)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.codegen",
+        description="Generate a recursive-descent parser module for the Lukera grammar.")
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    parser.add_argument("--no-ast", action="store_true",
+                        help="generate a recognizer that only reports errors")
+    parser.add_argument("--start", help="start symbol (default: the grammar's)")
+    args = parser.parse_args(argv)
+
+    grammar = build_lukera_grammar()
+    source = generate_parser(grammar, reducers=None if args.no_ast else LUKERA_REDUCERS,
+                             start_symbol=args.start)
+    if args.output is None:
+        sys.stdout.write(source)
+    else:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(source)
+        print(f" Parser written to {args.output} ({len(source.splitlines())} lines)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
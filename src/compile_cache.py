@@ -0,0 +1,214 @@
+"""
+Cache de resultados de compilação endereçado pelo conteúdo: a chave é o hash dos bytes do
+fonte junto com a impressão digital do Lexeme e da gramática. Um arquivo que não mudou
+custa só o hash e a leitura de um pickle; tokens, erros, AST e bytecode vêm do disco.
+
+    cache = CompileCache()
+    entry, hit = cache.compile("programa.lk")
+    entry.errors, entry.ast, entry.bytecode
+
+As entradas ficam em cache_dir()/results/<2 primeiros dígitos>/<hash>.pickle. Cada leitura
+atualiza a data de modificação do arquivo, e ao passar de `max_bytes` as entradas usadas há
+mais tempo são removidas (LRU). Vários processos podem usar o mesmo diretório: as gravações
+são atômicas (arquivo temporário + rename) e uma entrada removida por outro processo no
+meio do caminho é só uma falta no cache.
+
+Mudanças nas classes da AST ou no formato do bytecode exigem incrementar CACHE_VERSION
+(parte da impressão digital da gramática).
+"""
+import contextlib
+import hashlib
+import io
+import os
+import pickle
+import time
+from typing import List, Optional, Tuple
+from .cache import GrammarTables, _write_atomic, cache_dir, grammar_fingerprint, load_grammar_tables
+from .compiler import compile_program
+from .models import CachedCompile, Grammar, Lexeme
+from .models_utils import build_lukera_lexeme, build_lukera_grammar
+from .parser import Parser
+from .regex_lexer import RegexTokenizer
+from .trace import TRACE_OFF
+
+
+# Tamanho máximo padrão do diretório de resultados
+DEFAULT_MAX_BYTES = 256 << 20
+
+# Gravações entre duas varreduras completas do diretório
+RESCAN_EVERY = 256
+
+# A remoção vai até esta fração do limite, para não varrer o diretório a cada gravação
+EVICT_TO = 0.9
+
+ENTRY_EXTENSION = ".pickle"
+
+
+def source_text(data: bytes) -> str:
+    """Texto do fonte como o Tokenizer o lê (UTF-8, quebras de linha universais)."""
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def compile_source(text: str, lexeme: Lexeme, grammar: Grammar, tables: GrammarTables,
+                   engine=RegexTokenizer, to_bytecode: bool = True) -> CachedCompile:
+    """
+    Tokeniza, analisa e (sem erros, com to_bytecode) compila para bytecode um texto
+    fonte, sem exibir nada.
+    """
+    output = io.StringIO()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        tokens = engine(None, lexeme, text=text).tokenize_compact()
+    lex_time = time.perf_counter() - started
+
+    lexical_error = None
+    if len(tokens) == 0 or tokens.get_type(len(tokens) - 1) != "EOF":
+        lexical_error = output.getvalue().strip() or "Lexical Error"
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser = Parser(tokens, grammar, trace_level=TRACE_OFF, tables=tables, build_ast=True)
+        parser.parse()
+    parse_time = time.perf_counter() - started
+
+    bytecode = semantic_error = None
+    if to_bytecode and lexical_error is None and not parser.errors:
+        try:
+            bytecode = compile_program(parser.ast)
+        except Exception as e:
+            semantic_error = str(e)
+
+    return CachedCompile(tokens, lexical_error, parser.errors, parser.suppressed_errors,
+                         parser.ast, bytecode, semantic_error, lex_time, parse_time)
+
+
+class CompileCache:
+    """Resultados de compilação em disco, com limite de tamanho e remoção LRU."""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 lexeme: Optional[Lexeme] = None, grammar: Optional[Grammar] = None,
+                 tables: Optional[GrammarTables] = None, engine=RegexTokenizer):
+        self.lexeme = lexeme or build_lukera_lexeme()
+        self.grammar = grammar or build_lukera_grammar()
+        self.tables = tables or load_grammar_tables(self.grammar)
+        self.engine = engine
+        self.fingerprint = grammar_fingerprint(self.grammar, self.lexeme)
+        self.directory = directory or os.path.join(cache_dir(), "results")
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Tamanho estimado do diretório: varrido na primeira gravação e a cada
+        # RESCAN_EVERY gravações (para contar as de outros processos), somado no meio tempo
+        self._size: Optional[int] = None
+        self._stores = 0
+
+    def key(self, data: bytes) -> str:
+        """Chave de um fonte: hash dos seus bytes e da impressão digital da linguagem."""
+        digest = hashlib.sha256(self.fingerprint.encode("ascii"))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ENTRY_EXTENSION)
+
+    def load(self, key: str) -> Optional[CachedCompile]:
+        """Entrada do cache (None se ausente ou ilegível); marca a entrada como usada agora."""
+        path = self.entry_path(key)
+        try:
+            with open(path, "rb") as file:
+                entry = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Entrada corrompida ou de outra versão das classes: descarta
+            with contextlib.suppress(OSError):
+                os.unlink(path)
+            return None
+
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return entry if isinstance(entry, CachedCompile) else None
+
+    def store(self, key: str, entry: CachedCompile) -> None:
+        """Grava a entrada (atomicamente) e remove as mais antigas se passar do limite."""
+        data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        _write_atomic(self.entry_path(key), data)
+
+        self._stores += 1
+        if self._size is None or self._stores % RESCAN_EVERY == 0:
+            self._size = self.size()
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """(último uso, tamanho, caminho) de cada entrada em disco."""
+        found = []
+        try:
+            shards = [shard.path for shard in os.scandir(self.directory) if shard.is_dir()]
+        except OSError:
+            return found
+        for shard in shards:
+            try:
+                with os.scandir(shard) as files:
+                    for item in files:
+                        if item.name.endswith(ENTRY_EXTENSION):
+                            info = item.stat()
+                            found.append((info.st_mtime, info.st_size, item.path))
+            except OSError:
+                # Entrada ou diretório removido por outro processo durante a varredura
+                continue
+        return found
+
+    def size(self) -> int:
+        """Bytes ocupados pelas entradas."""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> int:
+        """
+        Remove as entradas usadas há mais tempo até ocupar no máximo EVICT_TO * max_bytes;
+        retorna quantas foram removidas.
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICT_TO if total > self.max_bytes else total
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            with contextlib.suppress(OSError):
+                os.unlink(path)
+                removed += 1
+            total -= size
+        self._size = total
+        self.evictions += removed
+        return removed
+
+    def clear(self) -> None:
+        for _, _, path in self.entries():
+            with contextlib.suppress(OSError):
+                os.unlink(path)
+        self._size = 0
+
+    def compile(self, path: str) -> Tuple[CachedCompile, bool]:
+        """
+        Resultado da compilação do arquivo e se ele veio do cache. O arquivo é lido uma
+        vez (bytes): o mesmo conteúdo serve para o hash e, numa falta, para o lexer.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        key = self.key(data)
+
+        entry = self.load(key)
+        if entry is not None:
+            self.hits += 1
+            return entry, True
+
+        self.misses += 1
+        entry = compile_source(source_text(data), self.lexeme, self.grammar, self.tables, self.engine)
+        self.store(key, entry)
+        return entry, False
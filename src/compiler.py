@@ -0,0 +1,324 @@
+from array import array
+from typing import Dict, List, Optional, Tuple
+from .models import BytecodeProgram, FunctionCode
+from .bytecode import (LOAD_LOCAL, LOAD_CONST, STORE_LOCAL, JUMP, JUMP_IF_FALSE, JUMP_IF_TRUE,
+                       JUMP_IF_FALSE_KEEP, JUMP_IF_TRUE_KEEP, NEG, NOT, CALL, RETURN, POP, BUILTIN,
+                       LOAD_LOCAL_LOCAL, LOAD_LOCAL_CONST, INC_LOCAL, PACKED_LIMIT,
+                       BINARY_OPCODES, COMPARE_JUMPS, BUILTINS)
+from .syntax_tree import (Node, Program, Declaration, Assign, If, While, For, Return,
+                          Call, Builtin, BinOp, UnaryOp, Var, Literal)
+
+
+# Valor inicial de variáveis declaradas sem inicialização
+DEFAULT_VALUES = {'inteiro': 0, 'real': 0.0, 'logico': False, 'texto': ""}
+
+
+class FunctionCompiler:
+    """
+    Compila o corpo de uma função: variáveis resolvidas para slots na compilação
+    (escopo de bloco, sem busca por nome em tempo de execução).
+    """
+
+    def __init__(self, compiler: "Compiler", name: str, params: List[str]):
+        self.compiler = compiler
+        self.name = name
+        self.code: List[int] = []
+        self.local_names: List[str] = []
+        self.scopes: List[Dict[str, int]] = [{}]
+        for param in params:
+            self.declare(param)
+        self.n_params = len(params)
+
+    # --- Variáveis e escopos ---
+
+    def declare(self, name: str) -> int:
+        scope = self.scopes[-1]
+        if name in scope:
+            raise Exception(f"Semantic Error: Variable '{name}' already declared in '{self.name}'")
+        slot = scope[name] = len(self.local_names)
+        self.local_names.append(name)
+        return slot
+
+    def resolve(self, name: str) -> int:
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        raise Exception(f"Semantic Error: Undeclared variable '{name}' in '{self.name}'")
+
+    # --- Emissão ---
+
+    def emit(self, op: int, arg: int = 0) -> int:
+        """Adiciona uma instrução e retorna sua posição (para corrigir saltos)."""
+        self.code.append(op)
+        self.code.append(arg)
+        return len(self.code) - 2
+
+    def patch(self, at: int, target: Optional[int] = None) -> None:
+        """Aponta o salto em `at` para `target` (por padrão, a próxima instrução)."""
+        self.code[at + 1] = len(self.code) if target is None else target
+
+    def patch_all(self, jumps: List[int]) -> None:
+        for at in jumps:
+            self.patch(at)
+
+    def finish(self) -> FunctionCode:
+        # Retorno implícito (função sem 'retorna' ou fim do bloco principal)
+        self.emit(LOAD_CONST, self.compiler.const(None))
+        self.emit(RETURN)
+        return FunctionCode(
+            name=self.name,
+            n_params=self.n_params,
+            n_locals=len(self.local_names),
+            code=array('i', self.code),
+            local_names=self.local_names,
+        )
+
+    # --- Comandos ---
+
+    def block(self, statements: List[Node]) -> None:
+        self.scopes.append({})
+        self.statements(statements)
+        self.scopes.pop()
+
+    def statements(self, statements: List[Node]) -> None:
+        for statement in statements:
+            self.statement(statement)
+
+    def statement(self, node: Node) -> None:
+        kind = type(node)
+
+        if kind is Declaration:
+            if node.value is not None:
+                self.expression(node.value)
+            else:
+                self.emit(LOAD_CONST, self.compiler.const(DEFAULT_VALUES.get(node.dtype)))
+            # Declarada depois da expressão: 'inteiro x = x;' não enxerga o próprio x
+            self.emit(STORE_LOCAL, self.declare(node.name))
+
+        elif kind is Assign:
+            slot = self.resolve(node.name)
+            step = self.increment(node.name, node.value)
+            if step is not None and slot < PACKED_LIMIT:
+                # x = x + c: um único despacho
+                self.emit(INC_LOCAL, slot | step << 16)
+            else:
+                self.expression(node.value)
+                self.emit(STORE_LOCAL, slot)
+
+        elif kind is If:
+            jumps_else = self.branch(node.cond, False)
+            self.block(node.body)
+            if node.orelse:
+                # Sem salto para o fim se o ramo 'se' termina em 'retorna'
+                returns = bool(node.body) and type(node.body[-1]) is Return
+                jump_end = None if returns else self.emit(JUMP)
+                self.patch_all(jumps_else)
+                self.block(node.orelse)
+                if jump_end is not None:
+                    self.patch(jump_end)
+            else:
+                self.patch_all(jumps_else)
+
+        elif kind is While:
+            # Condição no fim do laço: um único salto por iteração
+            jump_cond = self.emit(JUMP)
+            body = len(self.code)
+            self.block(node.body)
+            self.patch(jump_cond)
+            self.branch(node.cond, True, body)
+
+        elif kind is For:
+            self.statement(node.init)
+            jump_cond = self.emit(JUMP)
+            body = len(self.code)
+            self.block(node.body)
+            self.statement(node.step)
+            self.patch(jump_cond)
+            self.branch(node.cond, True, body)
+
+        elif kind is Return:
+            self.expression(node.value)
+            self.emit(RETURN)
+
+        elif kind is Call or kind is Builtin:
+            # Chamada usada como comando: o valor de retorno é descartado
+            self.expression(node)
+            self.emit(POP)
+
+        else:
+            raise Exception(f"Semantic Error: Invalid statement {node!r}")
+
+    def increment(self, name: str, value: Node) -> Optional[int]:
+        """
+        Índice da constante c se `value` é `name + c` (c numérico). `name - c` fica com o SUB
+        genérico: o INC_LOCAL concatena quando `name` é texto, e 'texto - c' deve falhar.
+        """
+        if (type(value) is BinOp and value.op == '+'
+                and type(value.left) is Var and value.left.name == name
+                and type(value.right) is Literal and type(value.right.value) in (int, float)):
+            index = self.compiler.const(value.right.value)
+            if index < PACKED_LIMIT:
+                return index
+        return None
+
+    # --- Condições ---
+
+    def branch(self, node: Node, when: bool, target: Optional[int] = None) -> List[int]:
+        """
+        Compila a condição como saltos: desvia para `target` se o valor lógico de `node`
+        for `when` e segue para a próxima instrução caso contrário. Sem `target`, retorna
+        as posições dos saltos a corrigir com patch_all.
+        """
+        kind = type(node)
+
+        if kind is BinOp and (node.op == 'e' or node.op == 'ou'):
+            # 'e' salta quando ambos são verdadeiros; 'ou' quando ambos são falsos
+            both = node.op == 'e'
+            if when == both:
+                skip = self.branch(node.left, not both)
+                jumps = self.branch(node.right, when, target)
+                self.patch_all(skip)
+                return jumps
+            return self.branch(node.left, when, target) + self.branch(node.right, when, target)
+
+        if kind is UnaryOp and node.op == 'nao':
+            return self.branch(node.operand, not when, target)
+
+        if kind is Literal:
+            # Condição constante (ex.: 'se' mantido pelo otimizador): salto fixo ou nenhum
+            if bool(node.value) != when:
+                return []
+            if target is None:
+                return [self.emit(JUMP)]
+            self.emit(JUMP, target)
+            return []
+
+        if kind is BinOp and node.op in COMPARE_JUMPS:
+            self.operands(node.left, node.right)
+            op = COMPARE_JUMPS[node.op][0 if when else 1]
+        else:
+            self.expression(node)
+            op = JUMP_IF_TRUE if when else JUMP_IF_FALSE
+
+        if target is None:
+            return [self.emit(op)]
+        self.emit(op, target)
+        return []
+
+    # --- Expressões ---
+
+    def operands(self, left: Node, right: Node) -> None:
+        """Empilha os dois operandos de um operador binário, combinando variável e constante."""
+        if type(left) is Var:
+            slot = self.resolve(left.name)
+            if type(right) is Var:
+                other = self.resolve(right.name)
+                if slot < PACKED_LIMIT and other < PACKED_LIMIT:
+                    self.emit(LOAD_LOCAL_LOCAL, slot | other << 16)
+                    return
+            elif type(right) is Literal:
+                index = self.compiler.const(right.value)
+                if slot < PACKED_LIMIT and index < PACKED_LIMIT:
+                    self.emit(LOAD_LOCAL_CONST, slot | index << 16)
+                    return
+        self.expression(left)
+        self.expression(right)
+
+    def expression(self, node: Node) -> None:
+        kind = type(node)
+
+        if kind is Var:
+            self.emit(LOAD_LOCAL, self.resolve(node.name))
+
+        elif kind is Literal:
+            self.emit(LOAD_CONST, self.compiler.const(node.value))
+
+        elif kind is BinOp:
+            if node.op == 'e' or node.op == 'ou':
+                # Curto-circuito: o operando da direita só é avaliado se necessário
+                self.expression(node.left)
+                jump = self.emit(JUMP_IF_FALSE_KEEP if node.op == 'e' else JUMP_IF_TRUE_KEEP)
+                self.expression(node.right)
+                self.patch(jump)
+            else:
+                self.operands(node.left, node.right)
+                self.emit(BINARY_OPCODES[node.op])
+
+        elif kind is UnaryOp:
+            self.expression(node.operand)
+            self.emit(NEG if node.op == '-' else NOT)
+
+        elif kind is Call:
+            index, n_params = self.compiler.function_index(node.name)
+            if len(node.args) != n_params:
+                raise Exception(f"Semantic Error: Function '{node.name}' expects "
+                                f"{n_params} arguments, got {len(node.args)}")
+            for arg in node.args:
+                self.expression(arg)
+            self.emit(CALL, index)
+
+        elif kind is Builtin:
+            builtin_id, arities = BUILTINS[node.name]
+            if arities is not None and len(node.args) not in arities:
+                raise Exception(f"Semantic Error: Builtin '{node.name}' does not accept "
+                                f"{len(node.args)} arguments")
+            if len(node.args) > 15:
+                raise Exception(f"Semantic Error: Too many arguments for '{node.name}'")
+            for arg in node.args:
+                self.expression(arg)
+            self.emit(BUILTIN, builtin_id * 16 + len(node.args))
+
+        else:
+            raise Exception(f"Semantic Error: Invalid expression {node!r}")
+
+
+class Compiler:
+    """
+    Compila a AST de um programa Lukera (Parser.ast) para bytecode.
+    A função 0 é o bloco `principal`; as demais seguem a ordem de declaração.
+    """
+
+    def __init__(self):
+        self.consts: List[object] = []
+        self.const_index: Dict[Tuple[type, object], int] = {}
+        self.functions: Dict[str, Tuple[int, int]] = {}
+
+    def const(self, value) -> int:
+        """Índice da constante no pool (1, 1.0 e verdadeiro são constantes distintas)."""
+        key = (type(value), value)
+        index = self.const_index.get(key)
+        if index is None:
+            index = self.const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return index
+
+    def function_index(self, name: str) -> Tuple[int, int]:
+        if name not in self.functions:
+            raise Exception(f"Semantic Error: Undefined function '{name}'")
+        return self.functions[name]
+
+    def compile(self, program: Program) -> BytecodeProgram:
+        if not isinstance(program, Program):
+            raise Exception("Semantic Error: Cannot compile an incomplete syntax tree")
+
+        # Registra todas as funções antes de compilar: chamadas podem vir antes da declaração
+        for index, function in enumerate(program.functions, start=1):
+            if function.name in self.functions:
+                raise Exception(f"Semantic Error: Function '{function.name}' already declared")
+            self.functions[function.name] = (index, len(function.params))
+
+        main = FunctionCompiler(self, "principal", [])
+        main.statements(program.body)
+        compiled = [main.finish()]
+
+        for function in program.functions:
+            body = FunctionCompiler(self, function.name, [param.name for param in function.params])
+            body.statements(function.body)
+            compiled.append(body.finish())
+
+        return BytecodeProgram(functions=compiled, consts=self.consts, main=0)
+
+
+def compile_program(program: Program) -> BytecodeProgram:
+    """Atalho: compila a AST de um programa para bytecode."""
+    return Compiler().compile(program)
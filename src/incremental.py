@@ -0,0 +1,273 @@
+"""
+Análise incremental para editores: depois de uma edição, re-tokeniza só a região danificada
+e re-analisa só os trechos de nível superior (principal / funcao) que mudaram.
+
+    document = IncrementalDocument(texto)
+    stats = document.edit(inicio, fim, "novo texto")
+    document.errors, document.ast
+
+O documento é dividido em trechos nos tokens de reinício: os que iniciam uma Funcao e
+também podem seguir uma Funcao completa (FIRST(Funcao) ∩ FOLLOW(Funcao), ou seja, 'funcao')
+fora de qualquer bloco. Nesses pontos a pilha do parser LL(1) é sempre [EOF, ListaFuncao],
+então cada trecho pode ser analisado sozinho a partir de Funcao (ou de Programa, o primeiro).
+
+Em programas sem erros o resultado é idêntico ao da análise completa. Com erros, a
+recuperação do modo pânico recomeça em cada trecho, então um erro não se propaga para as
+funções seguintes.
+"""
+import contextlib
+import io
+import time
+from bisect import bisect_right
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+from .cache import GrammarTables, load_grammar_tables
+from .line_index import LineIndex
+from .models import Lexeme, Grammar, SourceUnit, EditStats, EPSILON
+from .models_utils import build_lukera_lexeme, build_lukera_grammar
+from .parser import Parser
+from .regex_lexer import RegexTokenizer
+from .syntax_tree import Program
+from .token_buffer import TokenBuffer, token_types
+from .trace import TRACE_OFF
+
+
+# Não-terminal de cada trecho depois do primeiro (o primeiro usa o símbolo inicial)
+UNIT_SYMBOL = "Funcao"
+
+# Caracteres além do fim de um token que o lexer pode examinar (ex: '==', número seguido de letra)
+LOOKAHEAD = 2
+
+
+def restart_codes(tables: GrammarTables, type_names: List[str]) -> FrozenSet[int]:
+    """Códigos dos tokens de reinício: FIRST(Funcao) ∩ FOLLOW(Funcao), sem o ε."""
+    codes = {name: code for code, name in enumerate(type_names)}
+    first, follow = tables[0], tables[1]
+    restart = (first[UNIT_SYMBOL] & follow[UNIT_SYMBOL]) - {EPSILON}
+    return frozenset(codes[t] for t in restart if t in codes)
+
+
+def split_units(types: Sequence[int], lbrace: int, rbrace: int,
+                restart: FrozenSet[int]) -> List[Tuple[int, int]]:
+    """Intervalos [i, j) de tokens de cada trecho: cortes nos tokens de reinício fora de blocos."""
+    bounds = [0]
+    depth = 0
+    for index, code in enumerate(types):
+        if code == lbrace:
+            depth += 1
+        elif code == rbrace:
+            if depth > 0:
+                depth -= 1
+        elif code in restart and depth == 0 and index > 0:
+            bounds.append(index)
+    bounds.append(len(types))
+    return [(bounds[k], bounds[k + 1]) for k in range(len(bounds) - 1) if bounds[k] < bounds[k + 1]]
+
+
+def assemble_program(units: List[SourceUnit]) -> Optional[Program]:
+    """Programa montado a partir dos trechos (None se o principal foi descartado)."""
+    if not units or not isinstance(units[0].node, Program):
+        return None
+    functions = [unit.node for unit in units[1:] if unit.node is not None]
+    return Program(units[0].node.body, functions)
+
+
+def unit_errors(units: List[SourceUnit], lines: Optional[LineIndex] = None) -> List[str]:
+    """Erros de todos os trechos, na ordem do texto, com linha:coluna quando há `lines`."""
+    if lines is None:
+        return [error for unit in units for error in unit.errors]
+    return [lines.annotate(error, offset) for unit in units
+            for error, offset in zip(unit.errors, unit.error_offsets)]
+
+
+def parse_unit(buffer: TokenBuffer, i: int, j: int, unit_start: int, unit_end: int,
+               is_main: bool, grammar: Grammar, tables: GrammarTables,
+               build_ast: bool = True) -> SourceUnit:
+    """
+    Analisa os tokens buffer[i:j] sozinhos, terminados por um EOF. As mensagens de erro
+    ficam sem linha:coluna (ver unit_errors): as posições vão em error_offsets.
+    """
+    tokens = TokenBuffer(buffer.source, buffer.type_names)
+    tokens.types = buffer.types[i:j]
+    tokens.starts = buffer.starts[i:j]
+    tokens.ends = buffer.ends[i:j]
+    if tokens.types[-1] != tokens.type_codes['EOF']:
+        tokens.append(tokens.type_codes['EOF'], unit_end, unit_end)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser = Parser(tokens, grammar, trace_level=TRACE_OFF, tables=tables,
+                        build_ast=build_ast, start_symbol=None if is_main else UNIT_SYMBOL,
+                        locate_errors=False)
+        parser.parse()
+    return SourceUnit(unit_start, unit_end, j - i, parser.errors, parser.ast, parser.error_offsets)
+
+
+class IncrementalDocument:
+    """Texto fonte com tokens e análise sintática mantidos por trecho de nível superior."""
+
+    def __init__(self, text: str = "", lexemes: Optional[Lexeme] = None,
+                 grammar: Optional[Grammar] = None,
+                 tables: Optional[GrammarTables] = None):
+        self.lexemes = lexemes or build_lukera_lexeme()
+        self.grammar = grammar or build_lukera_grammar()
+        self.tables = tables or load_grammar_tables(self.grammar)
+        self.type_names = token_types(self.lexemes)
+
+        codes = {name: code for code, name in enumerate(self.type_names)}
+        self.restart_codes = restart_codes(self.tables, self.type_names)
+        self.lbrace, self.rbrace, self.eof = codes['LBRACE'], codes['RBRACE'], codes['EOF']
+
+        self.text = ""
+        self.lines = LineIndex()
+        self.units: List[SourceUnit] = []
+        self.lexical_error: Optional[str] = None
+        self.last_edit: Optional[EditStats] = None
+        self.edit(0, 0, text)
+
+    # --- Resultado ---
+
+    @property
+    def errors(self) -> List[str]:
+        """Erros sintáticos de todos os trechos, na ordem do texto, com linha:coluna."""
+        return unit_errors(self.units, self.lines)
+
+    @property
+    def ast(self) -> Optional[Program]:
+        """Programa montado a partir dos trechos (None se o principal foi descartado)."""
+        return assemble_program(self.units)
+
+    @property
+    def tokens(self) -> int:
+        return sum(unit.tokens for unit in self.units)
+
+    # --- Edição ---
+
+    def replace(self, text: str) -> EditStats:
+        """Troca o texto inteiro (os trechos que não mudaram são reaproveitados)."""
+        return self.edit(0, len(self.text), text)
+
+    def edit(self, start: int, end: int, replacement: str) -> EditStats:
+        """Substitui text[start:end] por `replacement` e atualiza tokens, erros e AST."""
+        if not 0 <= start <= end <= len(self.text):
+            raise ValueError(f"Invalid edit range [{start}, {end}) for a text of {len(self.text)} characters.")
+        started = time.perf_counter()
+
+        old_text, units = self.text, self.units
+        text = old_text[:start] + replacement + old_text[end:]
+        delta = len(replacement) - (end - start)
+
+        # Primeiro trecho afetado: o token antes dele termina a pelo menos LOOKAHEAD caracteres da edição
+        first = max(bisect_right([unit.start for unit in units], start - LOOKAHEAD) - 1, 0)
+        while True:
+            buffer, resync, lexical_error = self.rescan(text, first, end, delta)
+            # A região precisa começar em um token de reinício; senão inclui o trecho anterior
+            if first == 0 or (len(buffer) and buffer.types[0] in self.restart_codes):
+                break
+            first -= 1
+
+        stop = len(units) if resync is None else resync
+        if resync is None:
+            self.lexical_error = lexical_error
+
+        # Resultados antigos da região, para reaproveitar trechos com o mesmo texto
+        previous: Dict[Tuple[bool, str], SourceUnit] = {}
+        for index in range(first, stop):
+            unit = units[index]
+            previous[(index == 0, old_text[unit.start:unit.end])] = unit
+
+        region_start = units[first].start if units else 0
+        fresh: List[SourceUnit] = []
+        reparsed = 0
+        for i, j in self.split(buffer):
+            unit_start = region_start if i == 0 else buffer.ends[i - 1]
+            unit_end = buffer.ends[j - 1]
+            is_main = first + len(fresh) == 0
+            known = previous.get((is_main, text[unit_start:unit_end]))
+            if known is not None:
+                shift = unit_start - known.start
+                offsets = [offset if offset is None else offset + shift for offset in known.error_offsets]
+                fresh.append(SourceUnit(unit_start, unit_end, known.tokens, known.errors, known.node, offsets))
+                continue
+            fresh.append(self.parse_unit(buffer, i, j, unit_start, unit_end, is_main))
+            reparsed += 1
+
+        tail = units[stop:]
+        for unit in tail:
+            unit.start += delta
+            unit.end += delta
+            if unit.errors:
+                unit.error_offsets = [offset if offset is None else offset + delta
+                                      for offset in unit.error_offsets]
+
+        self.text = text
+        self.lines = LineIndex(text) # Montado só quando os erros são consultados
+        self.units = units[:first] + fresh + tail
+        self.last_edit = EditStats(
+            relexed_tokens=len(buffer),
+            reparsed_units=reparsed,
+            reused_units=len(self.units) - reparsed,
+            elapsed=time.perf_counter() - started,
+        )
+        return self.last_edit
+
+    def rescan(self, text: str, first: int, old_end: int,
+               delta: int) -> Tuple[TokenBuffer, Optional[int], Optional[str]]:
+        """
+        Re-tokeniza a partir do início do trecho `first` até ressincronizar: um token que
+        termina, depois da edição, exatamente onde começava um trecho antigo, com todos os
+        blocos fechados. Dali em diante o texto (e portanto os tokens) não mudou.
+        Retorna os novos tokens, o índice do trecho antigo de ressincronização (None se
+        foi até o fim) e a mensagem de erro léxico, se houver.
+        """
+        units = self.units
+        lexer = RegexTokenizer(None, self.lexemes, text=text)
+        buffer = TokenBuffer(text, self.type_names)
+
+        # Um erro léxico antigo tem a posição na mensagem: re-tokeniza até o fim
+        resync_at: Dict[int, int] = {}
+        if self.lexical_error is None:
+            for index in range(first + 1, len(units)):
+                if units[index].start >= old_end:
+                    resync_at[units[index].start + delta] = index
+        stops: Set[int] = set(resync_at)
+
+        output = io.StringIO()
+        pos = units[first].start if units else 0
+        depth = 0
+        checked = 0
+        with contextlib.redirect_stdout(output):
+            while True:
+                stop = lexer.scan_into(buffer, pos, stops)
+                if stop is None:
+                    break
+                depth = self.depth(buffer, checked, depth)
+                checked = len(buffer)
+                if depth == 0:
+                    return buffer, resync_at[stop], None
+                stops.discard(stop)
+                pos = stop
+
+        if len(buffer) == 0 or buffer.types[-1] != self.eof:
+            return buffer, None, output.getvalue().strip() or "Lexical Error"
+        return buffer, None, None
+
+    def depth(self, buffer: TokenBuffer, start: int, depth: int) -> int:
+        """
+        Profundidade de blocos depois dos tokens buffer[start:], partindo de `depth`.
+        Um '}' sobrando fora de blocos é ignorado, para o erro não juntar os trechos seguintes.
+        """
+        lbrace, rbrace = self.lbrace, self.rbrace
+        for code in buffer.types[start:]:
+            if code == lbrace:
+                depth += 1
+            elif code == rbrace and depth > 0:
+                depth -= 1
+        return depth
+
+    def split(self, buffer: TokenBuffer) -> List[Tuple[int, int]]:
+        """Intervalos [i, j) de tokens de cada trecho (ver split_units)."""
+        return split_units(buffer.types, self.lbrace, self.rbrace, self.restart_codes)
+
+    def parse_unit(self, buffer: TokenBuffer, i: int, j: int,
+                   unit_start: int, unit_end: int, is_main: bool) -> SourceUnit:
+        """Analisa os tokens buffer[i:j] sozinhos (ver parse_unit)."""
+        return parse_unit(buffer, i, j, unit_start, unit_end, is_main, self.grammar, self.tables)
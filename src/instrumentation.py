@@ -0,0 +1,151 @@
+"""
+Instrumentação opcional das fases do compilador (lexer, tabelas da gramática e parser).
+
+    instrumentation = Instrumentation(memory=True)
+    tokens = RegexTokenizer(path, lexeme, instrumentation=instrumentation).tokenize()
+    Parser(tokens, grammar, instrumentation=instrumentation).parse()
+    instrumentation.to_json("perfil.json")
+
+Desligada (instrumentation=None, o padrão) cada componente faz apenas um teste no início
+e no fim da fase: nada é medido nem contado dentro dos laços.
+"""
+import json
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+from .models import PhaseTiming
+from .token_buffer import TokenBuffer
+
+
+# Eventos aceitos por Instrumentation.on
+EVENT_PHASE_START = "phase_start"   # callback(name)
+EVENT_PHASE_END = "phase_end"       # callback(PhaseTiming)
+EVENT_COUNTERS = "counters"         # callback(prefixo, dict de contadores)
+
+EVENTS = (EVENT_PHASE_START, EVENT_PHASE_END, EVENT_COUNTERS)
+
+
+class Instrumentation:
+    """
+    Cronômetros de relógio e de CPU por fase, contadores nomeados e ganchos (callbacks).
+    Com memory=True, registra também o pico de memória (tracemalloc) de cada fase.
+    """
+
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.phases: List[PhaseTiming] = []
+        self.counters: Dict[str, int] = {}
+        self.hooks: Dict[str, List[Callable]] = {event: [] for event in EVENTS}
+        # Fases abertas: [nome, início relógio, início CPU, pico até agora]
+        self._open: List[list] = []
+        self._started_tracemalloc = False
+
+    # --- Ganchos ---
+
+    def on(self, event: str, callback: Callable) -> None:
+        if event not in self.hooks:
+            raise ValueError(f"Invalid event '{event}'. Use one of {EVENTS}.")
+        self.hooks[event].append(callback)
+
+    def emit(self, event: str, *args) -> None:
+        for callback in self.hooks[event]:
+            callback(*args)
+
+    # --- Fases ---
+
+    def begin(self, name: str) -> None:
+        """Abre uma fase (fases podem ser aninhadas; feche com end na ordem inversa)."""
+        peak = None
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            # O pico é zerado para a nova fase: o das fases de fora é preservado antes
+            current_peak = tracemalloc.get_traced_memory()[1]
+            for entry in self._open:
+                entry[3] = max(entry[3], current_peak)
+            tracemalloc.reset_peak()
+            peak = 0
+        self.emit(EVENT_PHASE_START, name)
+        self._open.append([name, time.perf_counter(), time.process_time(), peak])
+
+    def end(self) -> PhaseTiming:
+        """Fecha a fase aberta mais recente e registra seus tempos."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        name, wall_start, cpu_start, peak = self._open.pop()
+        if peak is not None:
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            if self._open:
+                self._open[-1][3] = max(self._open[-1][3], peak)
+            elif self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+        timing = PhaseTiming(name=name, wall=wall - wall_start, cpu=cpu - cpu_start,
+                             depth=len(self._open), peak_memory=peak)
+        self.phases.append(timing)
+        self.emit(EVENT_PHASE_END, timing)
+        return timing
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    # --- Contadores ---
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def maximum(self, name: str, value: int) -> None:
+        """Contador que guarda o maior valor visto (ex: profundidade máxima da pilha)."""
+        self.counters[name] = max(self.counters.get(name, value), value)
+
+    def update(self, prefix: str, values: Dict[str, int]) -> None:
+        """Soma um grupo de contadores, com os nomes prefixados (ex: 'parser.matches')."""
+        for name, value in values.items():
+            self.count(f"{prefix}.{name}", value)
+        self.emit(EVENT_COUNTERS, prefix, values)
+
+    def count_tokens(self, tokens) -> None:
+        """Contadores do lexer: total e tokens por tipo (lista de Token ou TokenBuffer)."""
+        if isinstance(tokens, TokenBuffer):
+            names = tokens.type_names
+            by_type = Counter({names[code]: n for code, n in Counter(tokens.types).items()})
+        else:
+            by_type = Counter(token.type for token in tokens)
+        values = {"total": sum(by_type.values())}
+        values.update((f"by_type.{name}", n) for name, n in sorted(by_type.items()))
+        self.update("tokens", values)
+
+    # --- Exportação ---
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "phases": [vars(timing) for timing in self.phases],
+            "totals": self.totals(),
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """Tempo somado por nome de fase (uma fase pode rodar várias vezes)."""
+        totals: Dict[str, Dict[str, float]] = {}
+        for timing in self.phases:
+            entry = totals.setdefault(timing.name, {"calls": 0, "wall": 0.0, "cpu": 0.0})
+            entry["calls"] += 1
+            entry["wall"] += timing.wall
+            entry["cpu"] += timing.cpu
+        return totals
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """Texto JSON da instrumentação; com `path`, também grava no arquivo."""
+        data = json.dumps(self.to_dict(), indent=4)
+        if path is not None:
+            with open(path, "w") as json_file:
+                json_file.write(data)
+        return data
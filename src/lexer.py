@@ -1,7 +1,38 @@
+import codecs
 import json
-from typing import Dict
+import mmap
+from typing import Dict, Iterator, Optional
 from dataclasses import dataclass
+from .instrumentation import Instrumentation
+from .line_index import LineIndex
 from .models import Lexeme, Token
+from .token_buffer import TokenBuffer
+from .token_file import save_tokens
+
+
+def read_chunks(file_path: str, chunk_size: int = 1 << 16) -> Iterator[str]:
+    """
+    Lê um arquivo UTF-8 em blocos de tamanho fixo, via mmap quando possível.
+    Caracteres multibyte divididos entre dois blocos são remontados pelo decodificador incremental.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+
+    with open(file_path, 'rb') as file:
+        try:
+            source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Arquivos vazios não podem ser mapeados
+            source = None
+
+        if source is None:
+            for block in iter(lambda: file.read(chunk_size), b''):
+                yield decoder.decode(block)
+        else:
+            with source:
+                for offset in range(0, len(source), chunk_size):
+                    yield decoder.decode(source[offset:offset + chunk_size])
+
+    yield decoder.decode(b'', final=True)
 
 
 class Tokenizer:
@@ -9,56 +40,135 @@ class Tokenizer:
     Um tokenizador genérico que processa texto baseando-se em um objeto Lexeme configurado.
     """
 
-    def __init__(self, file_path: str, lexemes: Lexeme):
+    def __init__(self, file_path: Optional[str], lexemes: Lexeme,
+                 streaming: bool = False, chunk_size: int = 1 << 16,
+                 text: Optional[str] = None,
+                 instrumentation: Optional[Instrumentation] = None,
+                 prepass: bool = False):
         # Configuração da Linguagem (Injeção de Dependência)
         self.lexemes = lexemes
+
+        # Fase "lex" e contagem de tokens por tipo em tokenize/tokenize_compact (opcional)
+        self.instrumentation = instrumentation
+
+        # Modo streaming: self.text é apenas uma janela do arquivo, reabastecida
+        # bloco a bloco. self.base é a posição absoluta de self.text[0].
+        self.base = 0
+        self.chunks: Optional[Iterator[str]] = None
+        self.text = ""
+        self.position = 0
+
+        # Inícios de linha do arquivo, para reportar linha:coluna a partir das posições dos
+        # tokens. Com o texto inteiro, é montado só na primeira consulta; em streaming,
+        # cresce a cada bloco lido.
+        self.lines = LineIndex()
+
+        # Pré-passe com NumPy (char_classes): fronteiras de espaços, palavras, dígitos e
+        # comentários calculadas de uma vez sobre o texto inteiro
+        if prepass and streaming and text is None:
+            raise ValueError("The character-class pre-pass needs the whole source text (streaming=False).")
+        self.classes = None
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                self.text = file.read()
+            if text is not None:
+                # Texto já em memória (ex: buffer do editor): file_path não é lido
+                self.text = text
+                self.lines = LineIndex(text)
+            elif streaming:
+                self.chunks = read_chunks(file_path, chunk_size)
+                self.refill() # Lê o primeiro bloco
+            else:
+                with open(file_path, 'r', encoding='utf-8') as file:
+                    self.text = file.read()
+                self.lines = LineIndex(self.text)
         except FileNotFoundError:
             print(f"Error: File not found at '{file_path}'")
             self.text = ""
+            self.chunks = None
         
+        if prepass:
+            from .char_classes import CharClasses
+            self.classes = CharClasses(self.text)
+
         self.tokens = []
-        self.position = 0
+        self.token_start = 0 # Posição absoluta do início do último token lido
         self.current_char = self.text[self.position] if self.position < len(self.text) else None
 
+    def refill(self):
+        """
+        Descarta o texto já consumido da janela e anexa o próximo bloco do arquivo.
+        Tokens, strings e comentários que cruzam a fronteira entre blocos continuam
+        sendo lidos normalmente, pois a janela sempre preserva o trecho a partir de self.position.
+        """
+        chunk = ""
+        while not chunk and self.chunks is not None:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.chunks = None
+                chunk = ""
+
+        self.base += self.position
+        self.text = self.text[self.position:] + chunk
+        self.lines.extend(chunk)
+        self.position = 0
+
     def advance(self):
         """Avança o ponteiro em um caracter no texto"""
         self.position += 1
+        if self.position >= len(self.text) and self.chunks is not None:
+            self.refill()
         self.current_char = self.text[self.position] if self.position < len(self.text) else None
 
     def peek(self):
         """Olha para o próximo caracter sem avançar o ponteiro."""
         next_pos = self.position + 1
+        if next_pos >= len(self.text) and self.chunks is not None:
+            self.refill()
+            next_pos = self.position + 1
         return self.text[next_pos] if next_pos < len(self.text) else None
 
+    def jump(self, position: int):
+        """Move o ponteiro direto para `position` (texto inteiro em memória, com o pré-passe)."""
+        self.position = position
+        self.current_char = self.text[position] if position < len(self.text) else None
+
     def skip_whitespace(self):
         """Pula todos os caracteres de espaço em branco"""
+        if self.classes is not None:
+            if self.current_char is not None and self.current_char.isspace():
+                self.jump(self.classes.ends[self.position])
+            return
         while self.current_char is not None and self.current_char.isspace():
             self.advance()
 
     def skip_line_comment(self):
         """Pula toda as linhas de comentário (//...)."""
+        if self.classes is not None:
+            self.jump(self.classes.line_end(self.position))
+            return
         while self.current_char is not None and self.current_char != '\n':
             self.advance()
 
     def skip_block_comment(self):
-        """Pula um bloco de comentário (/* ... */)."""
+        """Pula um bloco de comentário (/* ... */); sem o '*/', é um erro léxico."""
+        start = self.base + self.position - 2 # Posição do '/' (o '/*' já foi consumido)
         self.advance() # Pula o '*'
-        
-        while self.current_char is not None:
-            if self.current_char == '*' and self.peek() == '/':
-                self.advance() # Pula o '*'
-                self.advance() # Pula o '/'
-                return # Fim do comentário
-            
-            # Manipula erros de comentários não fechados
-            if self.current_char is None:
-                raise Exception("Lexical Error: Unterminated block comment.")
-                
-            self.advance()
+
+        if self.classes is not None:
+            closer = self.classes.closer(self.position)
+            self.jump(closer + 2 if closer >= 0 else max(self.position, len(self.text)))
+            if closer >= 0:
+                return
+        else:
+            while self.current_char is not None:
+                if self.current_char == '*' and self.peek() == '/':
+                    self.advance() # Pula o '*'
+                    self.advance() # Pula o '/'
+                    return # Fim do comentário
+                self.advance()
+
+        # Manipula erros de comentários não fechados
+        raise Exception(f"Lexical Error: Unterminated block comment at {self.lines.describe(start)}.")
 
     def read_number(self) -> Token:
         """
@@ -66,12 +176,8 @@ class Tokenizer:
         INT:   [0-9]+
         FLOAT: [0-9]+ '.' [0-9]+ ( [eE] [+\-]? [0-9]+ )?
         """
-        num_str = ""
-        
         # Lê a parte inteira
-        while self.current_char is not None and self.current_char.isdigit():
-            num_str += self.current_char
-            self.advance()
+        num_str = self.read_digits()
 
         # Checa pelo número flutuante
         if self.current_char == '.':
@@ -81,9 +187,7 @@ class Tokenizer:
                 self.advance() # Consume o '.'
                 
                 # Lê a parte fracionária
-                while self.current_char is not None and self.current_char.isdigit():
-                    num_str += self.current_char
-                    self.advance()
+                num_str += self.read_digits()
                 
                 # Checa pela notação científica (e/E)
                 if self.current_char in ('e', 'E'):
@@ -96,16 +200,29 @@ class Tokenizer:
                         self.advance()
                         
                     # Lê os dígitos do expoente
-                    while self.current_char is not None and self.current_char.isdigit():
-                        num_str += self.current_char
-                        self.advance()
+                    num_str += self.read_digits()
                 
-                return Token(type='FLOAT', value=float(num_str))
+                return Token(type='FLOAT', value=float(num_str), start=self.token_start)
             else:
-                return Token(type='INTEGER', value=int(num_str))
+                return Token(type='INTEGER', value=int(num_str), start=self.token_start)
         
         # Se nenhum '.' foi encontrado, é apenas um inteiro
-        return Token(type='INTEGER', value=int(num_str))
+        return Token(type='INTEGER', value=int(num_str), start=self.token_start)
+
+    def read_digits(self) -> str:
+        """Lê uma sequência (possivelmente vazia) de dígitos."""
+        if self.classes is not None:
+            if self.current_char is None or not self.current_char.isdigit():
+                return ""
+            start = self.position
+            self.jump(self.classes.digit_ends[start])
+            return self.text[start:self.position]
+
+        digits = ""
+        while self.current_char is not None and self.current_char.isdigit():
+            digits += self.current_char
+            self.advance()
+        return digits
 
     def read_string(self) -> Token:
         """
@@ -113,7 +230,7 @@ class Tokenizer:
         STRING: '"' ( '\\' [btnr"\\] | ~["\\\r\n] )* '"'
         """
         self.advance()
-        string_val = ""
+        parts = [] # Juntadas no final: concatenar caractere a caractere é quadrático
         
         while self.current_char is not None and self.current_char != '"':
             
@@ -122,50 +239,56 @@ class Tokenizer:
                 self.advance() # Consome o '\'
                 
                 if self.current_char == 'n':
-                    string_val += '\n'
+                    parts.append('\n')
                 elif self.current_char == 't':
-                    string_val += '\t'
+                    parts.append('\t')
                 elif self.current_char == 'b':
-                    string_val += '\b'
+                    parts.append('\b')
                 elif self.current_char == 'r':
-                    string_val += '\r'
+                    parts.append('\r')
                 elif self.current_char == '"':
-                    string_val += '"'
+                    parts.append('"')
                 elif self.current_char == '\\':
-                    string_val += '\\'
+                    parts.append('\\')
                 else:
                     # Sequência de escape desconhecida, apenas adiciona o caractere
-                    string_val += self.current_char 
+                    parts.append(self.current_char)
             else:
-                string_val += self.current_char
+                parts.append(self.current_char)
                 
             self.advance()
             
         if self.current_char != '"':
-            raise Exception("Lexical Error: Unterminated string.")
+            raise Exception(f"Lexical Error: Unterminated string at {self.lines.describe(self.token_start)}.")
             
         self.advance() # Pula o fechamento "
-        return Token(type='STRING', value=string_val)
+        return Token(type='STRING', value="".join(parts), start=self.token_start)
 
     def read_word(self) -> Token:
         """
         Lê a uma palavra-chave ou um identificador.
         ID: [a-zA-Z_][a-zA-Z_0-9]*
         """
-        word = ""
         # O primeiro caractere já foi checado (isalpha() ou '_') pelo get_next_token
-        while self.current_char is not None and (self.current_char.isalnum() or self.current_char == '_'):
-            word += self.current_char
-            self.advance()
+        if self.classes is not None:
+            start = self.position
+            self.jump(self.classes.ends[start])
+            word = self.text[start:self.position]
+        else:
+            word = ""
+            while self.current_char is not None and (self.current_char.isalnum() or self.current_char == '_'):
+                word += self.current_char
+                self.advance()
 
         # Checa se é uma palavra-chave (incluindo os booleanos e ifs)
         token_type = self.lexemes.keywords.get(word, 'ID') # Padrão para 'ID'
         
         # Manipula 'verdadeiro'/'falso' que são BOOLs, não DTYPEs ou IDs
         if token_type == 'BOOL':
-            return Token(type='BOOL', value=('verdadeiro' if word == 'verdadeiro' else 'falso'))
+            return Token(type='BOOL', value=('verdadeiro' if word == 'verdadeiro' else 'falso'),
+                         start=self.token_start)
         
-        return Token(type=token_type, value=word)
+        return Token(type=token_type, value=word, start=self.token_start)
 
     def get_next_token(self) -> Token:
         """
@@ -191,6 +314,8 @@ class Tokenizer:
                     self.skip_block_comment()
                     continue
 
+            self.token_start = self.base + self.position
+
             # 3. Números (Inteiros ou Flutuantes)
             if self.current_char.isdigit():
                 return self.read_number()
@@ -210,7 +335,7 @@ class Tokenizer:
                 op_type = self.lexemes.operators[double_char]
                 self.advance()
                 self.advance()
-                return Token(type=op_type, value=double_char)
+                return Token(type=op_type, value=double_char, start=self.token_start)
 
             # 7. Operadores e delimitadores (únicos caracteres)
             # MODIFICAÇÃO: Usa os dicionários do Lexeme
@@ -218,38 +343,88 @@ class Tokenizer:
                 op = self.current_char
                 op_type = self.lexemes.operators[op]
                 self.advance()
-                return Token(type=op_type, value=op)
+                return Token(type=op_type, value=op, start=self.token_start)
                 
             if self.current_char in self.lexemes.delimiters:
                 delim = self.current_char
                 delim_type = self.lexemes.delimiters[delim]
                 self.advance()
-                return Token(type=delim_type, value=delim)
+                return Token(type=delim_type, value=delim, start=self.token_start)
 
             # 8. Error
             # Não avança, não avisa. Apenas lança um erro e para.
             invalid_char = self.current_char
-            raise Exception(f"Lexical Error: Invalid Character '{invalid_char}' at position {self.position}")
+            raise Exception(f"Lexical Error: Invalid Character '{invalid_char}' at {self.lines.describe(self.base + self.position)}")
             # --------------------------
 
-        # Fim do arquivo
-        return Token(type='EOF', value=None)
+        # Fim do arquivo (um operador no último caractere pode ter avançado além do texto)
+        self.token_start = self.base + min(self.position, len(self.text))
+        return Token(type='EOF', value=None, start=self.token_start)
 
-    def tokenize(self) -> list[Token]:
-        """Método para retornar a lista de todos os tokens"""
+    def stream(self) -> Iterator[Token]:
+        """
+        Gera os tokens um a um, sob demanda (o EOF é o último token gerado).
+        Em caso de erro léxico, o erro é exibido e a geração termina sem o EOF.
+        """
         try:
             token = self.get_next_token()
             while token.type != 'EOF':
-                self.tokens.append(token)
+                yield token
                 token = self.get_next_token()
-            self.tokens.append(token) # Adiciona o token EOF
+            yield token # Gera o token EOF
             
         except Exception as e:
             print(e)
-            return self.tokens 
-            
+
+    def tokenize(self) -> list[Token]:
+        """Método para retornar a lista de todos os tokens"""
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            self.tokens.extend(self.stream())
+            return self.tokens
+
+        with instrumentation.phase("lex"):
+            self.tokens.extend(self.stream())
+        instrumentation.count_tokens(self.tokens)
         return self.tokens
-    
+
+    def tokenize_compact(self) -> TokenBuffer:
+        """
+        Tokeniza o texto inteiro para um TokenBuffer (arrays de tipos e posições),
+        sem manter objetos Token. Requer o texto completo (streaming=False).
+        """
+        if self.chunks is not None:
+            raise ValueError("Compact tokenization needs the whole source text (streaming=False).")
+
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return self.build_compact()
+
+        with instrumentation.phase("lex"):
+            buffer = self.build_compact()
+        instrumentation.count_tokens(buffer)
+        return buffer
+
+    def build_compact(self) -> TokenBuffer:
+        """Laço de tokenização de tokenize_compact (sem instrumentação)."""
+        buffer = TokenBuffer.for_lexeme(self.text, self.lexemes)
+        codes = buffer.type_codes
+
+        # Um operador no último caractere avança uma posição além do texto (ver get_next_token)
+        length = len(self.text)
+        try:
+            token = self.get_next_token()
+            while token.type != 'EOF':
+                buffer.append(codes[token.type], self.token_start, min(self.position, length))
+                token = self.get_next_token()
+            buffer.append(codes['EOF'], token.start, token.start) # Adiciona o token EOF
+
+        except Exception as e:
+            print(e)
+
+        self.tokens = buffer
+        return buffer
+
     def save_as_json(self, output_file) -> None:
         """Método para salvar a lista de tokens em um arquivo JSON"""
         tokens_collection = [[token.get_type(), token.get_value()] for token in self.tokens]
@@ -259,4 +434,8 @@ class Tokenizer:
         }
 
         with open(output_file, 'w') as json_file:
-            json.dump(data, json_file, indent=4)
\ No newline at end of file
+            json.dump(data, json_file, indent=4)
+
+    def save_as_binary(self, output_file) -> int:
+        """Salva os tokens no formato binário (.lkt), recarregável com token_file.load_tokens"""
+        return save_tokens(self.tokens, output_file)
\ No newline at end of file
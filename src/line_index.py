@@ -0,0 +1,63 @@
+"""
+Índice de linhas de um texto fonte: converte a posição (offset) de um token em linha e
+coluna só quando uma mensagem precisa delas, sem contar quebras de linha no laço do lexer.
+
+    lines = LineIndex(texto)        # montado na primeira consulta
+    lines.locate(offset)            # (linha, coluna), ambas a partir de 1
+    lines.describe(offset)          # "linha:coluna"
+
+No modo streaming, o índice cresce bloco a bloco com `extend`, à medida que o lexer lê o arquivo.
+"""
+from array import array
+from bisect import bisect_right
+from typing import Optional, Tuple
+
+
+class LineIndex:
+    """
+    Posições em que cada linha começa (array crescente), encontradas com str.find.
+    A linha de um offset é a quantidade de inícios de linha até ele (busca binária).
+    """
+
+    def __init__(self, text: Optional[str] = None):
+        self.starts = array('I', [0])
+        self.length = 0           # Caracteres já indexados
+        self._pending = text      # Texto completo, indexado só na primeira consulta
+
+    def extend(self, chunk: str) -> None:
+        """Indexa o próximo trecho do texto (continuação do anterior)."""
+        self._build()
+        find = chunk.find
+        append = self.starts.append
+        base = self.length
+        newline = find('\n')
+        while newline >= 0:
+            append(base + newline + 1)
+            newline = find('\n', newline + 1)
+        self.length += len(chunk)
+
+    def _build(self) -> None:
+        if self._pending is not None:
+            text, self._pending = self._pending, None
+            self.extend(text)
+
+    def locate(self, offset: int) -> Tuple[int, int]:
+        """Linha e coluna (a partir de 1) do caractere na posição `offset`."""
+        self._build()
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+    def describe(self, offset: int) -> str:
+        line, column = self.locate(offset)
+        return f"{line}:{column}"
+
+    def annotate(self, message: str, offset: Optional[int]) -> str:
+        """Mensagem com a posição no final (sem posição conhecida, fica inalterada)."""
+        if offset is None:
+            return message
+        return f"{message} at {self.describe(offset)}"
+
+    def __len__(self) -> int:
+        """Quantidade de linhas (um texto vazio tem uma linha)."""
+        self._build()
+        return len(self.starts)
@@ -1,14 +1,20 @@
-from dataclasses import dataclass
-from typing import Dict, List
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
 
 # Constante para representar o vazio (Epsilon).
 EPSILON = "ε"
 
 class Token:
-    def __init__(self, type:str, value:str):
+    # Sem __dict__: um arquivo grande gera centenas de milhares de tokens
+    __slots__ = ("type", "value", "start")
+
+    def __init__(self, type:str, value:str, start:Optional[int]=None):
         self.type = type
         self.value = value
+        # Posição do início do lexema no texto fonte (linha/coluna via LineIndex)
+        self.start = start
 
     def get_type(self)->str:
         return self.type
@@ -27,4 +33,131 @@ class Lexeme:
 @dataclass
 class Grammar:
     start_symbol: str
-    productions: Dict[str, List[List[str]]]
\ No newline at end of file
+    productions: Dict[str, List[List[str]]]
+    # Terminais que, além do FOLLOW, sincronizam os não-terminais não anuláveis (modo pânico)
+    sync_terminals: List[str] = field(default_factory=list)
+
+@dataclass
+class CompiledGrammar:
+    """
+    Gramática LL(1) compilada para inteiros.
+
+    Os símbolos são numerados com os terminais primeiro (0 .. n_terminals-1), então
+    `is_terminal[s]` equivale a `s < n_terminals`. A tabela de parsing é um array plano
+    indexado por (não-terminal - n_terminals) * n_terminals + terminal, contendo o índice
+    da produção ou -1.
+    """
+    symbols: List[str]
+    symbol_ids: Dict[str, int]
+    n_terminals: int
+    start: int
+    eof: int
+    unknown: int                            # Terminal reservado para tipos fora da gramática
+    is_terminal: bytes
+    productions: List[Tuple[str, List[str]]] # (A, alpha) com nomes, para relatórios
+    prod_lhs: array
+    prod_push: List[array]                   # Lado direito invertido, pronto para empilhar
+    table: array
+    chains: List[array]                      # Por célula: expansões encadeadas sobre o mesmo terminal
+    sync: bytes                              # 1 se o terminal sincroniza o não-terminal (modo pânico)
+    resume: bytes                            # 1 se o terminal encerra um descarte: M[A, a] definido ou sync
+
+
+@dataclass
+class CompileResult:
+    """Resultado da análise (léxica + sintática) de um arquivo no modo batch."""
+    path: str
+    tokens: int
+    success: bool
+    lexical_error: Optional[str]
+    errors: List[str]
+    lex_time: float
+    parse_time: float
+    cached: bool = False                    # Resultado lido do cache de compilação
+
+
+@dataclass
+class FunctionCode:
+    """
+    Código de uma função compilada para bytecode.
+    `code` é um array plano de pares (opcode, argumento); os parâmetros ocupam os
+    primeiros slots de variáveis locais.
+    """
+    name: str
+    n_params: int
+    n_locals: int
+    code: array
+    local_names: List[str]
+
+
+@dataclass
+class BytecodeProgram:
+    functions: List[FunctionCode]   # functions[main] é o bloco `principal`
+    consts: List[object]            # Pool de constantes (LOAD_CONST)
+    main: int = 0
+
+
+@dataclass
+class CachedCompile:
+    """
+    Artefatos da compilação de um arquivo guardados no cache de resultados (compile_cache).
+    O bytecode só existe para programas sem erros léxicos, sintáticos e semânticos.
+    """
+    tokens: object                          # TokenBuffer (inclui o texto fonte)
+    lexical_error: Optional[str]
+    errors: List[str]
+    suppressed_errors: int
+    ast: Optional[object]                   # Program (None se o pânico o descartou)
+    bytecode: Optional[BytecodeProgram]
+    semantic_error: Optional[str]
+    lex_time: float                         # Tempos da compilação original
+    parse_time: float
+
+
+@dataclass
+class OptimizationReport:
+    nodes_before: int
+    nodes_after: int
+    folded: int = 0             # Expressões constantes substituídas por literais
+    branches_pruned: int = 0    # Ramos de se/senaose/senao e laços que nunca executam
+    unreachable: int = 0        # Comandos depois de 'retorna'
+    functions_removed: int = 0  # Funções nunca chamadas
+
+    @property
+    def nodes_removed(self) -> int:
+        return self.nodes_before - self.nodes_after
+
+
+@dataclass
+class SourceUnit:
+    """
+    Trecho de nível superior de um documento incremental: o bloco `principal` ou uma
+    `funcao`. Vai de `start` (fim do último token do trecho anterior) até o fim do seu
+    último token, então os espaços e comentários entre dois trechos pertencem ao segundo.
+    """
+    start: int
+    end: int
+    tokens: int
+    errors: List[str]
+    node: Optional[object]      # Program (principal) ou Function; None se o pânico o descartou
+    # Posição no texto de cada erro (None se desconhecida); a linha:coluna é calculada na consulta
+    error_offsets: List[Optional[int]] = field(default_factory=list)
+
+
+@dataclass
+class EditStats:
+    """O que uma edição incremental precisou refazer."""
+    relexed_tokens: int
+    reparsed_units: int
+    reused_units: int
+    elapsed: float
+
+
+@dataclass
+class PhaseTiming:
+    """Tempo de uma fase instrumentada (ver instrumentation.Instrumentation)."""
+    name: str
+    wall: float                         # Segundos de relógio
+    cpu: float                          # Segundos de CPU do processo
+    depth: int                          # Nível de aninhamento (0 = fase de fora)
+    peak_memory: Optional[int] = None   # Pico de bytes alocados (tracemalloc), se ativado
@@ -1,7 +1,11 @@
-import pandas as pd
+from array import array
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, List, Set
-from .models import Lexeme, Grammar, EPSILON
+from typing import TYPE_CHECKING, Dict, Iterable, List, Set
+from .models import Lexeme, Grammar, CompiledGrammar, EPSILON
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 def build_lukera_lexeme() -> Lexeme:
     """
@@ -300,7 +304,10 @@ def build_lukera_grammar() -> Grammar:
         ],
     }
 
-    return Grammar(start_symbol="Programa", productions=prods)
+    # Fins de comando e de bloco: um erro dentro de uma expressão ou de um cabeçalho
+    # se recupera no ';' ou '}' seguinte, em vez de descartar tokens até o FOLLOW
+    return Grammar(start_symbol="Programa", productions=prods,
+                   sync_terminals=["SEMI", "RBRACE"])
 
 
 def first_of_sequence(seq: List[str],
@@ -339,71 +346,216 @@ def first_of_sequence(seq: List[str],
     return result
 
 
+class SymbolBits:
+    """
+    Numeração dos terminais como bits de um inteiro (bitset). O bit 0 representa o ε.
+    """
+
+    def __init__(self, grammar: Grammar):
+        self.bits: Dict[str, int] = {EPSILON: 1}
+        self.names: List[str] = [EPSILON]
+        self.add("EOF")
+        for prods in grammar.productions.values():
+            for prod in prods:
+                for X in prod:
+                    if X not in grammar.productions:
+                        self.add(X)
+
+    def add(self, name: str) -> int:
+        """Retorna o bit do terminal, registrando-o se ainda não existir."""
+        bit = self.bits.get(name)
+        if bit is None:
+            bit = 1 << len(self.names)
+            self.bits[name] = bit
+            self.names.append(name)
+        return bit
+
+    def to_bits(self, symbols: Set[str]) -> int:
+        value = 0
+        for name in symbols:
+            value |= self.add(name)
+        return value
+
+    def to_set(self, value: int) -> Set[str]:
+        result: Set[str] = set()
+        while value:
+            low = value & -value
+            result.add(self.names[low.bit_length() - 1])
+            value ^= low
+        return result
+
+
+def strongly_connected(nodes: Iterable[str], edges: Dict[str, Set[str]]) -> List[List[str]]:
+    """
+    Componentes fortemente conexas (Tarjan, versão iterativa).
+    As componentes saem em ordem topológica reversa: uma componente só é emitida depois
+    de todas as componentes alcançáveis a partir dela.
+    """
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+
+    for root in nodes:
+        if root in index:
+            continue
+
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(edges.get(root, ())))]
+
+        while work:
+            node, successors = work[-1]
+            for succ in successors:
+                if succ not in index:
+                    index[succ] = low[succ] = len(index)
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(edges.get(succ, ()))))
+                    break
+                if succ in on_stack:
+                    low[node] = min(low[node], index[succ])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    return components
+
+
 def compute_first(grammar: Grammar) -> Dict[str, Set[str]]:
     """
     Calcula o conjunto FIRST para todos os não-terminais da gramática.
+
+    Os não-terminais são processados por componente fortemente conexa do grafo de
+    dependências (A depende de B se B pode iniciar um lado direito de A), das dependências
+    para os dependentes. Dentro de cada componente, uma worklist sobre bitsets reavalia uma
+    produção apenas quando o FIRST de algum não-terminal do seu lado direito cresce.
     """
-    # Inicializa conjuntos vazios
-    first: Dict[str, Set[str]] = {nt: set() for nt in grammar.productions}
+    nonterminals = grammar.productions
+    symbol_bits = SymbolBits(grammar)
+    bits = symbol_bits.bits
+    EPS = bits[EPSILON]
+
+    # Produções numeradas e, para cada não-terminal, as produções que podem depender dele
+    # (ocorrências antes do primeiro terminal)
+    productions = [(A, prod) for A, prods in nonterminals.items() for prod in prods]
+    users: Dict[str, List[int]] = {A: [] for A in nonterminals}
+    depends: Dict[str, Set[str]] = {A: set() for A in nonterminals}
+    by_lhs: Dict[str, List[int]] = {A: [] for A in nonterminals}
+
+    for index, (A, prod) in enumerate(productions):
+        by_lhs[A].append(index)
+        for X in prod:
+            if X not in nonterminals:
+                break
+            depends[A].add(X)
+            users[X].append(index)
+
+    first_bits: Dict[str, int] = {A: 0 for A in nonterminals}
+    queued = [False] * len(productions)
+
+    for component in strongly_connected(nonterminals, depends):
+        members = set(component)
+        worklist = deque(index for A in component for index in by_lhs[A])
+        for index in worklist:
+            queued[index] = True
+
+        while worklist:
+            index = worklist.popleft()
+            queued[index] = False
+            A, prod = productions[index]
+
+            # FIRST do lado direito (mesma regra de first_of_sequence)
+            rhs = 0
+            for X in prod:
+                if X == EPSILON:
+                    rhs |= EPS
+                    break
+                if X not in nonterminals:
+                    rhs |= bits[X]
+                    break
+                f = first_bits[X]
+                rhs |= f & ~EPS
+                if not f & EPS:
+                    break
+            else:
+                rhs |= EPS
 
-    changed = True
-    while changed:
-        changed = False
-        for A, prods in grammar.productions.items():
-            for prod in prods:
-                rhs_first = first_of_sequence(prod, first, grammar)
-                
-                # Se encontrarmos novos símbolos, atualizamos e marcamos mudança
-                if not rhs_first.issubset(first[A]):
-                    first[A].update(rhs_first)
-                    changed = True
-    return first
+            # Cresceu: reavalia as produções da mesma componente que dependem de A
+            # (as demais componentes dependentes ainda não foram processadas)
+            if rhs & ~first_bits[A]:
+                first_bits[A] |= rhs
+                for user in users[A]:
+                    if not queued[user] and productions[user][0] in members:
+                        queued[user] = True
+                        worklist.append(user)
+
+    return {A: symbol_bits.to_set(value) for A, value in first_bits.items()}
 
 
 def compute_follow(grammar: Grammar,
                    first: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
     """
     Calcula o conjunto FOLLOW para todos os não-terminais.
+
+    Cada produção é percorrida uma única vez, da direita para a esquerda, mantendo o
+    FIRST do sufixo (memoizado como bitset). Isso gera as contribuições fixas
+    FIRST(beta) - {ε} e as arestas FOLLOW(A) -> FOLLOW(B). As arestas são propagadas em
+    ordem topológica das componentes fortemente conexas, cujos membros têm o mesmo FOLLOW.
     """
-    follow: Dict[str, Set[str]] = {nt: set() for nt in grammar.productions}
-    
+    nonterminals = grammar.productions
+    symbol_bits = SymbolBits(grammar)
+    EPS = symbol_bits.bits[EPSILON]
+
+    first_bits = {A: symbol_bits.to_bits(first[A]) for A in nonterminals}
+    follow_bits: Dict[str, int] = {A: 0 for A in nonterminals}
+    edges: Dict[str, Set[str]] = {A: set() for A in nonterminals}
+
     # Regra 1: O símbolo inicial contém EOF
-    follow[grammar.start_symbol].add("EOF")
+    follow_bits[grammar.start_symbol] |= symbol_bits.bits["EOF"]
 
-    changed = True
-    while changed:
-        changed = False
-        for A, prods in grammar.productions.items():
-            for prod in prods:
-                # Percorre a produção buscando Não-Terminais (B)
-                for i, B in enumerate(prod):
-                    if B in grammar.productions:  # B é não-terminal
-                        beta = prod[i + 1:] # O que vem depois de B
-                        
-                        if beta:
-                            # Regra 2: FOLLOW(B) recebe FIRST(beta) - {ε}
-                            first_beta = first_of_sequence(beta, first, grammar)
-                            before_len = len(follow[B])
-                            
-                            follow[B].update(first_beta - {EPSILON})
-                            
-                            if len(follow[B]) != before_len:
-                                changed = True
-                                
-                            # Regra 3: Se beta é anulável, FOLLOW(B) recebe FOLLOW(A)
-                            if EPSILON in first_beta:
-                                before_len = len(follow[B])
-                                follow[B].update(follow[A])
-                                if len(follow[B]) != before_len:
-                                    changed = True
-                        else:
-                            # Regra 3 (Caso final): A -> alpha B (beta é vazio)
-                            # FOLLOW(B) recebe FOLLOW(A)
-                            before_len = len(follow[B])
-                            follow[B].update(follow[A])
-                            if len(follow[B]) != before_len:
-                                changed = True
-    return follow
+    for A, prods in nonterminals.items():
+        for prod in prods:
+            suffix = EPS # FIRST do sufixo vazio
+            for X in reversed(prod):
+                if X in nonterminals:
+                    # Regra 2: FOLLOW(X) recebe FIRST(beta) - {ε}
+                    follow_bits[X] |= suffix & ~EPS
+                    # Regra 3: Se beta é anulável, FOLLOW(X) recebe FOLLOW(A)
+                    if suffix & EPS and X != A:
+                        edges[A].add(X)
+
+                    f = first_bits[X]
+                    suffix = (f & ~EPS) | suffix if f & EPS else f
+                elif X == EPSILON:
+                    suffix = EPS
+                else:
+                    suffix = symbol_bits.bits[X]
+
+    # Propagação FOLLOW(A) -> FOLLOW(B): origens antes dos destinos
+    for component in reversed(strongly_connected(nonterminals, edges)):
+        value = 0
+        for A in component:
+            value |= follow_bits[A]
+        for A in component:
+            follow_bits[A] = value
+            for B in edges[A]:
+                follow_bits[B] |= value
+
+    return {A: symbol_bits.to_set(value) for A, value in follow_bits.items()}
 
 
 def build_parsing_table(grammar: Grammar,
@@ -437,12 +589,123 @@ def build_parsing_table(grammar: Grammar,
     return table
 
 
-def parsing_table_pandas(grammar:Grammar, first:dict, follow: dict) -> pd.DataFrame:
+def compile_grammar(grammar: Grammar,
+                    parsing_table: Dict[str, Dict[str, List[str]]],
+                    follow: Dict[str, Set[str]]) -> CompiledGrammar:
+    """
+    Compila a gramática e a tabela de parsing para IDs inteiros, usados pelo laço do Parser.
+    """
+    nonterminals = list(grammar.productions)
+
+    # Terminais na ordem em que aparecem nas produções (EOF e o terminal reservado por último)
+    terminals: List[str] = []
+    for prods in grammar.productions.values():
+        for prod in prods:
+            for X in prod:
+                if X != EPSILON and X not in grammar.productions and X not in terminals:
+                    terminals.append(X)
+    if "EOF" not in terminals:
+        terminals.append("EOF")
+    terminals.append("?")
+
+    symbols = terminals + nonterminals
+    symbol_ids = {name: i for i, name in enumerate(symbols)}
+    n_terminals = len(terminals)
+    eof = symbol_ids["EOF"]
+
+    # Produções numeradas, com o lado direito invertido e já convertido
+    productions = [(A, prod) for A, prods in grammar.productions.items() for prod in prods]
+    prod_ids = {id(prod): i for i, (_, prod) in enumerate(productions)}
+    prod_lhs = array('i', (symbol_ids[A] for A, _ in productions))
+    prod_push = [array('i', (symbol_ids[X] for X in reversed(prod) if X != EPSILON))
+                 for _, prod in productions]
+
+    # Os terminais extras de sincronização valem para não-terminais dentro de comandos.
+    # Ficam de fora os anuláveis, que já retomam no FOLLOW pela produção vazia (ex: um ';'
+    # solto em Comandos é só descartado), e os de nível superior (FOLLOW com EOF), que
+    # descartam tokens até a próxima função em vez de desistir do resto do arquivo
+    nullable: Set[str] = set()
+    changed = True
+    while changed:
+        changed = False
+        for A, prods in grammar.productions.items():
+            if A not in nullable and any(all(X == EPSILON or X in nullable for X in prod)
+                                         for prod in prods):
+                nullable.add(A)
+                changed = True
+    extra = set(grammar.sync_terminals)
+
+    # Tabela M[A, a] plana e tabelas de sincronização e de retomada do modo pânico
+    table = array('i', [-1]) * (len(nonterminals) * n_terminals)
+    sync = bytearray(len(nonterminals) * n_terminals)
+    resume = bytearray(len(nonterminals) * n_terminals)
+
+    for row, A in enumerate(nonterminals):
+        base = row * n_terminals
+        for terminal, prod in parsing_table[A].items():
+            table[base + symbol_ids[terminal]] = prod_ids[id(prod)]
+
+        # O token sincroniza A se está no FOLLOW(A) (ou nos terminais extras) ou se é o EOF
+        follow_set = follow.get(A, set())
+        if A not in nullable and "EOF" not in follow_set:
+            follow_set = follow_set | extra
+        for t, terminal in enumerate(terminals):
+            if terminal in follow_set or t == eof:
+                sync[base + t] = 1
+            # O descarte de tokens para no primeiro que expande ou sincroniza A
+            resume[base + t] = sync[base + t] or table[base + t] >= 0
+
+    # Expansões encadeadas: enquanto o topo for não-terminal, o mesmo terminal decide a próxima
+    # produção. O encadeamento para em terminal, em célula vazia (erro) ou ao esvaziar o segmento.
+    chains = []
+    shared: Dict[tuple, array] = {} # Encadeamentos iguais compartilham o mesmo array
+    for cell in range(len(table)):
+        if table[cell] < 0:
+            chains.append(shared.setdefault((), array('i')))
+            continue
+
+        t = cell % n_terminals
+        segment = array('i', [n_terminals + cell // n_terminals])
+        for _ in range(len(productions)): # Limite contra ciclos na gramática
+            if not segment or segment[-1] < n_terminals:
+                break
+            index = table[(segment[-1] - n_terminals) * n_terminals + t]
+            if index < 0:
+                break
+            segment.pop()
+            segment.extend(prod_push[index])
+        chains.append(shared.setdefault(tuple(segment), segment))
+
+    return CompiledGrammar(
+        symbols=symbols,
+        symbol_ids=symbol_ids,
+        n_terminals=n_terminals,
+        start=symbol_ids[grammar.start_symbol],
+        eof=eof,
+        unknown=symbol_ids["?"],
+        is_terminal=bytes(1 if i < n_terminals else 0 for i in range(len(symbols))),
+        productions=productions,
+        prod_lhs=prod_lhs,
+        prod_push=prod_push,
+        table=table,
+        chains=chains,
+        sync=bytes(sync),
+        resume=bytes(resume),
+    )
+
+
+def parsing_table_pandas(grammar:Grammar, first:dict, follow: dict,
+                         parsing_table: dict = None) -> "pd.DataFrame":
     """
     Executa os algoritmos LL(1) e exibe a tabela resultante usando Pandas.
+    Uma tabela já construída (ex: Parser.parsing_table) pode ser passada para evitar o recálculo.
+    O Pandas só é importado aqui, para não pesar na importação do lexer e do parser.
     """
+    import pandas as pd
+
     # 1. Executar a lógica do parser
-    parsing_table = build_parsing_table(grammar, first, follow)
+    if parsing_table is None:
+        parsing_table = build_parsing_table(grammar, first, follow)
 
     # 2. Preparar dados para o Pandas
     # Linhas: Todos os Não-Terminais
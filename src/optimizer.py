@@ -0,0 +1,248 @@
+"""
+Otimização da AST antes da compilação para bytecode:
+
+- dobra de constantes: expressões aritméticas, lógicas e relacionais cujos operandos
+  são literais viram um único literal, com a mesma semântica da VM;
+- eliminação de código morto: ramos de se/senaose/senao com condição constante,
+  laços que nunca executam, comandos depois de 'retorna' e funções nunca chamadas.
+"""
+import operator
+from typing import Dict, List, Optional, Set, Tuple
+from .models import OptimizationReport
+from .syntax_tree import (Node, Program, Function, Declaration, Assign, If, While, For, Return,
+                          Call, Builtin, BinOp, UnaryOp, Literal)
+from .vm import format_value
+
+
+# Tipo do valor -> kind do literal resultante
+LITERAL_KINDS = {bool: "BOOL", int: "INTEGER", float: "FLOAT", str: "STRING"}
+
+# Limites para não materializar constantes enormes na compilação ("a" * 10^9, 9 ^ 10^6)
+MAX_FOLDED_BITS = 4096
+MAX_FOLDED_TEXT = 4096
+
+_OPERATORS = {
+    '-': operator.sub, '*': operator.mul, '%': operator.mod,
+    '<': operator.lt, '>': operator.gt, '<=': operator.le, '>=': operator.ge,
+    '==': operator.eq, '!=': operator.ne,
+}
+
+
+def fold_binary(op: str, a, b):
+    """
+    Avalia `a op b` com a semântica da VM. Levanta ArithmeticError/TypeError/ValueError
+    quando a operação falharia (o erro fica para a execução).
+    """
+    if op == '+':
+        try:
+            return a + b
+        except TypeError:
+            if type(a) is str or type(b) is str:
+                return format_value(a) + format_value(b)
+            raise
+    if op == '/':
+        return a // b if type(a) is int and type(b) is int else a / b
+    if op == '^':
+        if type(a) is int and type(b) is int and b > 0 and a.bit_length() * b > MAX_FOLDED_BITS:
+            raise OverflowError("constant too large to fold")
+        return a ** b
+    if op == '*' and (type(a) is str or type(b) is str):
+        count = b if type(a) is str else a
+        if type(count) is int and count * len(a if type(a) is str else b) > MAX_FOLDED_TEXT:
+            raise OverflowError("constant too large to fold")
+    return _OPERATORS[op](a, b)
+
+
+def count_nodes(node) -> int:
+    """Número de nós da (sub)árvore, incluindo listas de comandos e argumentos."""
+    if isinstance(node, list):
+        return sum(count_nodes(item) for item in node)
+    if not isinstance(node, Node):
+        return 0
+    return 1 + sum(count_nodes(getattr(node, name)) for name in node.__slots__)
+
+
+def _constant(node: Node) -> bool:
+    return type(node) is Literal
+
+
+def _declares(statements: List[Node]) -> bool:
+    return any(type(statement) is Declaration for statement in statements)
+
+
+def _terminates(statements: List[Node]) -> bool:
+    """O bloco sempre termina em 'retorna' (diretamente ou nos dois ramos de um se)."""
+    if not statements:
+        return False
+    last = statements[-1]
+    if type(last) is Return:
+        return True
+    if type(last) is If:
+        return _terminates(last.body) and _terminates(last.orelse)
+    return False
+
+
+class Optimizer:
+    """Percorre a AST e produz uma nova árvore otimizada (a original não é alterada)."""
+
+    def __init__(self):
+        self.folded = 0
+        self.branches_pruned = 0
+        self.unreachable = 0
+
+    # --- Expressões ---
+
+    def expression(self, node: Node) -> Node:
+        kind = type(node)
+
+        if kind is BinOp:
+            left = self.expression(node.left)
+            right = self.expression(node.right)
+
+            if node.op == 'e' or node.op == 'ou':
+                # Curto-circuito: o valor é o do operando que decide ('verdadeiro e x' -> x)
+                if _constant(left):
+                    self.folded += 1
+                    decided = bool(left.value) != (node.op == 'e')
+                    return left if decided else right
+                return BinOp(node.op, left, right)
+
+            if _constant(left) and _constant(right):
+                folded = self.literal(lambda: fold_binary(node.op, left.value, right.value))
+                if folded is not None:
+                    return folded
+            return BinOp(node.op, left, right)
+
+        if kind is UnaryOp:
+            operand = self.expression(node.operand)
+            if _constant(operand):
+                value = operand.value
+                folded = self.literal(lambda: -value if node.op == '-' else not value)
+                if folded is not None:
+                    return folded
+            return UnaryOp(node.op, operand)
+
+        if kind is Call:
+            return Call(node.name, [self.expression(arg) for arg in node.args])
+
+        if kind is Builtin:
+            return Builtin(node.name, [self.expression(arg) for arg in node.args])
+
+        return node
+
+    def literal(self, evaluate) -> Optional[Literal]:
+        """Literal com o resultado de `evaluate`, ou None se a operação falharia."""
+        try:
+            value = evaluate()
+        except (ArithmeticError, TypeError, ValueError):
+            return None
+        kind = LITERAL_KINDS.get(type(value))
+        if kind is None:
+            return None
+        self.folded += 1
+        return Literal(kind, value)
+
+    # --- Comandos ---
+
+    def block(self, statements: List[Node]) -> List[Node]:
+        optimized: List[Node] = []
+        for index, statement in enumerate(statements):
+            optimized.extend(self.statement(statement))
+            if _terminates(optimized):
+                self.unreachable += len(statements) - index - 1
+                break
+        return optimized
+
+    def statement(self, node: Node) -> List[Node]:
+        """Comandos que substituem `node` (vazio se ele nunca executa)."""
+        kind = type(node)
+
+        if kind is Declaration:
+            value = self.expression(node.value) if node.value is not None else None
+            return [Declaration(node.dtype, node.name, value)]
+
+        if kind is Assign:
+            return [Assign(node.name, self.expression(node.value))]
+
+        if kind is If:
+            cond = self.expression(node.cond)
+            if _constant(cond):
+                self.branches_pruned += 1
+                chosen = self.block(node.body if cond.value else node.orelse)
+                # O ramo escolhido só é incorporado ao bloco de fora se não declarar
+                # variáveis; senão mantém seu escopo em um se sempre verdadeiro
+                if _declares(chosen):
+                    return [If(Literal("BOOL", True), chosen, [])]
+                return chosen
+            return [If(cond, self.block(node.body), self.block(node.orelse))]
+
+        if kind is While:
+            cond = self.expression(node.cond)
+            if _constant(cond) and not cond.value:
+                self.branches_pruned += 1
+                return []
+            return [While(cond, self.block(node.body))]
+
+        if kind is For:
+            init = self.statement(node.init)
+            cond = self.expression(node.cond)
+            if _constant(cond) and not cond.value:
+                self.branches_pruned += 1
+                return init
+            return [For(init[0], cond, self.statement(node.step)[0], self.block(node.body))]
+
+        if kind is Return:
+            return [Return(self.expression(node.value))]
+
+        return [self.expression(node)]
+
+    # --- Programa ---
+
+    def program(self, program: Program) -> Tuple[Program, int]:
+        body = self.block(program.body)
+        functions = [Function(f.return_type, f.name, f.params, self.block(f.body))
+                     for f in program.functions]
+
+        # Funções alcançáveis a partir do bloco principal (depois da poda dos ramos mortos)
+        by_name: Dict[str, Function] = {f.name: f for f in functions}
+        reachable: Set[str] = set()
+        pending = list(_called(body))
+        while pending:
+            name = pending.pop()
+            if name in reachable or name not in by_name:
+                continue
+            reachable.add(name)
+            pending.extend(_called(by_name[name].body))
+
+        kept = [f for f in functions if f.name in reachable]
+        return Program(body, kept), len(functions) - len(kept)
+
+
+def _called(node) -> Set[str]:
+    """Nomes das funções chamadas em uma (sub)árvore."""
+    names: Set[str] = set()
+    pending = [node]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, list):
+            pending.extend(item)
+        elif isinstance(item, Node):
+            if type(item) is Call:
+                names.add(item.name)
+            pending.extend(getattr(item, name) for name in item.__slots__)
+    return names
+
+
+def optimize(program: Program) -> Tuple[Program, OptimizationReport]:
+    """Dobra constantes e elimina código morto. Retorna a nova árvore e o relatório."""
+    optimizer = Optimizer()
+    optimized, functions_removed = optimizer.program(program)
+    report = OptimizationReport(
+        nodes_before=count_nodes(program),
+        nodes_after=count_nodes(optimized),
+        folded=optimizer.folded,
+        branches_pruned=optimizer.branches_pruned,
+        unreachable=optimizer.unreachable,
+        functions_removed=functions_removed,
+    )
+    return optimized, report
@@ -0,0 +1,96 @@
+"""
+Análise sintática paralela de um único arquivo: os tokens são divididos nos pontos de
+reinício fora de blocos (o 'principal' e cada 'funcao', ver incremental.split_units) e os
+trechos são analisados em processos separados. Os resultados voltam na ordem do texto.
+
+    tokens = RegexTokenizer(caminho, lexeme).tokenize_compact()
+    units = parse_parallel(tokens, workers=8)
+    errors = unit_errors(units, LineIndex(tokens.source))
+    ast = assemble_program(units)
+
+Como na análise incremental, em programas sem erros a AST é idêntica à da análise
+completa; com erros, a recuperação do modo pânico recomeça em cada trecho.
+
+Devolver as ASTs ao processo principal custa uma serialização (pickle) proporcional ao
+tamanho da árvore; com build_ast=False só os erros voltam, e o ganho acompanha os núcleos.
+"""
+import os
+from multiprocessing import Pool
+from typing import List, Optional, Tuple
+from .cache import GrammarTables, load_grammar_tables
+from .incremental import parse_unit, restart_codes, split_units
+from .models import Grammar, SourceUnit
+from .models_utils import build_lukera_grammar
+from .token_buffer import TokenBuffer
+
+
+# Trecho a analisar: (primeiro token, fim, início no texto, fim no texto, é o principal)
+UnitSpan = Tuple[int, int, int, int, bool]
+
+# Estado de cada processo do pool (preenchido por init_worker)
+_buffer: Optional[TokenBuffer] = None
+_grammar: Optional[Grammar] = None
+_tables: Optional[GrammarTables] = None
+_build_ast = True
+
+
+def init_worker(buffer: TokenBuffer, build_ast: bool = True) -> None:
+    """Prepara o processo: tokens do arquivo (recebidos uma vez), gramática e tabelas."""
+    global _buffer, _grammar, _tables, _build_ast
+    _buffer = buffer
+    _grammar = build_lukera_grammar()
+    _tables = load_grammar_tables(_grammar)
+    _build_ast = build_ast
+
+
+def parse_spans(spans: List[UnitSpan]) -> List[SourceUnit]:
+    """Analisa um lote de trechos consecutivos no processo atual."""
+    return [parse_unit(_buffer, i, j, start, end, is_main, _grammar, _tables, _build_ast)
+            for i, j, start, end, is_main in spans]
+
+
+def unit_spans(tokens: TokenBuffer, tables: GrammarTables) -> List[UnitSpan]:
+    """Trechos de nível superior do arquivo, na ordem do texto."""
+    codes = tokens.type_codes
+    bounds = split_units(tokens.types, codes['LBRACE'], codes['RBRACE'],
+                         restart_codes(tables, tokens.type_names))
+    return [(i, j, tokens.starts[i] if k else 0, tokens.ends[j - 1], k == 0)
+            for k, (i, j) in enumerate(bounds)]
+
+
+def batches(spans: List[UnitSpan], count: int) -> List[List[UnitSpan]]:
+    """Agrupa trechos consecutivos em até `count` lotes com quantidades parecidas de tokens."""
+    total = sum(j - i for i, j, _, _, _ in spans)
+    target = max(1, -(-total // count))
+    groups: List[List[UnitSpan]] = [[]]
+    size = 0
+    for span in spans:
+        if size >= target:
+            groups.append([])
+            size = 0
+        groups[-1].append(span)
+        size += span[1] - span[0]
+    return [group for group in groups if group]
+
+
+def parse_parallel(tokens: TokenBuffer, workers: Optional[int] = None,
+                   build_ast: bool = True, batches_per_worker: int = 4) -> List[SourceUnit]:
+    """
+    Analisa o principal e cada função em `workers` processos (um por núcleo por padrão).
+    Cada processo recebe o TokenBuffer uma única vez; as tarefas são só intervalos de
+    tokens, agrupados em lotes para amortizar a comunicação. Com workers=1 (ou um único
+    trecho), roda no próprio processo.
+    """
+    grammar = build_lukera_grammar()
+    tables = load_grammar_tables(grammar)
+    spans = unit_spans(tokens, tables)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(spans) <= 1:
+        return [parse_unit(tokens, i, j, start, end, is_main, grammar, tables, build_ast)
+                for i, j, start, end, is_main in spans]
+
+    groups = batches(spans, workers * batches_per_worker)
+    with Pool(workers, initializer=init_worker, initargs=(tokens, build_ast)) as pool:
+        results = pool.map(parse_spans, groups, chunksize=1)
+    return [unit for group in results for unit in group]
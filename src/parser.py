@@ -1,147 +1,436 @@
-import pandas as pd
-from typing import List, Dict, Set
+from array import array
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Set, Tuple
 from .models import Token, Grammar
-from .models_utils import  compute_first, compute_follow, build_parsing_table, EPSILON
+from .models_utils import EPSILON
+from .cache import GrammarTables, build_grammar_tables, load_grammar_tables
+from .instrumentation import Instrumentation
+from .line_index import LineIndex
+from .syntax_tree import LUKERA_REDUCERS, Node, TreeBuilder
+from .token_buffer import TokenBuffer
+from .trace_export import TraceWriter
+from .trace import (ParseTrace, TRACE_FULL, TRACE_OFF, TRACE_SUMMARY,
+                    ACT_MATCH, ACT_EXPAND, ACT_EXPECTED, ACT_SYNC, ACT_DISCARD)
 
 
 class Parser:
-    def __init__(self, tokens: Token, grammar_set: Grammar):
-        # 1. Tokens da análise léxica
+    def __init__(self, tokens: Iterable[Token], grammar_set: Grammar,
+                 trace_level: str = TRACE_FULL, trace_size: int = 1000,
+                 max_stall: int = 10000, use_cache: bool = True,
+                 tables: Optional[GrammarTables] = None,
+                 build_ast: bool = False,
+                 reducers: Optional[Dict[str, List[Optional[Callable]]]] = None,
+                 start_symbol: Optional[str] = None,
+                 instrumentation: Optional[Instrumentation] = None,
+                 max_errors: Optional[int] = 100, recovery: int = 3,
+                 trace_writer: Optional[TraceWriter] = None,
+                 lines: Optional[LineIndex] = None, locate_errors: bool = True):
+        # 1. Tokens da análise léxica (lista, iterador ou TokenBuffer)
         self.tokens = tokens
         
         # 2. Preparação da Gramática
         self.grammar = grammar_set
-        self.start_symbol = grammar_set.start_symbol
+        # Outro não-terminal como ponto de partida analisa só um trecho (ex: uma Funcao)
+        self.start_symbol = start_symbol or grammar_set.start_symbol
         
-        # 3. Construção das Tabelas
-        self.first = compute_first(grammar_set)
-        self.follow = compute_follow(grammar_set, self.first)
-        self.parsing_table = build_parsing_table(grammar_set, self.first, self.follow)
+        # 3. Construção das Tabelas (FIRST, FOLLOW, tabela de parsing e gramática compilada
+        # para inteiros), reaproveitadas do cache quando a gramática não mudou.
+        # Tabelas já carregadas (ex: uma vez por processo no modo batch) podem ser passadas direto.
+        self.instrumentation = instrumentation
+        if tables is None and use_cache:
+            tables = load_grammar_tables(grammar_set, instrumentation=instrumentation)
+        elif tables is None:
+            tables = build_grammar_tables(grammar_set, instrumentation)
+        self.first, self.follow, self.parsing_table, self.compiled = tables
+        self.productions = self.compiled.productions
+        if self.start_symbol not in self.compiled.symbol_ids:
+            raise ValueError(f"Unknown start symbol '{self.start_symbol}'.")
+        self.start = self.compiled.symbol_ids[self.start_symbol]
         
-        # 4. Dados para o Relatório Visual
-        self.trace_data = [] 
+        # 4. Dados para o Relatório Visual (off / summary / ring / full / stream)
+        # Com instrumentação, os contadores do parser vêm do trace resumido
+        if instrumentation is not None and trace_level == TRACE_OFF:
+            trace_level = TRACE_SUMMARY
+        self.trace = ParseTrace(trace_level, trace_size, trace_writer)
+        if trace_writer is not None:
+            trace_writer.start(self.productions, self.compiled.symbols, self.start_symbol)
+        self.errors: List[str] = []
+
+        # Linha:coluna no final das mensagens de erro, a partir da posição do token atual.
+        # Sem `lines`, um TokenBuffer usa o próprio texto fonte (o índice só é montado no
+        # primeiro erro); para listas e streams de Token, passe o Tokenizer.lines.
+        # Com locate_errors=False, as posições ficam apenas em error_offsets (ex: trechos
+        # da análise incremental, que mudam de linha a cada edição).
+        if lines is None and isinstance(tokens, TokenBuffer):
+            lines = tokens.line_index()
+        self.lines = lines if locate_errors else None
+        self.error_offsets: List[Optional[int]] = []
+
+        # Modo pânico: depois de um erro, os erros seguintes só são reportados após
+        # `recovery` tokens casados (os demais costumam ser cascata do primeiro).
+        # Com `max_errors` erros reportados a análise para (None = sem limite).
+        self.max_errors = max_errors
+        self.recovery = recovery
+        self.suppressed_errors = 0
+
+        # Limite de passos consecutivos sem progresso (proteção contra loop infinito)
+        self.max_stall = max_stall
+
+        # 5. Árvore sintática construída durante o parse (ações de redução por produção),
+        # apenas com build_ast=True: as reduções custam cerca de 3x o parse sem a árvore.
+        # Sem `reducers`, usa as da Lukera quando cobrem a gramática.
+        self.ast: Optional[Node] = None
+        self.tree_builder: Optional[TreeBuilder] = None
+        if build_ast:
+            self.tree_builder = TreeBuilder.for_grammar(
+                self.compiled, reducers if reducers is not None else LUKERA_REDUCERS)
+            if self.tree_builder is None and reducers is not None:
+                raise ValueError("The reduce actions do not cover every nonterminal of the grammar.")
+
+    @property
+    def trace_data(self) -> List[Dict[str, str]]:
+        """Linhas da tabela visual, reconstruídas a partir do trace compacto."""
+        return self.trace.rows(self.productions, self.compiled.symbols)
+
+    def token_kinds(self) -> Tuple[Iterator[int], Callable[[int], str], Callable[[int], object],
+                                   Callable[[int], Optional[int]]]:
+        """
+        Converte a entrada em um iterador de IDs de terminais, uma função que retorna
+        o valor textual do token atual (ou '$' após o fim da entrada), outra que retorna
+        o valor original do token atual (usado na AST) e outra com a sua posição no texto
+        (None se desconhecida; usada só nas mensagens de erro).
+        Um TokenBuffer é lido direto do array de tipos, sem criar objetos Token.
+        """
+        g = self.compiled
+        terminal_ids = {name: i for i, name in enumerate(g.symbols[:g.n_terminals])}
+
+        if isinstance(self.tokens, TokenBuffer):
+            buffer = self.tokens
+            translate = array('i', (terminal_ids.get(name, g.unknown) for name in buffer.type_names))
+
+            def value_at(cursor: int) -> str:
+                return str(buffer.get_value(cursor)) if cursor < len(buffer) else "$"
+
+            starts = buffer.starts
+
+            def position_at(cursor: int) -> Optional[int]:
+                return starts[cursor] if cursor < len(starts) else None
+
+            return map(translate.__getitem__, buffer.types), value_at, buffer.get_value, position_at
+
+        current = [None]
+
+        def kinds() -> Iterator[int]:
+            for token in self.tokens:
+                current[0] = token
+                yield terminal_ids.get(token.type, g.unknown)
+            current[0] = None
+
+        def value_at(cursor: int) -> str:
+            return str(current[0].value) if current[0] is not None else "$"
+
+        def raw_at(cursor: int):
+            return current[0].value
+
+        def position_at(cursor: int) -> Optional[int]:
+            return current[0].start if current[0] is not None else None
+
+        return kinds(), value_at, raw_at, position_at
 
     def parse(self):
         """
         Executa o algoritmo LL(1) com pilha e recuperação de erro (Modo Pânico).
+
+        Os tokens podem vir de uma lista ou de qualquer iterador/gerador: o parser
+        mantém apenas o token atual (lookahead de 1), sem materializar a entrada.
+        O laço trabalha só com inteiros: símbolos, pilha (array) e tabela densa.
+
+        Com o TreeBuilder, a AST é montada no mesmo laço: cada símbolo desempilhado gera
+        um valor (token casado, valor reduzido ou None quando descartado pelo modo pânico)
+        e as ações de redução rodam quando a pilha volta à altura marcada na expansão.
         """
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            instrumentation.begin("parse")
+
+        g = self.compiled
+        n_terminals = g.n_terminals
+        eof = g.eof
+        table = g.table
+        chains = g.chains
+        sync = g.sync
+        resume = g.resume
+        prod_push = g.prod_push
+        symbols = g.symbols
+
         # --- Inicialização ---
         # Pilha começa com [EOF, SimboloInicial]
-        stack = ["EOF", self.start_symbol]
+        stack = array('i', [eof, self.start])
         
-        # Cursor para ler os tokens
+        # Cursor (índice do token atual) e lookahead sobre a stream de tokens
         cursor = 0
+        kinds, value_at, raw_at, position_at = self.token_kinds()
+
+        # Construção da AST: pilha de valores e marcas (altura, produção) pendentes
+        builder = self.tree_builder
+        build = builder is not None
+        values: list = []
+        heights: List[int] = []
+        marks: List[int] = []
+        if build:
+            actions = builder.actions
+            arity = builder.arity
+            offsets = builder.offsets
+            marked = builder.marked
+            eps_value = builder.eps_value
+            yields = builder.yields
+            chain_ops = builder._chain_ops
+
+        def reduce_top():
+            # Os símbolos da ação marcada foram consumidos: aplica a ação aos seus valores
+            heights.pop()
+            p = marks.pop()
+            k = arity[p]
+            args = values[-k:]
+            del values[-k:]
+            values.append(actions[p](*args))
+
+        # Registro de passos (None quando o trace está desligado)
+        trace = self.trace
+        record = trace.record if trace.enabled else None
+        keep_values = trace.keeps_tokens
+
+        # Stream terminou sem EOF (ex: erro léxico): EOF virtual
+        tok = next(kinds, -1)
+        if tok < 0:
+            tok = eof
+        elif keep_values:
+            trace.push_token(value_at(cursor))
         
-        # String para mostrar o que já foi "casado" (Matched)
-        matched_str = ""
-        
-        # Variável para controle de loop infinito em erros
-        max_steps = 10000 
-        step = 0
+        # Erros em cascata: tokens que ainda precisam casar antes de reportar um novo erro
+        errors = self.errors
+        error_offsets = self.error_offsets
+        lines = self.lines
+        max_errors = self.max_errors
+        recovery = self.recovery
+        quiet = 0
 
-        print(f" Starting analysis of {len(self.tokens)} tokens...")
+        def report(message: str, offset: Optional[int]) -> bool:
+            """
+            Registra um erro na posição `offset` do texto (ou o suprime, se em cascata);
+            True ao atingir o limite.
+            """
+            nonlocal quiet
+            if quiet:
+                self.suppressed_errors += 1
+            else:
+                errors.append(lines.annotate(message, offset) if lines is not None else message)
+                error_offsets.append(offset)
+            quiet = recovery
+            if max_errors is not None and len(errors) >= max_errors:
+                errors.append(f"FATAL ERROR: Too many errors ({len(errors)}), analysis stopped.")
+                error_offsets.append(None)
+                print(" [FATAL ERROR] Too many errors, analysis stopped.")
+                return True
+            return False
+
+        # Controle de loop infinito: passos seguidos sem progresso
+        # (nenhum token consumido e a pilha sem descer abaixo do seu mínimo)
+        stall = 0
+        low_water = len(stack)
 
-        while len(stack) > 0:
-            step += 1
-            if step > max_steps:
-                print(" [FATAL ERROR] Infinite loop detected in the parser.")
-                break
+        if hasattr(self.tokens, "__len__"):
+            print(f" Starting analysis of {len(self.tokens)} tokens...")
+        else:
+            print(" Starting analysis of token stream...")
 
+        while stack:
             # Topo da pilha (X) e Token atual (a)
             top = stack[-1]
-            
-            if cursor < len(self.tokens):
-                current_token = self.tokens[cursor]
-                token_type = current_token.type
-                token_val = str(current_token.value)
-            else:
-                # Caso passe do EOF (segurança)
-                token_type = "EOF"
-                token_val = "$"
-
-            # Prepara a visualização da 'Entrada' restante
-            input_view = " ".join([str(t.value) for t in self.tokens[cursor:]])
 
             # ====================================================
             # LÓGICA PRINCIPAL LL(1)
             # ====================================================
 
             # CASO 1: Topo é igual ao Token Atual (MATCH)
-            if top == token_type:
-                action = f"MATCH! ({token_val})"
-                self._log_trace(matched_str, stack, input_view, action)
+            if top == tok:
+                if record is not None:
+                    record(cursor, len(stack), ACT_MATCH, top)
                 
-                if top == "EOF":
+                if top == eof:
                     print(" Success! Analysis completed.")
+                    if build:
+                        # O EOF de Programa fecha as produções pendentes; o valor do
+                        # símbolo inicial fica na base (None se foi descartado pelo pânico)
+                        values.append(None)
+                        while heights and heights[-1] == len(stack) - 1:
+                            reduce_top()
+                        self.ast = values[0]
                     break # Fim do parser
                 
                 # Consome pilha e avança entrada
                 stack.pop()
-                matched_str += token_val + " "
+                if build:
+                    values.append(raw_at(cursor))
+                    while heights and heights[-1] == len(stack):
+                        reduce_top()
                 cursor += 1
+                tok = next(kinds, -1)
+                if tok < 0:
+                    tok = eof
+                elif keep_values:
+                    trace.push_token(value_at(cursor))
+                if quiet:
+                    quiet -= 1
+                stall = 0
+                low_water = len(stack)
+                continue
 
             # CASO 2: Topo é Terminal (mas diferente do token) -> ERRO
-            elif top not in self.grammar.productions and top != "EOF":
-                action = f"ERROR: Expected '{top}', but received '{token_val}'"
-                self._log_trace(matched_str, stack, input_view, action)
+            elif top < n_terminals and top != eof:
+                if record is not None:
+                    record(cursor, len(stack), ACT_EXPECTED, top)
+                if report(f"ERROR: Expected '{symbols[top]}', but received '{value_at(cursor)}'",
+                          position_at(cursor)):
+                    break
                 # Pânico simples: Desempilha o terminal esperado que falhou
                 stack.pop() 
+                if build:
+                    values.append(None)
+                    while heights and heights[-1] == len(stack):
+                        reduce_top()
 
-            # CASO 3: Topo é Não-Terminal
+            # CASO 3: Topo é Não-Terminal (ou EOF antes do fim da entrada)
             else:
                 # Busca na Tabela M[Top, Token]
-                production = self.parsing_table.get(top, {}).get(token_type)
+                cell = (top - n_terminals) * n_terminals + tok
+                prod_index = table[cell] if top >= n_terminals else -1
 
-                if production is not None:
+                if prod_index >= 0:
                     # Regra Encontrada!
+                    # Empilha a produção INVERTIDA (vazia se for Epsilon)
                     stack.pop()
-                    
-                    # Converte produção para string (ex: "A -> B C")
-                    prod_str = f"{top} -> {' '.join(production)}"
-                    
-                    # Empilha a produção INVERTIDA (exceto se for Epsilon)
-                    if production != [EPSILON]:
-                        for symbol in reversed(production):
-                            stack.append(symbol)
+                    if record is None:
+                        # Sem trace: aplica de uma vez todas as expansões sobre este token
+                        base = len(stack)
+                        stack.extend(chains[cell])
+                        if build:
+                            ops = chain_ops.get(cell)
+                            if ops is None:
+                                ops = builder.chain_ops(cell)
+                            for height, p in ops:
+                                if height >= 0:
+                                    heights.append(base + height)
+                                    marks.append(p)
+                                elif height == -1:
+                                    values.append(actions[p]())
+                                else:
+                                    reduce_top()
                     else:
-                        prod_str += " (void)"
+                        if build:
+                            if marked[prod_index]:
+                                heights.append(len(stack) + offsets[prod_index])
+                                marks.append(prod_index)
+                            elif eps_value[prod_index]:
+                                values.append(actions[prod_index]())
+                        stack.extend(prod_push[prod_index])
+                        record(cursor, len(stack), ACT_EXPAND, prod_index)
+
+                    if build:
+                        while heights and heights[-1] == len(stack):
+                            reduce_top()
 
-                    self._log_trace(matched_str, stack, input_view, prod_str)
+                # ====================================================
+                # RECUPERAÇÃO DE ERRO (MODO PÂNICO)
+                # ====================================================
+                # Estratégia (tabelas pré-calculadas em CompiledGrammar.sync e .resume):
+                # 1. Se o token atual sincroniza Top (FOLLOW e fins de comando), assume que
+                #    Top acabou (POP).
+                # 2. Caso contrário, o token atual é lixo. Pula, de uma vez, ele e os seguintes
+                #    até um token que expanda ou sincronize Top (SCAN).
+                # O EOF nunca é descartado: não há mais entrada para pular.
+
+                elif top >= n_terminals and sync[cell]:
+                    # Sincronização: Desempilha (finge que completou o não-terminal)
+                    if record is not None:
+                        record(cursor, len(stack), ACT_SYNC, top)
+                    if report(f"ERROR (Panic): Pop {symbols[top]} (Synchronize via Follow)",
+                              position_at(cursor)):
+                        break
+                    stack.pop()
+                    if build:
+                        if yields[top]:
+                            values.append(None)
+                        while heights and heights[-1] == len(stack):
+                            reduce_top()
 
                 else:
-                    # ====================================================
-                    # RECUPERAÇÃO DE ERRO (MODO PÂNICO)
-                    # ====================================================
-                    # Estratégia: 
-                    # 1. Se o token atual está no FOLLOW(Top), assume que Top acabou (POP).
-                    # 2. Caso contrário, o token atual é lixo. Pula ele (SCAN).
-                    
-                    follow_set = self.follow.get(top, set())
-                    
-                    if token_type in follow_set or "EOF" in follow_set:
-                        # Sincronização: Desempilha (finge que completou o não-terminal)
-                        action = f"ERROR (Panic): Pop {top} (Synchronize via Follow)"
-                        self._log_trace(matched_str, stack, input_view, action)
-                        stack.pop()
-                    else:
-                        # Sincronização: Descarta Token (Pula entrada)
-                        action = f"ERROR (Panic): Discard '{token_val}'"
-                        self._log_trace(matched_str, stack, input_view, action)
+                    # Sincronização: Descarta Tokens (Pula entrada)
+                    if record is not None:
+                        record(cursor, len(stack), ACT_DISCARD)
+                    first_value = value_at(cursor)
+                    first_position = position_at(cursor)
+                    row = cell - tok if top >= n_terminals else -1
+                    skipped = 0
+                    while True:
                         cursor += 1
+                        skipped += 1
+                        tok = next(kinds, -1)
+                        if tok < 0:
+                            tok = eof
+                            break
+                        if keep_values:
+                            trace.push_token(value_at(cursor))
+                        if tok == eof or (row >= 0 and resume[row + tok]):
+                            break
+                    more = f" and {skipped - 1} more tokens" if skipped > 1 else ""
+                    if report(f"ERROR (Panic): Discard '{first_value}'{more}", first_position):
+                        break
+                    stall = 0
+                    low_water = len(stack)
+                    continue
 
-    def _log_trace(self, matched, stack, inp, action):
-        """Salva o estado atual para a tabela visual."""
-        stack_str = " ".join(stack) 
-        
-        self.trace_data.append({
-            "Casamento": matched,
-            "Pilha LL(1)": stack_str,
-            "Entrada": inp,
-            "Ação": action
+            # Nenhum token consumido neste passo: só conta como progresso se a pilha desceu
+            if len(stack) < low_water:
+                low_water = len(stack)
+                stall = 0
+            else:
+                stall += 1
+                if stall > self.max_stall:
+                    self.errors.append("FATAL ERROR: Infinite loop detected in the parser.")
+                    self.error_offsets.append(None)
+                    print(" [FATAL ERROR] Infinite loop detected in the parser.")
+                    break
+
+        self.trace.finish(self.start_symbol, [symbols[s] for s in stack])
+
+        if instrumentation is not None:
+            instrumentation.end()
+            self.report_counters(instrumentation)
+
+    def report_counters(self, instrumentation: Instrumentation) -> None:
+        """Contadores do último parse (consultas à tabela = expansões + sincronizações + descartes)."""
+        summary = self.trace.summary()
+        instrumentation.update("parser", {
+            "steps": summary["steps"],
+            "matches": summary["match"],
+            "expansions": summary["expand"],
+            "table_lookups": summary["expand"] + summary["panic_pop"] + summary["panic_discard"],
+            "expected_errors": summary["error_expected"],
+            "panic_pops": summary["panic_pop"],
+            "panic_discards": summary["panic_discard"],
+            "errors": len(self.errors),
+            "suppressed_errors": self.suppressed_errors,
         })
+        instrumentation.maximum("parser.max_stack_depth", summary["max_stack_depth"])
 
     def build_execution_table(self):
-        """Exibe a tabela final usando Pandas."""
+        """
+        Exibe a tabela final usando Pandas (importado apenas aqui).
+        Monta o trace inteiro em memória: para entradas grandes, use o nível 'stream' com
+        um TraceWriter e leia o arquivo em partes com trace_export.trace_frames.
+        """
+        import pandas as pd
+
         df = pd.DataFrame(self.trace_data)
         
         pd.set_option('display.max_rows', None)
@@ -149,4 +438,4 @@ class Parser:
         pd.set_option('display.width', 2000)
         pd.set_option('display.max_colwidth', None)
         
-        return df
\ No newline at end of file
+        return df
@@ -0,0 +1,263 @@
+import re
+from typing import Collection, Dict, Iterator, Optional
+from .models import Lexeme, Token
+from .instrumentation import Instrumentation
+from .lexer import Tokenizer
+from .token_buffer import TokenBuffer, unescape
+
+
+# Índices dos grupos do padrão mestre (ordem de prioridade do Tokenizer manual).
+SYMBOL, WORD, FLOAT, INTEGER, STRING, END, OTHER = range(1, 8)
+
+
+def compile_lexeme(lexemes: Lexeme) -> re.Pattern:
+    """
+    Compila as regras léxicas em um único padrão mestre. Cada casamento pula os espaços
+    e comentários (// ... e /* ... */) e reconhece um token:
+      1. Operadores (dois caracteres primeiro) e delimitadores, gerados do Lexeme
+      2. Palavras: [a-zA-Z_][a-zA-Z_0-9]*
+      3. Números: FLOAT [0-9]+ '.' [0-9]+ ([eE][+-]?[0-9]*)?  |  INT [0-9]+
+      4. Strings com escapes
+      5. Fim do texto
+      6. Qualquer outro caractere, ou um '/*' sem '*/' (tratados pelo Tokenizer manual)
+    As alternativas começam por caracteres distintos, então a ordem (por frequência)
+    não altera o resultado em relação ao Tokenizer manual.
+    """
+    # O Tokenizer manual só reconhece operadores de até dois caracteres e delimitadores de um
+    double = [op for op in lexemes.operators if len(op) == 2]
+    single = [op for op in lexemes.operators if len(op) == 1]
+    single += [d for d in lexemes.delimiters if len(d) == 1 and d not in single]
+    symbols = "|".join(re.escape(s) for s in double + single) or "(?!)"
+
+    # Um '/*' sempre consome o caractere seguinte antes de procurar o '*/'. Sem o '*/', o
+    # '/' não vira símbolo: cai em OTHER e o Tokenizer manual reporta o comentário não fechado.
+    block_comment = r'/\*[\s\S][\s\S]*?\*/'
+
+    pattern = (
+        rf'(?:\s+|//[^\n]*|{block_comment})*'
+        rf'(?:(?!/\*)({symbols})'
+        r'|([A-Za-z_]\w*)'
+        r'|([0-9]+\.[0-9]+(?:[eE][+-]?[0-9]*)?)'
+        r'|([0-9]+)'
+        r'|"((?:[^"\\]|\\[\s\S])*)"'
+        r'|(\Z)'
+        r'|([\s\S]))'
+    )
+    return re.compile(pattern)
+
+
+class RegexTokenizer(Tokenizer):
+    """
+    Tokenizador baseado em um padrão mestre compilado a partir do Lexeme.
+
+    Produz os mesmos tokens e erros do Tokenizer manual: casos raros (caracteres não ASCII
+    no início de um token ou logo após um número, strings não fechadas e caracteres inválidos)
+    são delegados ao algoritmo caractere a caractere da classe base.
+
+    No modo streaming, um casamento que chega ao fim da janela é refeito a partir do início
+    do token (os espaços e comentários antes dele não são relidos); espaços, comentários e
+    strings que cruzam a fronteira entre blocos são lidos pela classe base. Assim o custo
+    continua linear, mas trechos longos assim rodam na velocidade do Tokenizer manual.
+    """
+
+    def __init__(self, file_path: Optional[str], lexemes: Lexeme,
+                 streaming: bool = False, chunk_size: int = 1 << 16,
+                 text: Optional[str] = None,
+                 instrumentation: Optional[Instrumentation] = None):
+        super().__init__(file_path, lexemes, streaming=streaming, chunk_size=chunk_size, text=text,
+                         instrumentation=instrumentation)
+        self.pattern = compile_lexeme(lexemes)
+
+        # Tabela única lexema -> tipo (operadores têm prioridade sobre delimitadores)
+        self.symbol_types: Dict[str, str] = dict(lexemes.delimiters)
+        self.symbol_types.update(lexemes.operators)
+
+    def stream(self) -> Iterator[Token]:
+        """
+        Gera os tokens um a um, sob demanda (o EOF é o último token gerado).
+        Fora do modo streaming, percorre o texto inteiro em um laço único sobre o padrão mestre.
+        """
+        if self.chunks is not None:
+            yield from super().stream()
+            return
+
+        finditer = self.pattern.finditer
+        keywords = self.lexemes.keywords
+        symbol_types = self.symbol_types
+        text = self.text
+        pos = self.position
+
+        try:
+            while True:
+                # O último grupo do padrão casa qualquer caractere, então os casamentos são contíguos
+                for m in finditer(text, pos):
+                    kind = m.lastindex
+
+                    if kind == WORD:
+                        word = m[WORD]
+                        token_type = keywords.get(word, 'ID')
+                        if token_type == 'BOOL':
+                            word = 'verdadeiro' if word == 'verdadeiro' else 'falso'
+                        yield Token(token_type, word, m.start(WORD))
+
+                    elif kind == SYMBOL:
+                        symbol = m[SYMBOL]
+                        yield Token(symbol_types[symbol], symbol, m.start(SYMBOL))
+
+                    elif kind == INTEGER and text[m.end():m.end() + 2].isascii():
+                        yield Token('INTEGER', int(m[INTEGER]), m.start(INTEGER))
+
+                    elif kind == END:
+                        self.position = m.end()
+                        self.current_char = None
+                        yield Token('EOF', None, m.end())
+                        return
+
+                    else:
+                        token = self.read_match(m)
+                        yield token
+                        # A leitura manual pode ter avançado além do casamento: recomeça dali
+                        if self.position != m.end():
+                            pos = self.position
+                            break
+
+        except Exception as e:
+            print(e)
+
+    def build_compact(self) -> TokenBuffer:
+        """
+        Tokeniza o texto inteiro direto para um TokenBuffer, sem criar objetos Token
+        nem converter valores: cada casamento grava apenas o código do tipo e os limites do lexema.
+        """
+        buffer = TokenBuffer.for_lexeme(self.text, self.lexemes)
+        self.scan_into(buffer, self.position)
+        self.tokens = buffer
+        return buffer
+
+    def scan_into(self, buffer: TokenBuffer, pos: int,
+                  stops: Collection[int] = ()) -> Optional[int]:
+        """
+        Tokeniza self.text a partir de `pos` (início de texto ou fim de um token) para o buffer.
+
+        Para logo depois de um token que termina em uma das posições de `stops` e retorna
+        essa posição (usado pela re-tokenização incremental para ressincronizar com os
+        tokens antigos). Retorna None ao chegar ao EOF ou em um erro léxico (exibido).
+        """
+        codes = buffer.type_codes
+        keyword_codes = {word: codes[t] for word, t in self.lexemes.keywords.items()}
+        symbol_codes = {symbol: codes[t] for symbol, t in self.symbol_types.items()}
+        id_code, int_code = codes['ID'], codes['INTEGER']
+        float_code, string_code = codes['FLOAT'], codes['STRING']
+
+        add_type, add_start, add_end = buffer.types.append, buffer.starts.append, buffer.ends.append
+        finditer = self.pattern.finditer
+        text = self.text
+
+        try:
+            while True:
+                for m in finditer(text, pos):
+                    kind = m.lastindex
+                    start, end = m.span(kind)
+
+                    if kind == SYMBOL:
+                        add_type(symbol_codes[m[SYMBOL]])
+                    elif kind == WORD:
+                        add_type(keyword_codes.get(m[WORD], id_code))
+                    elif kind == INTEGER and text[end:end + 2].isascii():
+                        add_type(int_code)
+                    elif kind == FLOAT and text[end:end + 2].isascii() and text[end - 1].isdigit():
+                        add_type(float_code)
+                    elif kind == STRING:
+                        add_type(string_code)
+                        start -= 1 # Inclui as aspas
+                        end += 1
+                    elif kind == END:
+                        buffer.append(codes['EOF'], end, end)
+                        self.position = end
+                        self.current_char = None
+                        return None
+                    else:
+                        # Casos delegados ao Tokenizer manual (e expoentes incompletos, que geram o erro)
+                        token = self.read_match(m)
+                        buffer.append(codes[token.type], start, self.position)
+                        if stops and self.position in stops:
+                            return self.position
+                        if self.position != m.end():
+                            pos = self.position
+                            break
+                        continue
+
+                    add_start(start)
+                    add_end(end)
+                    if stops and end in stops:
+                        self.position = end
+                        return end
+
+        except Exception as e:
+            print(e)
+        return None
+
+    def get_next_token(self) -> Token:
+        """
+        Retorna o próximo token para a stream
+        """
+        while True:
+            m = self.pattern.match(self.text, self.position)
+
+            # Streaming: o token pode continuar no próximo bloco (ou precisar de lookahead)
+            if self.chunks is not None and m.end() + 2 >= len(self.text):
+                kind = m.lastindex
+                if kind == END:
+                    # Espaços ou um comentário de linha até o fim da janela: o algoritmo manual
+                    # os pula lendo os blocos seguintes, sem reprocessar o início da janela
+                    return self.fallback(self.position)
+                # Espaços e comentários antes do token estão completos: só o token é relido
+                self.position = m.start(kind) - (kind == STRING)
+                self.refill()
+                continue
+
+            if m.lastindex == END:
+                self.position = m.end()
+                self.current_char = None
+                return Token(type='EOF', value=None, start=self.base + self.position)
+
+            return self.read_match(m)
+
+    def read_match(self, m: re.Match) -> Token:
+        """Converte um casamento do padrão mestre em token e avança o ponteiro."""
+        kind = m.lastindex
+        end = m.end()
+        self.position = end
+        start = self.base + m.start(kind)
+
+        if kind == WORD:
+            word = m[WORD]
+            token_type = self.lexemes.keywords.get(word, 'ID')
+            if token_type == 'BOOL':
+                return Token(type='BOOL', value=('verdadeiro' if word == 'verdadeiro' else 'falso'),
+                             start=start)
+            return Token(type=token_type, value=word, start=start)
+
+        if kind == SYMBOL:
+            symbol = m[SYMBOL]
+            return Token(type=self.symbol_types[symbol], value=symbol, start=start)
+
+        if kind == INTEGER or kind == FLOAT:
+            # Dígitos Unicode logo após o número mudam a leitura: delega ao Tokenizer manual
+            if not self.text[end:end + 2].isascii():
+                return self.fallback(m.start(kind))
+            if kind == INTEGER:
+                return Token(type='INTEGER', value=int(m[INTEGER]), start=start)
+            return Token(type='FLOAT', value=float(m[FLOAT]), start=start)
+
+        if kind == STRING:
+            return Token(type='STRING', value=unescape(m[STRING]), start=start - 1) # Inclui as aspas
+
+        # OTHER: letras não ASCII, strings e comentários não fechados ou caractere inválido
+        return self.fallback(m.start(kind))
+
+    def fallback(self, pos: int) -> Token:
+        """Lê um único token a partir de `pos` com o algoritmo manual da classe base."""
+        self.position = pos
+        self.current_char = self.text[pos] if pos < len(self.text) else None
+        return super().get_next_token()
@@ -0,0 +1,321 @@
+"""
+Servidor de compilação de longa duração (asyncio): o Lexeme, a gramática e as tabelas são
+preparados uma única vez por processo, e cada pedido custa só a análise em si.
+
+    python -m src.server --socket /tmp/lukera.sock --workers 4
+    python -m src.server --stdio                     # um pedido por linha em stdin/stdout
+
+Protocolo: JSON Lines nos dois sentidos. Cada pedido tem um `id` (devolvido na resposta),
+um `method` e o programa em `text` (ou o caminho em `path`):
+
+    {"id": 1, "method": "parse", "text": "principal { ... }", "ast": true}
+    {"id": 1, "ok": true, "success": false, "tokens": 12, "errors": ["ERROR: ... at 3:7"], ...}
+
+Métodos: "parse" (erros e, com "ast": true, a árvore), "lex" (lista de tokens) e "ping".
+Os pedidos de uma conexão são atendidos em paralelo e as respostas saem na ordem em que
+ficam prontas (use o `id`). A análise roda em um pool de processos; no máximo
+`max_pending` pedidos ficam em andamento ao mesmo tempo (os demais esperam, e a leitura
+da conexão pausa: contrapressão) e cada um tem até `timeout` segundos.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional
+from .cache import GrammarTables, load_grammar_tables
+from .compile_cache import compile_source
+from .models import Grammar, Lexeme
+from .models_utils import build_lukera_lexeme, build_lukera_grammar
+from .regex_lexer import RegexTokenizer
+
+
+METHODS = ("parse", "lex", "ping")
+
+# Tamanho máximo de uma linha (pedido) lida do cliente
+MAX_REQUEST_BYTES = 64 << 20
+
+# Estado de cada processo do pool (preenchido por init_worker)
+_lexeme: Optional[Lexeme] = None
+_grammar: Optional[Grammar] = None
+_tables: Optional[GrammarTables] = None
+
+
+def init_worker() -> None:
+    """Prepara o processo: Lexeme, gramática e tabelas compiladas (do cache em disco)."""
+    global _lexeme, _grammar, _tables
+    _lexeme = build_lukera_lexeme()
+    _grammar = build_lukera_grammar()
+    _tables = load_grammar_tables(_grammar)
+
+
+def request_text(request: Dict[str, object]) -> str:
+    if "text" in request:
+        return str(request["text"])
+    if "path" in request:
+        with open(str(request["path"]), "r", encoding="utf-8") as file:
+            return file.read()
+    raise ValueError("The request needs a 'text' or a 'path'.")
+
+
+def handle_request(request: Dict[str, object]) -> Dict[str, object]:
+    """Atende um pedido "lex" ou "parse" no processo atual (roda no pool)."""
+    if _tables is None:
+        init_worker()
+    started = time.perf_counter()
+    text = request_text(request)
+
+    if request.get("method") == "lex":
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            tokens = RegexTokenizer(None, _lexeme, text=text).tokenize_compact()
+        lexical_error = None
+        if len(tokens) == 0 or tokens.get_type(len(tokens) - 1) != "EOF":
+            lexical_error = output.getvalue().strip() or "Lexical Error"
+        response = {
+            "tokens": [[token.type, token.value, token.start] for token in tokens],
+            "lexical_error": lexical_error,
+        }
+    else:
+        result = compile_source(text, _lexeme, _grammar, _tables, to_bytecode=False)
+        response = {
+            "success": result.lexical_error is None and not result.errors,
+            "tokens": len(result.tokens),
+            "lexical_error": result.lexical_error,
+            "errors": result.errors,
+            "suppressed_errors": result.suppressed_errors,
+        }
+        if request.get("ast"):
+            response["ast"] = result.ast.to_dict() if result.ast is not None else None
+
+    response["elapsed"] = time.perf_counter() - started
+    return response
+
+
+class CompileServer:
+    """Recebe pedidos JSON Lines de várias conexões e os despacha para o pool."""
+
+    def __init__(self, workers: Optional[int] = None, max_pending: int = 64,
+                 timeout: float = 30.0):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.executor: Optional[Executor] = None
+        self.pending: Optional[asyncio.Semaphore] = None
+
+        self.requests = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.connections = 0
+
+    def start(self) -> None:
+        """
+        Cria o pool e prepara as tabelas no processo principal (os processos do pool as
+        encontram no cache em disco). Com workers=0, as análises rodam em uma thread.
+        """
+        init_worker()
+        if self.workers == 0:
+            self.executor = ThreadPoolExecutor(1)
+        else:
+            self.executor = ProcessPoolExecutor(self.workers, initializer=init_worker)
+        self.pending = asyncio.Semaphore(self.max_pending)
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def dispatch(self, line: bytes) -> Dict[str, object]:
+        """
+        Resposta de um pedido (as falhas viram respostas com ok=false). Libera a vaga do
+        pedido em `pending` (adquirida por serve_connection) quando o trabalho termina de
+        fato: um pedido que estourou o tempo ainda ocupa um processo do pool, e continua
+        contando em `max_pending` até a análise acabar.
+        """
+        self.requests += 1
+        request_id = None
+        job = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("The request must be a JSON object.")
+            request_id = request.get("id")
+            method = request.get("method", "parse")
+            if method not in METHODS:
+                raise ValueError(f"Unknown method '{method}'. Use one of {METHODS}.")
+
+            if method == "ping":
+                response = {}
+            else:
+                timeout = float(request.get("timeout", self.timeout))
+                loop = asyncio.get_running_loop()
+                job = self.executor.submit(handle_request, request)
+                job.add_done_callback(lambda _: self.release_from_pool(loop))
+                # shield: o timeout não cancela o futuro do asyncio (que liberaria a vaga antes)
+                response = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(job)), timeout)
+        except asyncio.TimeoutError:
+            # Ainda na fila, o pedido é cancelado; já em andamento, o processo do pool termina
+            # a análise mesmo assim e só a resposta é descartada
+            job.cancel()
+            self.timeouts += 1
+            self.failures += 1
+            return {"id": request_id, "ok": False, "error": "Request timed out."}
+        except Exception as e:
+            self.failures += 1
+            return {"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        finally:
+            if job is None:
+                self.pending.release()
+
+        return {"id": request_id, "ok": True, **response}
+
+    def release_from_pool(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Libera uma vaga de `pending` a partir da thread que conclui o futuro do pool."""
+        with contextlib.suppress(RuntimeError): # Laço já encerrado (servidor parando)
+            loop.call_soon_threadsafe(self.pending.release)
+
+    async def serve_connection(self, reader: asyncio.StreamReader,
+                               writer: asyncio.StreamWriter) -> None:
+        """Atende uma conexão até o cliente fechá-la."""
+        self.connections += 1
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def answer(line: bytes) -> None:
+            response = await self.dispatch(line)
+            data = json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n"
+            async with write_lock:
+                writer.write(data)
+                await writer.drain()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(b'{"id": null, "ok": false, "error": "Request too large."}\n')
+                    break
+                if not line:
+                    break # Fim da conexão
+                if not line.strip():
+                    continue
+                # Contrapressão: com max_pending pedidos em andamento (em todas as conexões),
+                # a próxima linha só é lida quando um deles termina
+                await self.pending.acquire()
+                task = asyncio.create_task(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            with contextlib.suppress(ConnectionError):
+                writer.close()
+                await writer.wait_closed()
+
+    async def serve_unix(self, path: str) -> None:
+        """Escuta em um socket Unix até receber SIGINT/SIGTERM."""
+        if os.path.exists(path):
+            os.unlink(path)
+        server = await asyncio.start_unix_server(self.serve_connection, path,
+                                                 limit=MAX_REQUEST_BYTES)
+        print(f" Listening on {path} ({self.workers} workers)", flush=True)
+        try:
+            async with server:
+                await stop_signal()
+        finally:
+            with contextlib.suppress(OSError):
+                os.unlink(path)
+
+    async def serve_stdio(self) -> None:
+        """Atende pedidos de stdin e responde em stdout (ex: processo filho de um editor)."""
+        stream = StdioStream()
+        await self.serve_connection(stream, stream)
+
+
+class StdioStream:
+    """
+    stdin/stdout com a interface de leitura e escrita usada por serve_connection.
+    As linhas são lidas em uma thread, então funciona com pipes, terminais e arquivos
+    redirecionados (os transportes de pipe do asyncio não aceitam arquivos comuns).
+    """
+
+    async def readline(self) -> bytes:
+        return await asyncio.get_running_loop().run_in_executor(None, sys.stdin.buffer.readline)
+
+    def write(self, data: bytes) -> None:
+        sys.stdout.buffer.write(data)
+
+    async def drain(self) -> None:
+        sys.stdout.buffer.flush()
+
+    def close(self) -> None:
+        sys.stdout.buffer.flush()
+
+    async def wait_closed(self) -> None:
+        pass
+
+
+async def stop_signal() -> None:
+    """Espera por SIGINT ou SIGTERM."""
+    loop = asyncio.get_running_loop()
+    stopped = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopped.set)
+    await stopped.wait()
+
+
+async def run_server(server: CompileServer, socket_path: Optional[str]) -> None:
+    server.start()
+    try:
+        if socket_path is None:
+            await server.serve_stdio()
+        else:
+            await server.serve_unix(socket_path)
+    finally:
+        server.close()
+
+
+def send_request(socket_path: str, request: Dict[str, object]) -> Dict[str, object]:
+    """Cliente síncrono mínimo: envia um pedido ao servidor e espera a resposta."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        with client.makefile("rb") as stream:
+            return json.loads(stream.readline())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.server",
+        description="Serve Lukera lex/parse requests (JSON Lines) with warm grammar tables.")
+    transport = parser.add_mutually_exclusive_group(required=True)
+    transport.add_argument("--socket", metavar="PATH", help="listen on a Unix socket")
+    transport.add_argument("--stdio", action="store_true",
+                           help="read requests from stdin and write responses to stdout")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="parser processes (default: one per core; 0: a thread in the server)")
+    parser.add_argument("--max-pending", type=int, default=64,
+                        help="requests in progress at once before reading pauses")
+    parser.add_argument("--timeout", type=float, default=30.0,
+                        help="seconds before a request is answered with a timeout error")
+    args = parser.parse_args(argv)
+
+    server = CompileServer(args.workers, args.max_pending, args.timeout)
+    try:
+        asyncio.run(run_server(server, args.socket))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
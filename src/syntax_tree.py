@@ -0,0 +1,380 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from .models import CompiledGrammar
+
+
+# ================================
+# 1. NÓS DA ÁRVORE SINTÁTICA (AST)
+# ================================
+
+class Node:
+    """
+    Base dos nós da AST. Cada classe declara seus campos em __slots__ (sem __dict__
+    por instância), o que mantém pequena a árvore de programas grandes.
+    """
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # Pickle compacto (classe + valores), usado ao devolver ASTs de outros processos
+        return type(self), tuple(getattr(self, name) for name in self.__slots__)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Representação serializável (JSON) do nó e de seus filhos."""
+        data: Dict[str, object] = {"node": type(self).__name__}
+        for name in self.__slots__:
+            data[name] = _to_plain(getattr(self, name))
+        return data
+
+
+def _to_plain(value):
+    if isinstance(value, Node):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(item) for item in value]
+    return value
+
+
+class Program(Node):
+    __slots__ = ("body", "functions")
+
+class Function(Node):
+    __slots__ = ("return_type", "name", "params", "body")
+
+class Param(Node):
+    __slots__ = ("dtype", "name")
+
+class Declaration(Node):
+    __slots__ = ("dtype", "name", "value")
+
+class Assign(Node):
+    __slots__ = ("name", "value")
+
+class If(Node):
+    """`senaose` vira um If aninhado no `orelse` do anterior."""
+    __slots__ = ("cond", "body", "orelse")
+
+class While(Node):
+    __slots__ = ("cond", "body")
+
+class For(Node):
+    __slots__ = ("init", "cond", "step", "body")
+
+class Return(Node):
+    __slots__ = ("value",)
+
+class Call(Node):
+    """Chamada de função do usuário (como comando ou dentro de expressão)."""
+    __slots__ = ("name", "args")
+
+class Builtin(Node):
+    """Chamada de função nativa: escreve, leia, aleatorio, ..."""
+    __slots__ = ("name", "args")
+
+class BinOp(Node):
+    __slots__ = ("op", "left", "right")
+
+class UnaryOp(Node):
+    __slots__ = ("op", "operand")
+
+class Var(Node):
+    __slots__ = ("name",)
+
+class Literal(Node):
+    __slots__ = ("kind", "value")
+
+
+# ================================
+# 2. AÇÕES DE REDUÇÃO DA GRAMÁTICA LUKERA
+# ================================
+# Cada produção recebe os valores dos símbolos do seu lado direito (terminais: valor do
+# token; não-terminais: valor já reduzido; símbolos descartados pelo modo pânico: None).
+# None na lista significa produção sem ação: com um único valor no lado direito, ele é o
+# valor de A; se A for vazio (ε), o valor é None.
+#
+# As caudas de expressão (XLinha -> Op Y XLinha | ε) usam Fold: a ação roda logo após
+# Op Y e combina o operando da esquerda (já na pilha de valores) com Op e Y. A cauda não
+# tem valor próprio, então X -> Y XLinha fica com um único valor e dispensa ação.
+#
+# Listas de repetição (Comandos, ListaFuncao, ...) são reduzidas de dentro para fora,
+# então cada nível faz append no fim e a lista sai invertida; quem a consome a inverte
+# uma única vez (_finish), mantendo a construção linear.
+
+class Fold:
+    """Ação intermediária de cauda: troca (esquerda, op, direita) no topo dos valores pelo nó."""
+    __slots__ = ("action",)
+
+    def __init__(self, action: Callable):
+        self.action = action
+
+
+def _none():
+    return None
+
+def _empty():
+    return []
+
+def _finish(items):
+    """Converte uma lista de repetição (invertida) na ordem do código fonte."""
+    if items is None:
+        return []
+    items.reverse()
+    return items
+
+def _prepend(item, rest):
+    """X Lista -> Lista invertida com X (ignora X descartado pelo modo pânico)."""
+    if rest is None:
+        rest = []
+    if item is not None:
+        rest.append(item)
+    return rest
+
+def _prepend_sep(sep, item, rest):
+    return _prepend(item, rest)
+
+# Associatividade: à esquerda nos níveis com cauda recursiva (a - b - c = (a - b) - c,
+# pois cada Fold roda antes da cauda seguinte); à direita na potência, já que em
+# ExprPowLinha -> POW ExprPow o ExprPow da direita é reduzido antes do Fold.
+_binop = Fold(lambda left, op, right: BinOp(op, left, right))
+
+def _statement_with_id(name, node):
+    """ID seguido de '= expr;' (Assign) ou de '(args);' (Call)."""
+    if node is not None:
+        node.name = name
+    return node
+
+def _primary_id(name, args):
+    return Var(name) if args is None else Call(name, args)
+
+def _if(_if, _lp, cond, _rp, _lb, body, _rb, elifs, orelse):
+    orelse = orelse if orelse is not None else []
+    if elifs is not None:
+        # A lista de senaose está invertida: o último é aninhado primeiro
+        for elif_cond, elif_body in elifs:
+            orelse = [If(elif_cond, elif_body, orelse)]
+    return If(cond, _finish(body), orelse)
+
+def _elif(_elsif, _lp, cond, _rp, _lb, body, _rb, rest):
+    return _prepend((cond, _finish(body)), rest)
+
+def _builtin(name, _lp, args, _rp):
+    return Builtin(name, args if args is not None else [])
+
+def _literal(kind):
+    return lambda value: Literal(kind, value)
+
+
+LUKERA_REDUCERS: Dict[str, List[Optional[Callable]]] = {
+    "Programa": [lambda _main, _lb, body, _rb, functions, _eof: Program(body, _finish(functions))],
+    "ListaFuncao": [_prepend, _empty],
+    "Bloco": [_finish],
+    "Comandos": [_prepend, _empty],
+    "Comando": [None, None, None, None, None, None],
+
+    "Declaracao": [lambda dtype, name, value, _semi: Declaration(dtype, name, value)],
+    "DeclInit": [lambda _eq, value: value, _none],
+    "Atribuicao": [lambda name, _eq, value: Assign(name, value)],
+    "ComandoInicioID": [_statement_with_id],
+    "ComandoInicioIDSufixo": [
+        lambda _eq, value, _semi: Assign(None, value),
+        lambda _lp, args, _rp, _semi: Call(None, args if args is not None else []),
+    ],
+    "ComandoBuiltinChamada": [lambda call, _semi: call],
+
+    "Funcao": [lambda _fn, dtype, name, _lp, params, _rp, _lb, body, _rb:
+               Function(dtype, name, params if params is not None else [], body)],
+    "ParametrosOpt": [None, _empty],
+    "Parametros": [lambda param, rest: _finish(_prepend(param, rest))],
+    "ParametrosLinha": [_prepend_sep, _empty],
+    "Parametro": [lambda dtype, name: Param(dtype, name)],
+    "Retorno": [lambda _ret, value, _semi: Return(value)],
+
+    "ArgsOpt": [None, _empty],
+    "Argumentos": [lambda arg, rest: _finish(_prepend(arg, rest))],
+    "ArgumentosLinha": [_prepend_sep, _empty],
+
+    "Condicional": [_if],
+    "ListaElsif": [_elif, _none],
+    "OpcionalElse": [lambda _else, _lb, body, _rb: _finish(body), _none],
+    "Laco": [
+        lambda _while, _lp, cond, _rp, _lb, body, _rb: While(cond, _finish(body)),
+        lambda _for, _lp, init, _s1, cond, _s2, step, _rp, _lb, body, _rb:
+            For(init, cond, step, _finish(body)),
+    ],
+
+    "Expressao": [None],
+    "ExprOr": [None],
+    "ExprOrLinha": [_binop, None],
+    "ExprAnd": [None],
+    "ExprAndLinha": [_binop, None],
+    "ExprRel": [None],
+    "ExprRelLinha": [_binop, None],
+    "OpRel": [None, None, None, None, None, None],
+    "ExprAdd": [None],
+    "ExprAddLinha": [_binop, None],
+    "OpAdd": [None, None],
+    "ExprMul": [None],
+    "ExprMulLinha": [_binop, None],
+    "OpMul": [None, None, None],
+    "ExprPow": [None],
+    "ExprPowLinha": [_binop, None],
+    "ExprUnary": [
+        lambda op, operand: UnaryOp(op, operand),
+        lambda op, operand: UnaryOp(op, operand),
+        None,
+    ],
+    "Primario": [lambda _lp, expr, _rp: expr, None, _primary_id, None],
+    "PrimarioIdSufixo": [lambda _lp, args, _rp: args if args is not None else [], _none],
+    "BuiltinCallExpr": [
+        _builtin,
+        lambda name, _lp, _rp: Builtin(name, []),
+        _builtin, _builtin, _builtin, _builtin,
+    ],
+    "Literal": [
+        _literal("INTEGER"),
+        _literal("FLOAT"),
+        lambda value: Literal("BOOL", value == "verdadeiro"),
+        _literal("STRING"),
+    ],
+}
+
+
+# ================================
+# 3. PLANO DE CONSTRUÇÃO SOBRE A GRAMÁTICA COMPILADA
+# ================================
+
+class TreeBuilder:
+    """
+    Liga as ações de redução às produções numeradas de uma CompiledGrammar.
+
+    Durante o parse, cada produção com ação deixa uma marca (altura da pilha, produção):
+    quando a pilha volta a essa altura, os símbolos da ação foram consumidos e ela é
+    aplicada aos valores do topo da pilha de valores. Assim a pilha LL(1) (e o trace)
+    não muda. Produções vazias são reduzidas na hora; produções sem ação com um único
+    valor não deixam marca.
+
+    `chain_ops[cell]` repete o mesmo plano para as expansões encadeadas de `chains[cell]`:
+    (h, p) com h >= 0 cria a marca da produção p na altura base + h, (-1, p) reduz a
+    produção vazia p e (-2, 0) reduz a marca do topo.
+    """
+
+    def __init__(self, compiled: CompiledGrammar, reducers: Dict[str, List[Optional[Callable]]]):
+        self.compiled = compiled
+        self.reducers = reducers
+        n_productions = len(compiled.productions)
+
+        # Ação de cada produção, na ordem de declaração dentro de cada não-terminal
+        by_lhs: Dict[str, int] = {}
+        entries = []
+        for A, _ in compiled.productions:
+            i = by_lhs.get(A, 0)
+            by_lhs[A] = i + 1
+            entries.append(reducers[A][i] if i < len(reducers[A]) else None)
+
+        for A, count in by_lhs.items():
+            if len(reducers[A]) != count:
+                raise ValueError(f"Expected {count} reduce actions for {A}, got {len(reducers[A])}.")
+
+        # Não-terminais sem valor próprio (caudas com Fold)
+        void = {A for (A, _), entry in zip(compiled.productions, entries) if isinstance(entry, Fold)}
+
+        # yields[s]: quantos valores o símbolo deixa na pilha de valores (0 ou 1)
+        self.yields = bytes(0 if name in void else 1 for name in compiled.symbols)
+
+        self.actions: List[Optional[Callable]] = [None] * n_productions
+        self.arity = [0] * n_productions    # Valores consumidos pela ação
+        self.offsets = [0] * n_productions  # Símbolos ainda na pilha quando a ação dispara
+        self.marked = [False] * n_productions
+        self.eps_value = [False] * n_productions  # Produção vazia que gera um valor
+
+        for p, ((A, prod), entry) in enumerate(zip(compiled.productions, entries)):
+            push = compiled.prod_push[p]
+            rhs = [compiled.symbols[s] for s in reversed(push)]
+            values = sum(self.yields[s] for s in push)
+
+            if isinstance(entry, Fold):
+                if len(rhs) < 2 or self.yields[push[-1]] + self.yields[push[-2]] != 2:
+                    raise ValueError(f"Fold needs two valued symbols first: {A} -> {' '.join(prod)}")
+                self.actions[p] = entry.action
+                self.arity[p] = 3
+                self.offsets[p] = len(rhs) - 2
+                self.marked[p] = True
+            elif not rhs:
+                if A not in void:
+                    self.actions[p] = entry if entry is not None else _none
+                    self.eps_value[p] = True
+            elif entry is None:
+                if values != 1:
+                    raise ValueError(f"Production {A} -> {' '.join(prod)} needs a reduce action.")
+            else:
+                self.actions[p] = entry
+                self.arity[p] = values
+                self.marked[p] = True
+
+        self._chain_ops: Dict[int, Tuple[Tuple[int, int], ...]] = {}
+
+    @classmethod
+    def for_grammar(cls, compiled: CompiledGrammar,
+                    reducers: Dict[str, List[Optional[Callable]]]) -> Optional["TreeBuilder"]:
+        """Plano memoizado por gramática; None se as ações não cobrem a gramática."""
+        key = (id(compiled), id(reducers))
+        builder = _builders.get(key)
+        if builder is None:
+            if any(A not in reducers for A, _ in compiled.productions):
+                return None
+            if len(_builders) >= 8:
+                _builders.clear()
+            builder = _builders[key] = cls(compiled, reducers)
+        return builder
+
+    def chain_ops(self, cell: int) -> Tuple[Tuple[int, int], ...]:
+        """Plano de marcas/reduções das expansões encadeadas da célula (calculado sob demanda)."""
+        ops = self._chain_ops.get(cell)
+        if ops is not None:
+            return ops
+
+        g = self.compiled
+        n_terminals = g.n_terminals
+        t = cell % n_terminals
+        segment = [n_terminals + cell // n_terminals]
+        pending: List[int] = []
+        plan: List[Tuple[int, int]] = []
+
+        # Mesmo percurso de compile_grammar
+        for _ in range(len(g.productions)):
+            if not segment or segment[-1] < n_terminals:
+                break
+            index = g.table[(segment[-1] - n_terminals) * n_terminals + t]
+            if index < 0:
+                break
+            segment.pop()
+            height = len(segment)
+            if self.marked[index]:
+                plan.append((height + self.offsets[index], index))
+                pending.append(height + self.offsets[index])
+            elif self.eps_value[index]:
+                plan.append((-1, index))
+            segment.extend(g.prod_push[index])
+
+            # Produção vazia: a pilha desceu e pode completar marcas deste encadeamento
+            while pending and pending[-1] == len(segment):
+                pending.pop()
+                plan.append((-2, 0))
+
+        ops = self._chain_ops[cell] = tuple(plan)
+        return ops
+
+
+_builders: Dict[Tuple[int, int], TreeBuilder] = {}
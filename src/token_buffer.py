@@ -0,0 +1,117 @@
+import re
+from array import array
+from typing import Dict, Iterator, List, Optional
+from .line_index import LineIndex
+from .models import Lexeme, Token
+
+
+# Sequências de escape reconhecidas em strings (as demais mantêm apenas o caractere).
+ESCAPES = {'n': '\n', 't': '\t', 'b': '\b', 'r': '\r', '"': '"', '\\': '\\'}
+ESCAPE_RE = re.compile(r'\\([\s\S])')
+
+# Tipos produzidos pelo lexer além dos definidos no Lexeme.
+BASE_TYPES = ['EOF', 'ID', 'INTEGER', 'FLOAT', 'STRING', 'BOOL']
+
+
+def unescape(body: str) -> str:
+    """Resolve as sequências de escape do corpo de uma string literal."""
+    if '\\' not in body:
+        return body
+    return ESCAPE_RE.sub(lambda e: ESCAPES.get(e[1], e[1]), body)
+
+
+def token_types(lexemes: Lexeme) -> List[str]:
+    """Lista estável de tipos de token da linguagem (o índice é o código do tipo)."""
+    types = list(BASE_TYPES)
+    for table in (lexemes.keywords, lexemes.operators, lexemes.delimiters):
+        for token_type in table.values():
+            if token_type not in types:
+                types.append(token_type)
+    return types
+
+
+class TokenBuffer:
+    """
+    Armazena os tokens como arrays paralelos (struct-of-arrays) em vez de objetos Token:
+      - types:  código do tipo (1 byte por token)
+      - starts: posição inicial do lexema no texto fonte
+      - ends:   posição final do lexema no texto fonte
+    Os valores são extraídos do texto fonte sob demanda; identificadores são internados.
+
+    O buffer se comporta como uma sequência de Token (len, índice, iteração), então pode
+    ser passado diretamente para o Parser ou salvo com Tokenizer.save_as_json.
+    """
+
+    def __init__(self, source: str, type_names: List[str]):
+        self.source = source
+        self.type_names = list(type_names)
+        self.type_codes: Dict[str, int] = {name: code for code, name in enumerate(self.type_names)}
+
+        self.types = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+
+        # Tabela de identificadores internados (nome -> mesma instância de str)
+        self.names: Dict[str, str] = {}
+
+        # Códigos usados na extração de valores
+        code = self.type_codes.get
+        self._id, self._int, self._float = code('ID'), code('INTEGER'), code('FLOAT')
+        self._string, self._bool, self._eof = code('STRING'), code('BOOL'), code('EOF')
+
+    @classmethod
+    def for_lexeme(cls, source: str, lexemes: Lexeme) -> "TokenBuffer":
+        """Cria um buffer vazio com a tabela de tipos da linguagem."""
+        return cls(source, token_types(lexemes))
+
+    def append(self, type_code: int, start: int, end: int) -> None:
+        """Adiciona um token pelo código do tipo e pelos limites do lexema."""
+        self.types.append(type_code)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def get_type(self, index: int) -> str:
+        return self.type_names[self.types[index]]
+
+    def get_value(self, index: int):
+        """Extrai o valor do token a partir do texto fonte."""
+        code = self.types[index]
+        if code == self._eof:
+            return None
+
+        lexeme = self.source[self.starts[index]:self.ends[index]]
+
+        if code == self._id:
+            return self.names.setdefault(lexeme, lexeme)
+        if code == self._int:
+            return int(lexeme)
+        if code == self._float:
+            return float(lexeme)
+        if code == self._string:
+            return unescape(lexeme[1:-1])
+        if code == self._bool:
+            return 'verdadeiro' if lexeme == 'verdadeiro' else 'falso'
+        return lexeme
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        start = self.starts[index] if index < len(self.starts) else None
+        return Token(type=self.type_names[self.types[index]], value=self.get_value(index), start=start)
+
+    def __iter__(self) -> Iterator[Token]:
+        for index in range(len(self.types)):
+            yield self[index]
+
+    def line_index(self) -> Optional[LineIndex]:
+        """Índice de linhas do texto fonte, para converter starts em linha:coluna."""
+        return LineIndex(self.source)
+
+    def nbytes(self) -> int:
+        """Memória ocupada pelos arrays de tokens (sem o texto fonte)."""
+        return sum(a.itemsize * len(a) for a in (self.types, self.starts, self.ends))
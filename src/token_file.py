@@ -0,0 +1,202 @@
+"""
+Formato binário de tokens (.lkt): guarda o resultado do lexer para ser recarregado sem
+re-tokenizar, por exemplo como cache de um corpus grande ou entre etapas de um pipeline.
+
+    save_tokens(RegexTokenizer(caminho, lexeme).tokenize_compact(), "programa.lkt")
+    tokens = load_tokens("programa.lkt")      # mapeado em memória (mmap)
+    Parser(tokens, grammar).parse()
+
+Layout (little-endian), com as seções alinhadas em 4 bytes:
+    cabeçalho   MAGIC, versão, flags, nº de tipos, nº de strings, nº de tokens, bytes do pool
+    tipos       nome de cada tipo de token (u16 tamanho + UTF-8); o índice é o código
+    pool        offsets (u32) e bytes UTF-8 das strings distintas (internadas)
+    types       código do tipo de cada token (u8)
+    values      índice no pool do valor de cada token (u16, ou u32 com FLAG_WIDE)
+    positions   início e fim do lexema no fonte (u32 cada), só com FLAG_POSITIONS
+
+O pool guarda o valor textual de cada token (o texto de uma string já sem aspas e com os
+escapes resolvidos), então listas de Token também podem ser gravadas.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Union
+from .line_index import LineIndex
+from .models import Token
+from .token_buffer import TokenBuffer
+
+
+MAGIC = b"LKTK"
+VERSION = 1
+TOKEN_FILE_EXTENSION = ".lkt"
+
+FLAG_WIDE = 1        # Índices do pool em u32 (mais de 65535 strings distintas)
+FLAG_POSITIONS = 2   # Posições (starts/ends) no texto fonte presentes
+
+HEADER = struct.Struct("<4sHHIIII")
+
+
+def _pad(size: int) -> int:
+    return -size % 4
+
+
+class PooledTokenBuffer(TokenBuffer):
+    """
+    TokenBuffer carregado de um arquivo de tokens: os valores vêm do pool de strings em
+    vez do texto fonte. Os arrays podem ser memoryviews do arquivo mapeado (somente leitura).
+    """
+
+    def __init__(self, type_names: List[str], pool: List[str], values, types,
+                 starts=None, ends=None):
+        super().__init__("", type_names)
+        self.pool = pool
+        self.values = values
+        self.types = types
+        if starts is not None:
+            self.starts, self.ends = starts, ends
+
+    def get_value(self, index: int):
+        code = self.types[index]
+        if code == self._eof:
+            return None
+        text = self.pool[self.values[index]]
+        if code == self._int:
+            return int(text)
+        if code == self._float:
+            return float(text)
+        return text
+
+    def line_index(self) -> Optional[LineIndex]:
+        # Sem o texto fonte, as posições não viram linha:coluna
+        return None
+
+    def nbytes(self) -> int:
+        return super().nbytes() + self.values.itemsize * len(self.values)
+
+
+def save_tokens(tokens: Union[TokenBuffer, Iterable[Token]], path: str) -> int:
+    """Grava os tokens (TokenBuffer ou sequência de Token) no formato binário; retorna o tamanho."""
+    if isinstance(tokens, TokenBuffer):
+        type_names = tokens.type_names
+        types = array('B', tokens.types)
+        texts = (tokens.get_value(i) for i in range(len(tokens)))
+        positions = len(tokens.starts) == len(tokens) and not isinstance(tokens, PooledTokenBuffer)
+    else:
+        tokens = list(tokens)
+        codes: Dict[str, int] = {}
+        types = array('B', (codes.setdefault(token.type, len(codes)) for token in tokens))
+        type_names = list(codes)
+        texts = (token.value for token in tokens)
+        positions = False
+
+    # Pool de strings distintas: cada valor vira um índice
+    index: Dict[str, int] = {}
+    values = array('I', (index.setdefault("" if text is None else str(text), len(index))
+                         for text in texts))
+    pool = list(index)
+    wide = len(pool) > 0xFFFF
+    if not wide:
+        values = array('H', values)
+
+    encoded = [text.encode("utf-8") for text in pool]
+    offsets = array('I', [0])
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    blob = b"".join(encoded)
+
+    flags = (FLAG_WIDE if wide else 0) | (FLAG_POSITIONS if positions else 0)
+    sections = [HEADER.pack(MAGIC, VERSION, flags, len(type_names), len(pool), len(types), len(blob))]
+    for name in type_names:
+        data = name.encode("utf-8")
+        sections.append(struct.pack("<H", len(data)) + data)
+
+    arrays = [offsets, blob, types, values]
+    if positions:
+        arrays += [array('I', tokens.starts), array('I', tokens.ends)]
+
+    size = 0
+    with open(path, "wb") as token_file:
+        for part in sections:
+            token_file.write(part)
+            size += len(part)
+        for part in arrays:
+            token_file.write(b"\0" * _pad(size))
+            size += _pad(size)
+            if isinstance(part, array):
+                if sys.byteorder != "little":
+                    part = array(part.typecode, part)
+                    part.byteswap()
+                data = part.tobytes()
+            else:
+                data = part
+            token_file.write(data)
+            size += len(data)
+    return size
+
+
+def load_tokens(path: str, use_mmap: bool = True) -> PooledTokenBuffer:
+    """
+    Carrega um arquivo de tokens pronto para o Parser. Com use_mmap, os arrays de tipos,
+    valores e posições são vistas do arquivo mapeado em memória (nada é copiado); sem
+    mmap, o arquivo é lido para arrays comuns.
+    """
+    with open(path, "rb") as token_file:
+        if use_mmap:
+            data = memoryview(mmap.mmap(token_file.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            data = memoryview(token_file.read())
+
+    if len(data) < HEADER.size:
+        raise ValueError(f"'{path}' is not a token file.")
+    magic, version, flags, n_types, n_pool, n_tokens, pool_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"'{path}' is not a token file.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported token file version {version} in '{path}'.")
+
+    def truncated() -> ValueError:
+        return ValueError(f"Truncated or corrupt token file '{path}'.")
+
+    pos = HEADER.size
+    type_names = []
+    for _ in range(n_types):
+        if pos + 2 > len(data):
+            raise truncated()
+        (length,) = struct.unpack_from("<H", data, pos)
+        if pos + 2 + length > len(data):
+            raise truncated()
+        type_names.append(bytes(data[pos + 2:pos + 2 + length]).decode("utf-8"))
+        pos += 2 + length
+
+    def section(typecode: str, count: int):
+        nonlocal pos
+        pos += _pad(pos)
+        itemsize = array(typecode).itemsize
+        # Cada seção precisa caber inteira no arquivo (um corte no meio vira ValueError)
+        if pos + count * itemsize > len(data):
+            raise truncated()
+        view = data[pos:pos + count * itemsize]
+        pos += count * itemsize
+        if use_mmap and sys.byteorder == "little":
+            return view.cast(typecode)
+        values = array(typecode, view.tobytes())
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+    offsets = section('I', n_pool + 1)
+    blob = bytes(section('B', pool_size))
+    if offsets[n_pool] != pool_size or any(offsets[i] > offsets[i + 1] for i in range(n_pool)):
+        raise truncated()
+    pool = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(n_pool)]
+    # Identificadores repetidos já apontam para a mesma string do pool (internados)
+
+    types = section('B', n_tokens)
+    values = section('I' if flags & FLAG_WIDE else 'H', n_tokens)
+    starts = ends = None
+    if flags & FLAG_POSITIONS:
+        starts = section('I', n_tokens)
+        ends = section('I', n_tokens)
+
+    return PooledTokenBuffer(type_names, pool, values, types, starts, ends)
@@ -0,0 +1,208 @@
+from collections import deque
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+from .models import EPSILON
+
+if TYPE_CHECKING:
+    from .trace_export import TraceWriter
+
+
+# Níveis de rastreamento do Parser.
+TRACE_OFF = "off"          # Nenhum registro (parse linear)
+TRACE_SUMMARY = "summary"  # Apenas contadores agregados
+TRACE_RING = "ring"        # Últimos N passos (buffer circular)
+TRACE_FULL = "full"        # Todos os passos (tabela visual completa)
+TRACE_STREAM = "stream"    # Todos os passos, gravados em fluxo por um TraceWriter
+
+TRACE_LEVELS = (TRACE_OFF, TRACE_SUMMARY, TRACE_RING, TRACE_FULL, TRACE_STREAM)
+
+# Códigos de ação gravados em cada passo.
+ACT_MATCH = 0     # arg = ID do terminal casado
+ACT_EXPAND = 1    # arg = índice da produção
+ACT_EXPECTED = 2  # arg = ID do terminal esperado (desempilhado)
+ACT_SYNC = 3      # arg = ID do não-terminal desempilhado (sincronização via FOLLOW)
+ACT_DISCARD = 4   # arg = -1 (token descartado)
+
+ACTION_NAMES = {
+    ACT_MATCH: "match",
+    ACT_EXPAND: "expand",
+    ACT_EXPECTED: "error_expected",
+    ACT_SYNC: "panic_pop",
+    ACT_DISCARD: "panic_discard",
+}
+
+
+class ParseTrace:
+    """
+    Registro compacto dos passos do Parser.
+
+    Cada passo é guardado como (cursor, profundidade da pilha, código da ação, argumento).
+    As colunas visuais (Casamento, Pilha, Entrada, Ação) só são reconstruídas em `rows()`,
+    reexecutando as ações sobre a pilha.
+    """
+
+    def __init__(self, level: str = TRACE_FULL, ring_size: int = 1000,
+                 writer: Optional["TraceWriter"] = None):
+        if level not in TRACE_LEVELS:
+            raise ValueError(f"Invalid trace level '{level}'. Use one of {TRACE_LEVELS}.")
+        if (level == TRACE_STREAM) != (writer is not None):
+            raise ValueError("The 'stream' trace level needs a TraceWriter (and only it uses one).")
+
+        self.level = level
+        self.ring_size = ring_size
+        self.writer = writer
+
+        # Registros por passo
+        if level == TRACE_RING:
+            self.records = deque(maxlen=ring_size)
+        else:
+            self.records = []
+
+        # Contadores agregados (summary, ring e full)
+        self.counters = {name: 0 for name in ACTION_NAMES.values()}
+        self.steps = 0
+        self.max_depth = 0
+
+        # Estado necessário para a reconstrução
+        self.start_symbol: Optional[str] = None
+        self.final_stack: List[str] = []
+
+        # Valores (str) dos tokens lidos pelo parser. No modo ring, apenas os mais
+        # recentes: cada passo lê no máximo um token novo. No stream, só o atual.
+        if level == TRACE_RING:
+            self.token_values = deque(maxlen=ring_size + 1)
+        elif level == TRACE_STREAM:
+            self.token_values = deque(maxlen=1)
+        else:
+            self.token_values = []
+        self.tokens_seen = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.level != TRACE_OFF
+
+    @property
+    def keeps_tokens(self) -> bool:
+        return self.level == TRACE_RING or self.level == TRACE_FULL or self.level == TRACE_STREAM
+
+    def push_token(self, value: str) -> None:
+        """Guarda o valor textual de um token lido da entrada."""
+        self.token_values.append(value)
+        self.tokens_seen += 1
+
+    def record(self, cursor: int, depth: int, action: int, arg: int = -1) -> None:
+        """Registra um passo do parser."""
+        self.steps += 1
+        self.counters[ACTION_NAMES[action]] += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+        if self.level == TRACE_RING or self.level == TRACE_FULL:
+            self.records.append((cursor, depth, action, arg))
+        elif self.writer is not None:
+            token = self.token_values[-1] if cursor < self.tokens_seen else "$"
+            self.writer.write(cursor, depth, action, arg, token)
+
+    def finish(self, start_symbol: str, stack: List[str]) -> None:
+        """Guarda a pilha final, usada para reconstruir a janela do buffer circular."""
+        self.start_symbol = start_symbol
+        self.final_stack = list(stack)
+
+    def summary(self) -> Dict[str, int]:
+        """Retorna os contadores agregados do parse."""
+        data = {"steps": self.steps, "max_stack_depth": self.max_depth}
+        data.update(self.counters)
+        return data
+
+    def rows(self,
+             productions: Sequence[Tuple[str, List[str]]],
+             symbols: Sequence[str]) -> List[Dict[str, str]]:
+        """
+        Reconstrói as linhas da tabela visual a partir dos registros.
+
+        `productions` é a lista (A, alpha) indexada pelos registros de expansão e
+        `symbols` traduz os IDs de símbolos para nomes.
+        """
+        if not self.records:
+            return []
+
+        records = list(self.records)
+        truncated = self.level == TRACE_RING and self.steps > len(records)
+
+        # Índice (cursor) do primeiro valor guardado
+        token_values = list(self.token_values)
+        first_cursor = self.tokens_seen - len(token_values)
+
+        if truncated:
+            stack = self._unwind(records, productions, symbols)
+            matched_parts = ["… "]
+        else:
+            stack = ["EOF", self.start_symbol]
+            matched_parts = []
+
+        n_values = len(token_values)
+        rows = []
+
+        for cursor, _, action, arg in records:
+            index = cursor - first_cursor
+            token_val = token_values[index] if index < n_values else "$"
+            input_view = " ".join(token_values[index:])
+            matched = "".join(matched_parts)
+
+            if action == ACT_MATCH:
+                rows.append(self._row(matched, stack, input_view, f"MATCH! ({token_val})"))
+                if symbols[arg] != "EOF":
+                    stack.pop()
+                    matched_parts.append(token_val + " ")
+
+            elif action == ACT_EXPAND:
+                top, production = productions[arg]
+                stack.pop()
+                prod_str = f"{top} -> {' '.join(production)}"
+                if production != [EPSILON]:
+                    stack.extend(reversed(production))
+                else:
+                    prod_str += " (void)"
+                rows.append(self._row(matched, stack, input_view, prod_str))
+
+            elif action == ACT_EXPECTED:
+                rows.append(self._row(matched, stack, input_view,
+                                      f"ERROR: Expected '{symbols[arg]}', but received '{token_val}'"))
+                stack.pop()
+
+            elif action == ACT_SYNC:
+                rows.append(self._row(matched, stack, input_view,
+                                      f"ERROR (Panic): Pop {symbols[arg]} (Synchronize via Follow)"))
+                stack.pop()
+
+            else:
+                rows.append(self._row(matched, stack, input_view,
+                                      f"ERROR (Panic): Discard '{token_val}'"))
+
+        return rows
+
+    def _unwind(self, records, productions, symbols) -> List[str]:
+        """Desfaz as ações da janela a partir da pilha final, obtendo a pilha inicial da janela."""
+        stack = list(self.final_stack)
+
+        for _, _, action, arg in reversed(records):
+            if action == ACT_MATCH:
+                if symbols[arg] != "EOF":
+                    stack.append(symbols[arg])
+            elif action == ACT_EXPAND:
+                top, production = productions[arg]
+                if production != [EPSILON]:
+                    del stack[len(stack) - len(production):]
+                stack.append(top)
+            elif action in (ACT_EXPECTED, ACT_SYNC):
+                stack.append(symbols[arg])
+
+        return stack
+
+    @staticmethod
+    def _row(matched, stack, inp, action) -> Dict[str, str]:
+        return {
+            "Casamento": matched,
+            "Pilha LL(1)": " ".join(stack),
+            "Entrada": inp,
+            "Ação": action
+        }
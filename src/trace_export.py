@@ -0,0 +1,149 @@
+"""
+Exportação do trace do Parser em fluxo: cada passo vira uma linha de CSV ou JSON Lines
+no momento em que acontece, com memória constante, para parses longos demais para a
+tabela visual (Parser.build_execution_table monta tudo em memória).
+
+    with TraceWriter("trace.csv") as writer:
+        Parser(tokens, grammar, trace_level=TRACE_STREAM, trace_writer=writer).parse()
+
+    for frame in trace_frames("trace.csv"):   # DataFrames com colunas categóricas
+        ...
+
+Diferente da tabela visual, cada linha guarda só o token atual (a entrada restante não é
+conhecida em um fluxo) e os últimos `matched_window` tokens casados.
+"""
+import csv
+import json
+from collections import deque
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence, TextIO, Tuple
+from .models import EPSILON
+from .trace import ACT_MATCH, ACT_EXPAND, ACT_EXPECTED, ACT_SYNC, ACTION_NAMES
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Formatos aceitos (pela extensão do arquivo, quando não informado)
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+FORMATS = (FORMAT_CSV, FORMAT_JSONL)
+
+COLUMNS = ["step", "cursor", "depth", "token", "matched", "stack", "action", "detail"]
+
+# Colunas de texto muito repetidas: categóricas nos DataFrames de trace_frames
+CATEGORICAL = ["token", "stack", "action", "detail"]
+
+
+def trace_format(path: str) -> str:
+    """Formato pelo nome do arquivo: .jsonl/.ndjson -> JSON Lines, senão CSV."""
+    return FORMAT_JSONL if path.endswith((".jsonl", ".ndjson")) else FORMAT_CSV
+
+
+class TraceWriter:
+    """
+    Recebe os passos do ParseTrace (nível 'stream'), reconstrói a pilha como em
+    ParseTrace.rows e grava uma linha por passo. O Parser chama `start` com a gramática
+    compilada antes do primeiro passo.
+    """
+
+    def __init__(self, path: Optional[str] = None, output: Optional[TextIO] = None,
+                 format: Optional[str] = None, matched_window: int = 8):
+        if (path is None) == (output is None):
+            raise ValueError("Give either a path or an output stream to TraceWriter.")
+        self.format = format or (trace_format(path) if path is not None else FORMAT_CSV)
+        if self.format not in FORMATS:
+            raise ValueError(f"Invalid trace format '{self.format}'. Use one of {FORMATS}.")
+
+        self.path = path
+        self._owns_output = output is None
+        self.output = output if output is not None else open(path, "w", newline="", encoding="utf-8")
+        self._csv = csv.writer(self.output) if self.format == FORMAT_CSV else None
+        if self._csv is not None:
+            self._csv.writerow(COLUMNS)
+
+        self.productions: Sequence[Tuple[str, List[str]]] = []
+        self.symbols: Sequence[str] = []
+        self.stack: List[str] = []
+        self.matched = deque(maxlen=matched_window)
+        self.matched_total = 0
+        self.steps = 0
+
+    def start(self, productions: Sequence[Tuple[str, List[str]]],
+              symbols: Sequence[str], start_symbol: str) -> None:
+        self.productions = productions
+        self.symbols = symbols
+        self.stack = ["EOF", start_symbol]
+
+    def write(self, cursor: int, depth: int, action: int, arg: int, token: str) -> None:
+        """Grava o passo, com a pilha de antes da ação (a expansão mostra a de depois)."""
+        symbols, stack = self.symbols, self.stack
+
+        if action == ACT_MATCH:
+            detail = f"MATCH! ({token})"
+        elif action == ACT_EXPAND:
+            top, production = self.productions[arg]
+            stack.pop()
+            detail = f"{top} -> {' '.join(production)}"
+            if production != [EPSILON]:
+                stack.extend(reversed(production))
+            else:
+                detail += " (void)"
+        elif action == ACT_EXPECTED:
+            detail = f"ERROR: Expected '{symbols[arg]}', but received '{token}'"
+        elif action == ACT_SYNC:
+            detail = f"ERROR (Panic): Pop {symbols[arg]} (Synchronize via Follow)"
+        else:
+            detail = f"ERROR (Panic): Discard '{token}'"
+
+        stack_view = " ".join(stack)
+        matched = " ".join(self.matched)
+        if self.matched_total > len(self.matched):
+            matched = "… " + matched
+        self.steps += 1
+        row = [self.steps, cursor, depth, token, matched, stack_view, ACTION_NAMES[action], detail]
+
+        if self._csv is not None:
+            self._csv.writerow(row)
+        else:
+            self.output.write(json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False))
+            self.output.write("\n")
+
+        # Efeitos na pilha que aparecem só na linha seguinte (como na tabela visual)
+        if action == ACT_MATCH:
+            if symbols[arg] != "EOF":
+                stack.pop()
+                self.matched.append(token)
+                self.matched_total += 1
+        elif action == ACT_EXPECTED or action == ACT_SYNC:
+            stack.pop()
+
+    def close(self) -> None:
+        if self._owns_output:
+            self.output.close()
+        else:
+            self.output.flush()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def trace_frames(path: str, chunk_size: int = 100_000,
+                 format: Optional[str] = None) -> Iterator["pd.DataFrame"]:
+    """
+    Lê um trace exportado em DataFrames de até `chunk_size` linhas, com as colunas de
+    texto repetitivas (token, pilha, ação) como categóricas. O Pandas só é importado aqui.
+    """
+    import pandas as pd
+
+    format = format or trace_format(path)
+    if format == FORMAT_CSV:
+        chunks = pd.read_csv(path, chunksize=chunk_size, keep_default_na=False,
+                             dtype={name: "category" for name in CATEGORICAL})
+    else:
+        chunks = pd.read_json(path, lines=True, chunksize=chunk_size, dtype=False)
+
+    for frame in chunks:
+        yield frame.astype({name: "category" for name in CATEGORICAL})
@@ -0,0 +1,301 @@
+import math
+import random
+import sys
+from typing import Callable, List, Optional
+from .models import BytecodeProgram
+from .bytecode import (LOAD_LOCAL, LOAD_CONST, STORE_LOCAL, ADD, SUB, MUL, DIV, MOD, POW,
+                       LT, GT, LE, GE, EQ, NE, JUMP, JUMP_IF_FALSE, JUMP_IF_TRUE,
+                       JUMP_IF_FALSE_KEEP, JUMP_IF_TRUE_KEEP, NEG, NOT, CALL, RETURN, POP, BUILTIN,
+                       LOAD_LOCAL_LOCAL, LOAD_LOCAL_CONST, INC_LOCAL,
+                       JUMP_IF_LT, JUMP_IF_GT, JUMP_IF_LE, JUMP_IF_GE, JUMP_IF_EQ, JUMP_IF_NE,
+                       JUMP_IF_NOT_LT, JUMP_IF_NOT_GT, JUMP_IF_NOT_LE, JUMP_IF_NOT_GE,
+                       JUMP_IF_NOT_EQ, JUMP_IF_NOT_NE, JUMP_OPCODES)
+
+
+def format_value(value) -> str:
+    """Texto de um valor Lukera, como exibido por escreve()."""
+    if value is True:
+        return "verdadeiro"
+    if value is False:
+        return "falso"
+    if value is None:
+        return "nulo"
+    return str(value)
+
+
+def decode(code) -> List[tuple]:
+    """
+    Converte o array plano de uma função em uma lista de pares (opcode, argumento), com os
+    destinos de salto em índices de instrução: o laço da VM lê cada instrução com um único
+    acesso à lista.
+    """
+    decoded = []
+    for pc in range(0, len(code), 2):
+        op, arg = code[pc], code[pc + 1]
+        decoded.append((op, arg >> 1 if op in JUMP_OPCODES else arg))
+    return decoded
+
+
+def parse_input(text: str):
+    """Converte a linha lida por entrada() para inteiro, real ou texto."""
+    text = text.strip()
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+class VirtualMachine:
+    """
+    Máquina de pilha que executa um BytecodeProgram.
+
+    Um único laço de despacho executa todas as funções: as chamadas empilham o estado
+    (código, pc, locais) em uma lista de frames, sem recursão em Python. Os argumentos e
+    o valor de retorno passam pela pilha de operandos compartilhada.
+
+    Semântica dos operadores: '/' entre inteiros é a divisão inteira (arredondada para
+    baixo, como '%'); '+' com texto concatena; 'e'/'ou' fazem curto-circuito.
+    """
+
+    def __init__(self, program: BytecodeProgram,
+                 write: Optional[Callable[[str], object]] = None,
+                 read: Optional[Callable[[], str]] = None,
+                 seed: Optional[int] = None,
+                 max_depth: int = 10000):
+        self.program = program
+        self.write = write if write is not None else sys.stdout.write
+        self.read = read if read is not None else input
+        self.random = random.Random(seed)
+        self.max_depth = max_depth
+
+    def run(self):
+        """Executa o bloco principal e retorna o valor de 'retorna' (ou None)."""
+        program = self.program
+        functions = program.functions
+        codes = [decode(function.code) for function in functions]
+        consts = program.consts
+        max_depth = self.max_depth
+
+        frames: List[tuple] = []
+        stack: list = []
+        push = stack.append
+        pop = stack.pop
+
+        current = program.main
+        code = codes[current]
+        local_vars = [None] * functions[current].n_locals
+        pc = 0
+
+        try:
+            # Testes em ordem de frequência (superinstruções e saltos de laço primeiro)
+            while True:
+                op, arg = code[pc]
+                pc += 1
+
+                if op == LOAD_LOCAL:
+                    push(local_vars[arg])
+                elif op == LOAD_LOCAL_CONST:
+                    push(local_vars[arg & 0xFFFF])
+                    push(consts[arg >> 16])
+                elif op == LOAD_LOCAL_LOCAL:
+                    push(local_vars[arg & 0xFFFF])
+                    push(local_vars[arg >> 16])
+                elif op == LOAD_CONST:
+                    push(consts[arg])
+                elif op == STORE_LOCAL:
+                    local_vars[arg] = pop()
+                elif op == INC_LOCAL:
+                    slot = arg & 0xFFFF
+                    a = local_vars[slot]
+                    b = consts[arg >> 16]
+                    try:
+                        local_vars[slot] = a + b
+                    except TypeError:
+                        if type(a) is str:
+                            local_vars[slot] = a + format_value(b)
+                        else:
+                            raise
+                elif op == ADD:
+                    b = pop()
+                    a = stack[-1]
+                    try:
+                        stack[-1] = a + b
+                    except TypeError:
+                        if type(a) is str or type(b) is str:
+                            stack[-1] = format_value(a) + format_value(b)
+                        else:
+                            raise
+                elif op == JUMP_IF_LT:
+                    b = pop()
+                    if pop() < b:
+                        pc = arg
+                elif op == JUMP_IF_NOT_EQ:
+                    b = pop()
+                    if not pop() == b:
+                        pc = arg
+                elif op == JUMP_IF_FALSE:
+                    if not pop():
+                        pc = arg
+                elif op == JUMP_IF_TRUE:
+                    if pop():
+                        pc = arg
+                elif op == JUMP:
+                    pc = arg
+                elif op == SUB:
+                    b = pop()
+                    stack[-1] = stack[-1] - b
+                elif op == MUL:
+                    b = pop()
+                    stack[-1] = stack[-1] * b
+                elif op == MOD:
+                    b = pop()
+                    stack[-1] = stack[-1] % b
+                elif op == JUMP_IF_LE:
+                    b = pop()
+                    if pop() <= b:
+                        pc = arg
+                elif op == JUMP_IF_NOT_LT:
+                    b = pop()
+                    if not pop() < b:
+                        pc = arg
+                elif op == JUMP_IF_NOT_LE:
+                    b = pop()
+                    if not pop() <= b:
+                        pc = arg
+                elif op == JUMP_IF_NOT_NE:
+                    b = pop()
+                    if not pop() != b:
+                        pc = arg
+                elif op == CALL:
+                    if len(frames) >= max_depth:
+                        raise Exception("Runtime Error: Stack overflow (too many nested calls)")
+                    frames.append((current, code, pc, local_vars))
+                    function = functions[arg]
+                    n_params = function.n_params
+                    if n_params:
+                        local_vars = stack[-n_params:]
+                        del stack[-n_params:]
+                        local_vars.extend([None] * (function.n_locals - n_params))
+                    else:
+                        local_vars = [None] * function.n_locals
+                    current = arg
+                    code = codes[arg]
+                    pc = 0
+                elif op == RETURN:
+                    # O valor de retorno fica no topo da pilha para quem chamou
+                    if not frames:
+                        return pop()
+                    current, code, pc, local_vars = frames.pop()
+                elif op == JUMP_IF_GT:
+                    b = pop()
+                    if pop() > b:
+                        pc = arg
+                elif op == JUMP_IF_GE:
+                    b = pop()
+                    if pop() >= b:
+                        pc = arg
+                elif op == JUMP_IF_EQ:
+                    b = pop()
+                    if pop() == b:
+                        pc = arg
+                elif op == JUMP_IF_NE:
+                    b = pop()
+                    if pop() != b:
+                        pc = arg
+                elif op == JUMP_IF_NOT_GT:
+                    b = pop()
+                    if not pop() > b:
+                        pc = arg
+                elif op == JUMP_IF_NOT_GE:
+                    b = pop()
+                    if not pop() >= b:
+                        pc = arg
+                elif op == LT:
+                    b = pop()
+                    stack[-1] = stack[-1] < b
+                elif op == GT:
+                    b = pop()
+                    stack[-1] = stack[-1] > b
+                elif op == LE:
+                    b = pop()
+                    stack[-1] = stack[-1] <= b
+                elif op == GE:
+                    b = pop()
+                    stack[-1] = stack[-1] >= b
+                elif op == EQ:
+                    b = pop()
+                    stack[-1] = stack[-1] == b
+                elif op == NE:
+                    b = pop()
+                    stack[-1] = stack[-1] != b
+                elif op == DIV:
+                    b = pop()
+                    a = stack[-1]
+                    if type(a) is int and type(b) is int:
+                        stack[-1] = a // b
+                    else:
+                        stack[-1] = a / b
+                elif op == POP:
+                    pop()
+                elif op == JUMP_IF_FALSE_KEEP:
+                    if stack[-1]:
+                        pop()
+                    else:
+                        pc = arg
+                elif op == JUMP_IF_TRUE_KEEP:
+                    if stack[-1]:
+                        pc = arg
+                    else:
+                        pop()
+                elif op == NOT:
+                    stack[-1] = not stack[-1]
+                elif op == NEG:
+                    stack[-1] = -stack[-1]
+                elif op == POW:
+                    b = pop()
+                    stack[-1] = stack[-1] ** b
+                elif op == BUILTIN:
+                    argc = arg & 15
+                    if argc:
+                        args = stack[-argc:]
+                        del stack[-argc:]
+                    else:
+                        args = []
+                    push(self.builtin(arg >> 4, args))
+                else:
+                    raise Exception(f"Runtime Error: Invalid opcode {op}")
+
+        except ZeroDivisionError:
+            raise Exception(f"Runtime Error: Division by zero in '{functions[current].name}'")
+        except TypeError as e:
+            raise Exception(f"Runtime Error: Invalid operand types in '{functions[current].name}' ({e})")
+        except (ValueError, OverflowError) as e:
+            raise Exception(f"Runtime Error: {e} in '{functions[current].name}'")
+
+    def builtin(self, builtin_id: int, args: list):
+        """Executa uma função nativa (ids definidos em bytecode.BUILTINS)."""
+        if builtin_id == 0: # escreve
+            self.write("".join(format_value(value) for value in args))
+            return None
+        if builtin_id == 1: # entrada
+            return parse_input(self.read())
+        if builtin_id == 2: # aleatorio() em [0, 1) ou aleatorio(a, b) em [a, b]
+            if not args:
+                return self.random.random()
+            return self.random.randint(args[0], args[1])
+        if builtin_id == 3: # faixa(b) em [0, b) ou faixa(a, b) em [a, b)
+            return self.random.randrange(*args)
+        if builtin_id == 4: # absoluto
+            return abs(args[0])
+        if builtin_id == 5: # raiz
+            if args[0] < 0:
+                raise Exception("Runtime Error: Square root of a negative number")
+            return math.sqrt(args[0])
+        raise Exception(f"Runtime Error: Invalid builtin {builtin_id}")
+
+
+def run_program(program: BytecodeProgram, **options):
+    """Atalho: executa um programa compilado e retorna o valor do bloco principal."""
+    return VirtualMachine(program, **options).run()
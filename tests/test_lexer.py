@@ -0,0 +1,32 @@
+import contextlib
+import io
+import pytest
+from src.lexer import Tokenizer
+from src.models_utils import build_lukera_lexeme
+from src.regex_lexer import RegexTokenizer
+
+
+def quiet(call):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return call()
+
+
+@pytest.mark.parametrize("text", ["inteiro x;", "principal { retorna 1; }", "}", "x = y +"])
+def test_compact_offsets_match_token_list_and_regex_engine(text):
+    lexeme = build_lukera_lexeme()
+    compact = quiet(Tokenizer(None, lexeme, text=text).tokenize_compact)
+    tokens = quiet(Tokenizer(None, lexeme, text=text).tokenize)
+    regex = quiet(RegexTokenizer(None, lexeme, text=text).tokenize_compact)
+
+    assert list(compact.starts) == [token.start for token in tokens]
+    assert (list(compact.starts), list(compact.ends)) == (list(regex.starts), list(regex.ends))
+    assert max(compact.ends) == len(text)
+
+
+@pytest.mark.parametrize("engine", [Tokenizer, RegexTokenizer])
+def test_unterminated_block_comment_reports_its_start(engine):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        tokens = engine(None, build_lukera_lexeme(), text="x = 1;\n  /* aberto\n").tokenize()
+    assert tokens[-1].type != 'EOF'
+    assert output.getvalue().strip() == "Lexical Error: Unterminated block comment at 2:3."
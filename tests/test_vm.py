@@ -0,0 +1,30 @@
+import pytest
+from src.cache import load_grammar_tables
+from src.compile_cache import compile_source
+from src.models_utils import build_lukera_grammar, build_lukera_lexeme
+from src.vm import VirtualMachine
+
+
+def run(body: str):
+    grammar = build_lukera_grammar()
+    result = compile_source(f"principal {{\n{body}\n}}\n", build_lukera_lexeme(), grammar,
+                            load_grammar_tables(grammar))
+    assert result.lexical_error is None and not result.errors and result.bytecode is not None
+    return VirtualMachine(result.bytecode, write=lambda _: None).run()
+
+
+def test_increment_in_place():
+    assert run("inteiro x = 1; x = x + 2; x = x - 5; retorna x;") == -2
+
+
+def test_text_plus_number_concatenates():
+    assert run('texto s = "ab"; s = s + 1; retorna s;') == "ab1"
+
+
+@pytest.mark.parametrize("body", [
+    'texto s = "ab"; s = s - 1; retorna s;',
+    'texto s = "ab"; texto t = s - 1; retorna t;',
+])
+def test_text_minus_number_is_a_type_error(body):
+    with pytest.raises(Exception, match="Invalid operand types"):
+        run(body)